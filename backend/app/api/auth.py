@@ -1,11 +1,15 @@
 # backend/app/api/auth.py
-from fastapi import APIRouter, HTTPException, Depends, Response
-from sqlmodel import Session
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel  # [추가] 요청 데이터 정의를 위해 필요
-from app.core.database import get_session
+from app.core.database import get_async_session, run_async
 from app.models import User
-from app.schemas import UserLogin, UserRegister
-from app.core.session import hash_password, verify_password
+from app.services import student_summary
+from app.services.passwords import passwords
+from app.services.user_cache import user_cache
+from app.schemas import LoginResponse, UserLogin, UserPublic, UserRegister
+from app.core.admission import AdmissionRejected
+from app.core.session import Principal, issue_token, revoke_token, set_session_cookie
 from app.core.config import settings
 
 router = APIRouter()
@@ -14,48 +18,74 @@ router = APIRouter()
 class IdCheckRequest(BaseModel):
     id: str
 
-@router.post("/login")
+def _rejected(e: AdmissionRejected) -> HTTPException:
+    """로그인 폭주 거절 (429: 시도 한도 초과, 503: 해싱 대기 초과)"""
+    headers = {"Retry-After": str(max(1, int(e.retry_after + 0.999)))} if e.retry_after is not None else None
+    return HTTPException(status_code=e.status_code, detail=e.message, headers=headers)
+
+@router.post("/login", response_model=LoginResponse)
 async def login(
+    request: Request,
     response: Response,  # 쿠키 설정을 위해 Response 객체 주입
     data: UserLogin, 
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     print(f"[Login Attempt] ID: {data.id}")
 
+    # 0. 시도 한도 (해싱 전에 거절)
+    try:
+        passwords.check_login(data.id, request.client.host if request.client else None)
+    except AdmissionRejected as e:
+        raise _rejected(e)
+
     # 1. DB에서 사용자 조회
-    user = session.get(User, data.id)
+    user = await session.get(User, data.id)
     
     if not user:
         raise HTTPException(status_code=401, detail="존재하지 않는 아이디입니다.")
     
-    # 2. 비밀번호 검증
-    is_valid_hash, _ = verify_password(user.pw, data.password)
-    is_valid_plain = (user.pw == data.password)
+    # 2. 비밀번호 검증 (해싱 풀에서, app/services/passwords.py)
+    try:
+        is_valid, needs_rehash = await passwords.verify_async(user.pw, data.password)
+    except AdmissionRejected as e:
+        raise _rejected(e)
 
-    if not is_valid_hash and not is_valid_plain:
+    if not is_valid:
         raise HTTPException(status_code=401, detail="비밀번호가 일치하지 않습니다.")
+    passwords.login_succeeded(data.id)
 
     # 3. 승인 대기 확인
     if user.role == "teacher" and not user.is_approved:
         raise HTTPException(status_code=403, detail="승인 대기 중인 계정입니다.")
 
-    # [쿠키 설정]
-    response.set_cookie(
-        key=settings.SESSION_COOKIE_NAME,
-        value=user.uid,
-        max_age=3600 * 24,  # 24시간
-        path="/",           # 모든 경로 허용
-        httponly=True,
-        samesite="lax",
-        secure=False        # 로컬(http) 환경이므로 False
-    )
+    # 평문/SHA-256/예전 파라미터로 저장된 비밀번호는 현재 KDF로 바꿔 저장 (바쁘면 다음 로그인 때)
+    if needs_rehash:
+        try:
+            user.pw = await passwords.hash_async(data.password)
+            session.add(user)
+            await session.commit()
+            await session.refresh(user)
+        except AdmissionRejected:
+            pass
+
+    # [쿠키 설정] 서명된 세션 토큰 (uid/역할/담당 선생님/만료 포함, app/core/session.py)
+    set_session_cookie(response, issue_token(Principal.from_user(user)))
 
     print(f" -> 로그인 성공: {user.name} (Cookie Set for path=/)")
-    return {"status": "ok", "user": user}
+    return {"status": "ok", "user": UserPublic.model_validate(user)}
+
+@router.post("/logout")
+async def logout(request: Request, response: Response, session: AsyncSession = Depends(get_async_session)):
+    """현재 세션 토큰을 폐기 목록에 올리고 쿠키 삭제"""
+    token = request.cookies.get(settings.SESSION_COOKIE_NAME, "")
+    if token and await run_async(session, revoke_token, token):
+        await session.commit()
+    response.delete_cookie(settings.SESSION_COOKIE_NAME, path="/")
+    return {"status": "ok"}
 
 @router.post("/register")
-async def register(data: UserRegister, session: Session = Depends(get_session)):
-    if session.get(User, data.id):
+async def register(data: UserRegister, session: AsyncSession = Depends(get_async_session)):
+    if await session.get(User, data.id):
         raise HTTPException(status_code=400, detail="이미 존재하는 아이디입니다.")
     
     # 선생님은 승인 대기, 학생은 자동 승인
@@ -64,14 +94,19 @@ async def register(data: UserRegister, session: Session = Depends(get_session)):
     # [추가] 선생님 ID 유효성 검증 및 할당
     valid_teacher_id = None
     if data.role == "student" and data.teacher_id:
-        teacher = session.get(User, data.teacher_id)
+        teacher = await user_cache.get_async(session, data.teacher_id)
         if teacher and teacher.role == "teacher":
             valid_teacher_id = data.teacher_id
         else: raise HTTPException(status_code=400, detail="존재하지 않는 선생님 ID입니다.")
 
+    try:
+        pw_hash = await passwords.hash_async(data.password)
+    except AdmissionRejected as e:
+        raise _rejected(e)
+
     new_user = User(
         uid=data.id,
-        pw=hash_password(data.password),
+        pw=pw_hash,
         name=data.name,
         email=data.email,
         phone=data.phone,
@@ -79,21 +114,21 @@ async def register(data: UserRegister, session: Session = Depends(get_session)):
         role=data.role,
         teacher_id=valid_teacher_id, # [저장]
         is_approved=is_approved,
-        progress={"settings": {"goal": 10}, "topics": {}}
     )
     
     session.add(new_user)
-    session.commit()
+    await student_summary.refresh_async(session, [new_user.uid])
+    await session.commit()
     
     return {"status": "ok"}
 
 # [신규 추가] 아이디 중복 확인 엔드포인트
 @router.post("/check-id")
-async def check_id(data: IdCheckRequest, session: Session = Depends(get_session)):
+async def check_id(data: IdCheckRequest, session: AsyncSession = Depends(get_async_session)):
     """
     아이디 중복 여부를 확인합니다.
     - user가 존재하면(검색됨) -> is_available: False (사용 불가)
     - user가 없으면(None) -> is_available: True (사용 가능)
     """
-    user = session.get(User, data.id)
+    user = await user_cache.get_async(session, data.id)
     return {"is_available": user is None}
\ No newline at end of file
@@ -1,16 +1,21 @@
 from fastapi import APIRouter, Depends, Request, HTTPException
-from sqlmodel import Session, select, or_
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
 from typing import List
-from datetime import datetime
-from app.core.database import get_session
+import asyncio
+import json
+from app.core.database import get_read_session, read_engine
 from app.models import Notice, User
 from app.core.config import settings
-from app.core.session import verify_session
+from app.core.session import Principal, session_principal, verify_session
+from app.services.notice_feed import notice_feed
 
 router = APIRouter()
 
 # [내부 함수] 현재 로그인한 학생 정보 가져오기
-def _get_current_student(request: Request, session: Session) -> User:
+def _get_current_student(request: Request, session: Session) -> Principal:
     token = request.cookies.get(settings.SESSION_COOKIE_NAME, "")
     if not token:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
@@ -19,14 +24,15 @@ def _get_current_student(request: Request, session: Session) -> User:
     if not sess:
         raise HTTPException(status_code=401, detail="세션이 만료되었습니다.")
         
-    user = session.get(User, sess["uid"])
+    # 담당 선생님은 서명된 토큰에서 (DB 조회 없음)
+    user = session_principal(request, sess, lambda uid: session.get(User, uid))
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
         
     return user
 
 @router.get("/list", response_model=List[Notice])
-def get_notice_list(request: Request, db: Session = Depends(get_session)):
+def get_notice_list(request: Request, db: Session = Depends(get_read_session)):
     """
     [학생용] 공지사항 조회
     1. 학생의 담당 선생님(teacher_id)이 작성한 글만 조회
@@ -39,19 +45,46 @@ def get_notice_list(request: Request, db: Session = Depends(get_session)):
     if not student.teacher_id:
         return []
 
-    now = datetime.now()
-
-    # 2. 쿼리 작성 (선생님 필터링 + 예약 시간 체크)
-    statement = (
-        select(Notice)
-        .where(Notice.teacher_id == student.teacher_id)  # 내 선생님의 글만
-        .where(
-            or_(
-                Notice.scheduled_at == None,       # 예약 설정이 없거나 (즉시 발송)
-                Notice.scheduled_at <= now         # 예약 시간이 현재보다 과거인 경우
-            )
-        )
-        .order_by(Notice.created_at.desc())        # 최신순 정렬
+    # 2. 선생님별 공개 공지 캐시 (예약 시각이 되면 스스로 만료, app/services/notice_feed.py)
+    return notice_feed.feed(db, student.teacher_id)
+
+
+def _stream_auth(request: Request) -> Principal:
+    # 스트림이 열려 있는 동안 DB 연결을 잡지 않도록 인증에만 잠깐 세션 사용
+    with Session(read_engine) as session:
+        return _get_current_student(request, session)
+
+@router.get("/stream")
+async def stream_notices(request: Request):
+    """
+    [학생용] 새 공지 실시간 알림 (Server-Sent Events)
+    담당 선생님이 공지를 올리거나 예약 공지가 발송되면 "event: notice"로 공지 한 건을 보냄
+    """
+    student = await run_in_threadpool(_stream_auth, request)
+    if not student.teacher_id:
+        raise HTTPException(status_code=404, detail="담당 선생님이 없습니다.")
+    queue = notice_feed.subscribe(student.teacher_id)
+    if queue is None:
+        raise HTTPException(status_code=503, detail="지금은 알림 연결이 많아요. 잠시 후 다시 시도해 주세요.",
+                            headers={"Retry-After": "30"})
+
+    async def events():
+        try:
+            # 끊기면 5초 뒤 재접속 (브라우저 EventSource)
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    item = await asyncio.wait_for(queue.get(), settings.NOTICE_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"  # 프록시가 연결을 끊지 않도록
+                    continue
+                data = json.dumps(jsonable_encoder(item), ensure_ascii=False)
+                yield f"event: notice\nid: {item['id']}\ndata: {data}\n\n"
+        finally:
+            notice_feed.unsubscribe(student.teacher_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    
-    return db.exec(statement).all()
\ No newline at end of file
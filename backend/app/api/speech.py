@@ -1,29 +1,47 @@
 # app/api/speech.py
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, BackgroundTasks, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlmodel import Session
-import os
-import uuid
+from sqlmodel.ext.asyncio.session import AsyncSession
 import re  # [필수 추가]
 from pathlib import Path
 
 # [추가] DB 관련 모듈 임포트
-from app.core.database import get_session
-from app.models import StudyLog
+from app.core.database import get_async_session, get_read_session
+from app.models import StudyLog, StudyLogContour, User
+from app.core.session import Principal, session_principal, verify_session
 from app.audio_convert import convert_to_wav
 from app.speechpro_client import evaluate_pronunciation
+from app.core.admission import AdmissionRejected, admission
+from app.core.config import settings
+from app.services.upload_ingest import UploadRejected, ingest_upload
+from app.services.recording_archive import archive_recording_task, get_archive
+from app.services import contours, fallback_scorer, log_archive, phone_scores
+from app.services.log_writer import log_writer
+from app.services.user_cache import user_cache
 
 router = APIRouter()
 
 TMP_DIR = Path("/tmp")
 
+
+def _rejected_response(e: AdmissionRejected | UploadRejected) -> JSONResponse:
+    """거절 응답 (413/415: 잘못된 업로드, 429: 요청 한도 초과, 503: 엔진 과부하)"""
+    headers = {}
+    if e.retry_after is not None:
+        headers["Retry-After"] = str(max(1, int(e.retry_after + 0.999)))
+    return JSONResponse(status_code=e.status_code, content=e.to_dict(), headers=headers)
+
 @router.post("/evaluate")
 async def evaluate_speech(
+    background_tasks: BackgroundTasks,
     audio: UploadFile = File(...), 
     text: str = Form(...),
     # [추가] DB 저장을 위해 누가(user_id), 무엇을(word) 공부했는지 받습니다.
     user_id: str = Form(...),
     word: str = Form(...),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     # ✅ [수정] 엔진 전달용 텍스트 정규화
     # 1. 마침표(.), 물음표(?), 느낌표(!), 쉼표(,) 등 문장 부호를 모두 제거하거나 공백으로 치환
@@ -34,20 +52,24 @@ async def evaluate_speech(
     print(f"--- [진단] 요청 수신 시작: {clean_text} (User: {user_id}) ---")
     print(f"[DEBUG] 원본: '{text}' -> 엔진전달용: '{clean_text}'")
 
-    temp_id = uuid.uuid4()
-    temp_dir = "/tmp" 
-    input_path = Path(f"{temp_dir}/up_{temp_id}{os.path.splitext(audio.filename)[1]}")
+    # 0) Admission: 사용자/반(담당 선생님) 단위 요청 한도 (파일 처리 전에 거절)
+    student = await user_cache.get_async(session, user_id)
+    try:
+        admission.check_rate(user_id, student.teacher_id if student else None)
+    except AdmissionRejected as e:
+        return _rejected_response(e)
+
+    input_path: Path | None = None
     wav_path: Path | None = None
 
     try:
-        # 1) 업로드 저장 (기존 로직 유지)
-        content = await audio.read()
-        with open(input_path, "wb") as f:
-            f.write(content)
-        print(f"[DEBUG] 1. 파일 저장 완료: {input_path}")
+        # 1) 업로드 수집: 크기 제한 + 형식 판별 후 비공개 작업 폴더(janitor 관리 대상)에 저장
+        with await ingest_upload(audio) as upload:
+            input_path = upload.save_to(settings.UPLOAD_WORK_DIR)
+        print(f"[DEBUG] 1. 파일 저장 완료: {input_path} ({upload.format}, {upload.size} bytes)")
 
         # 2) wav 변환 (기존 로직 유지)
-        wav_path_str = convert_to_wav(input_path)
+        wav_path_str = await run_in_threadpool(convert_to_wav, input_path)
         print(f"[DEBUG] 2. 오디오 변환 완료: {wav_path_str}")
 
         if not wav_path_str:
@@ -58,9 +80,21 @@ async def evaluate_speech(
         # 3) 엔진 호출 (기존 로직 유지)
         print("[DEBUG] 3. 엔진 호출 시작 (GTP -> Model -> Score)...")
         print(f"[DEBUG] 3. 엔진 호출 문장: '{clean_text}'")
-        score, full_result = evaluate_pronunciation(clean_text, wav_path)
+        # 엔진 슬롯 대기/호출은 블로킹이므로 이벤트 루프 밖에서 수행
+        score, full_result = await run_in_threadpool(evaluate_pronunciation, clean_text, wav_path)
         print(f"[DEBUG] 4. 엔진 응답 수신 완료. 점수: {score}")
 
+        # 3-1) 엔진 장애 시 로컬 대체 채점 (참조 음성과 DTW 비교, 근사 점수)
+        if (
+            settings.FALLBACK_SCORER_ENABLED
+            and isinstance(full_result, dict)
+            and full_result.get("engine_unavailable")
+        ):
+            fallback = await run_in_threadpool(fallback_scorer.score_recording, clean_text, word, wav_path)
+            if fallback is not None:
+                print(f"[DEBUG] 4-1. 엔진 장애로 로컬 대체 채점 사용: {fallback[0]}")
+                score, full_result = fallback
+
         # ✅ 엔진 통신/응답 에러면 success False (기존 로직 유지)
         if not full_result or (isinstance(full_result, dict) and full_result.get("error")):
             msg = (
@@ -75,31 +109,49 @@ async def evaluate_speech(
         if score is not None:
             try:
                 feedback_msg = "참 잘했어요!" if score >= 80 else "조금 더 연습해볼까요?"
-                new_log = StudyLog(
-                    user_id=user_id,
-                    word=word,
-                    score=float(score),
-                    feedback=feedback_msg
+                # 쓰기 지연 버퍼에 넣고 바로 응답 (일괄 저장은 log_writer 스레드가 수행)
+                pending = log_writer.submit(
+                    StudyLog(user_id=user_id, word=word, score=float(score), feedback=feedback_msg)
                 )
-                session.add(new_log)
-                session.commit()
-                print(f"[DEBUG] 5. DB 저장 완료: {user_id} - {word} ({score}점)")
+                print(f"[DEBUG] 5. DB 저장 요청: {user_id} - {word} ({score}점)")
+
+                # 6~8) log_id가 필요한 후속 작업은 행이 저장된 뒤 백그라운드에서 실행
+                # 6) 녹음 보관 (압축/저장은 응답 이후 백그라운드에서 수행)
+                wav_bytes = wav_path.read_bytes()
+                if settings.RECORDING_ARCHIVE_ENABLED:
+                    background_tasks.add_task(log_writer.with_log_id, pending, archive_recording_task, wav_bytes, clean_text)
+                # 7) 억양/세기 곡선 (참조 음성 시간축 정렬 포함)
+                if settings.CONTOURS_ENABLED:
+                    background_tasks.add_task(log_writer.with_log_id, pending, contours.contour_task, wav_bytes, clean_text, word)
+                # 8) 음절/음소 점수 (로컬 대체 채점 결과는 엔진 점수와 척도가 달라 제외)
+                if isinstance(full_result, dict) and not full_result.get("fallback"):
+                    background_tasks.add_task(
+                        log_writer.with_log_id, pending, phone_scores.record_scores_task,
+                        user_id, student.teacher_id if student else None, full_result,
+                    )
             except Exception as db_e:
                 print(f"[Warning] DB 저장 실패 (평가는 정상 진행됨): {db_e}")
                 # DB 저장이 실패해도 사용자는 평가 결과를 볼 수 있어야 하므로 pass
 
         # ✅ 정상일 때만 success True (기존 로직 유지)
-        return {"success": True, "result": full_result, "score": score}
+        return {
+            "success": True,
+            "result": full_result,
+            "score": score,
+            "fallback": bool(isinstance(full_result, dict) and full_result.get("fallback")),
+        }
 
     except HTTPException:
         raise
+    except (AdmissionRejected, UploadRejected) as e:
+        return _rejected_response(e)
     except Exception as e:
         print(f"[API Error] {e}")
         return {"success": False, "error": f"서버 내부 오류: {str(e)}"}
     finally:
         # 리소스 정리 (기존 로직 유지)
         try:
-            if input_path.exists():
+            if input_path and input_path.exists():
                 input_path.unlink()
         except Exception:
             pass
@@ -107,4 +159,147 @@ async def evaluate_speech(
             if wav_path and wav_path.exists():
                 wav_path.unlink()
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+
+# ----------------------------------------------------------------------
+# 보관된 녹음 재생 (Range 지원)
+# ----------------------------------------------------------------------
+def _get_current_user(request: Request, session: Session) -> Principal:
+    token = request.cookies.get(settings.SESSION_COOKIE_NAME, "")
+    if not token:
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
+    sess = verify_session(token)
+    if not sess:
+        raise HTTPException(status_code=401, detail="세션이 만료되었습니다.")
+    user = session_principal(request, sess, lambda uid: session.get(User, uid))
+    if not user:
+        raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다.")
+    return user
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """'bytes=start-end' 단일 구간만 지원. 형식이 틀리면 None (전체 응답)"""
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_s, _, end_s = header[6:].strip().partition("-")
+    try:
+        if start_s == "":
+            # 접미 구간: bytes=-500 (마지막 500바이트)
+            length = int(end_s)
+            if length <= 0:
+                raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+            return max(0, size - length), size - 1
+        start = int(start_s)
+        end = int(end_s) if end_s else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, min(end, size - 1)
+
+
+def _get_viewable_log(log_id: int, request: Request, session: Session) -> StudyLog:
+    """본인, 담당 선생님, 관리자만 볼 수 있는 학습 로그"""
+    viewer = _get_current_user(request, session)
+
+    log = session.get(StudyLog, log_id)
+    if not log:
+        # 오래되어 월별 보관 파일로 옮긴 기록
+        archived = log_archive.get_log(log_id)
+        log = StudyLog(**archived) if archived else None
+    if not log:
+        raise HTTPException(status_code=404, detail="학습 기록을 찾을 수 없습니다.")
+
+    if viewer.role != "admin" and viewer.uid != log.user_id:
+        owner = user_cache.get(session, log.user_id)
+        if viewer.role != "teacher" or not owner or owner.teacher_id != viewer.uid:
+            raise HTTPException(status_code=403, detail="권한 없음")
+    return log
+
+
+@router.get("/recordings/{log_id}")
+def get_recording(log_id: int, request: Request, session: Session = Depends(get_read_session)):
+    """
+    학습 로그에 연결된 녹음 스트리밍.
+    본인, 담당 선생님, 관리자만 들을 수 있습니다.
+    """
+    _get_viewable_log(log_id, request, session)
+
+    archive = get_archive()
+    found = archive.lookup(session, log_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="보관된 녹음이 없습니다.")
+    _link, rec = found
+
+    key = archive.object_key(rec.sha256, rec.codec)
+    if not archive.backend.exists(key):
+        raise HTTPException(status_code=404, detail="보관된 녹음 파일이 없습니다.")
+    size = archive.backend.size(key)
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{rec.sha256}"',
+        "Cache-Control": "private, max-age=86400",
+    }
+    byte_range = _parse_range(request.headers.get("range", ""), size)
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        archive.backend.iter_range(key, start, end),
+        status_code=status_code,
+        media_type=archive.media_type(rec.codec),
+        headers=headers,
+    )
+
+
+# ----------------------------------------------------------------------
+# 억양/세기 곡선 (참조 음성 vs 학생 녹음)
+# ----------------------------------------------------------------------
+def _series(arr, col: int) -> list:
+    return [round(float(v), 1) for v in arr[:, col]] if arr is not None else []
+
+
+@router.get("/contours/{log_id}")
+def get_contours(log_id: int, request: Request, format: str = "json", session: Session = Depends(get_read_session)):
+    """
+    참조 음성 곡선과 참조 시간축에 맞춘 학생 곡선.
+    - format=json  : {"hop_ms", "reference": {"f0", "energy"}, "student": {...}, "student_raw": {...}}
+    - format=binary: float16 little-endian (n, 4) 행렬 [참조 F0, 참조 에너지, 학생 F0, 학생 에너지]
+    F0는 Hz(무성=0), 에너지는 발화 최대 대비 dB 입니다.
+    """
+    _get_viewable_log(log_id, request, session)
+    row = session.get(StudyLogContour, log_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="곡선 데이터가 없습니다.")
+
+    data = contours.contour_payload(row)
+    ref, student, raw = data["reference"], data["student"], data["student_raw"]
+
+    if format == "binary":
+        if ref is None:
+            raise HTTPException(status_code=404, detail="참조 음성 곡선이 없습니다.")
+        return Response(
+            content=contours.pack_binary(ref, student),
+            media_type="application/octet-stream",
+            headers={
+                "X-Contour-Hop-Ms": str(data["hop_ms"]),
+                "X-Contour-Columns": "ref_f0,ref_energy,student_f0,student_energy",
+                "Cache-Control": "private, max-age=86400",
+            },
+        )
+
+    return {
+        "success": True,
+        "hop_ms": data["hop_ms"],
+        "reference_audio": f"/assets/{row.reference}" if row.reference else "",
+        "reference": {"f0": _series(ref, 0), "energy": _series(ref, 1)},
+        "student": {"f0": _series(student, 0), "energy": _series(student, 1)},
+        "student_raw": {"f0": _series(raw, 0), "energy": _series(raw, 1)},
+    }
@@ -1,8 +1,9 @@
 # backend/app/api/study.py
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Query
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
-import shutil
+from sqlmodel.ext.asyncio.session import AsyncSession
 import os
 import pandas as pd
 import json
@@ -11,8 +12,12 @@ import random
 from datetime import datetime, timedelta
 import unicodedata  # [추가] 한글 자소 분리 방지용
 
-from app.core.database import get_session
+from app.core.database import engine, get_async_session, get_read_session, get_session
 from app.models import StudyProgress, StudyLog, User
+from app.services.upload_ingest import UploadRejected, ingest_upload
+from app.services import mastery, phone_scores, review_scheduler, rollups, student_summary, user_progress
+from app.services.log_writer import log_writer
+from app.services.user_cache import user_cache
 
 router = APIRouter()
 
@@ -148,27 +153,43 @@ def load_resource_map(level: str) -> Dict[str, Dict[str, str]]:
     return resource_map
 
 @router.get("/current-progress")
-async def get_current_progress(user_id: str, db: Session = Depends(get_session)):
+async def get_current_progress(user_id: str, db: AsyncSession = Depends(get_async_session)):
     statement = select(StudyProgress).where(StudyProgress.user_id == user_id).order_by(StudyProgress.updated_at.desc())
-    progress = db.exec(statement).first()
+    progress = (await db.exec(statement)).first()
     if not progress:
         return {"level": "초급1", "current_page": 1}
     return {"level": progress.level, "current_page": progress.current_page}
 
+def _create_student(user_id: str) -> None:
+    """처음 보는 user_id를 학생으로 등록. 쓰기 연결은 이 짧은 트랜잭션 동안만 사용"""
+    with Session(engine) as session:
+        if session.get(User, user_id):
+            return
+        # pw="" : 비밀번호 없는 계정 (verify_password가 항상 실패하므로 로그인 불가)
+        session.add(User(uid=user_id, name=user_id, pw="", role="student"))
+        try:
+            session.flush()
+            student_summary.refresh(session.connection(), [user_id])
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            if not session.get(User, user_id):
+                raise
+            # 같은 사용자를 동시에 만든 다른 요청이 먼저 저장함
+
 @router.get("/words", response_model=List[WordSchema])
-async def get_words(level: str = "초급1", user_id: Optional[str] = None, db: Session = Depends(get_session)):
+def get_words(level: str = "초급1", user_id: Optional[str] = None, db: Session = Depends(get_read_session)):
     if not os.path.exists(EXCEL_PATH): return []
 
     try:
         current_page = 1
         if user_id:
-            user = db.get(User, user_id)
-            if not user:
-                user = User(uid=user_id, name=user_id, role="student")
-                db.add(user); db.commit()
+            if not user_cache.get(db, user_id):
+                _create_student(user_id)
             statement = select(StudyProgress).where(StudyProgress.user_id == user_id, StudyProgress.level == level)
             progress = db.exec(statement).first()
             if progress: current_page = progress.current_page
+        db.close()  # 엑셀을 읽는 동안 읽기 연결 반납
 
         xls = pd.ExcelFile(EXCEL_PATH, engine="openpyxl")
         target_sheet = next((s for s in xls.sheet_names if s.replace(" ", "") == level.replace(" ", "")), None)
@@ -236,56 +257,46 @@ async def evaluate_pronunciation(
     file: UploadFile = File(...), 
     word: str = Form(...),
     user_id: str = Form(...), 
-    db: Session = Depends(get_session)
 ):
-    upload_dir = "temp_uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, file.filename)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
+    # 업로드 검증(크기/형식)만 수행. 이 엔드포인트는 파일을 채점에 쓰지 않으므로 디스크에 남기지 않음
+    try:
+        upload = await ingest_upload(file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    upload.close()
+
     score = random.randint(75, 100)
     feedback = "참 잘했어요!" if score > 85 else "조금만 더 힘내세요!"
-    new_log = StudyLog(user_id=user_id, word=word, score=float(score), feedback=feedback)
-    db.add(new_log)
-    db.commit()
+    log_writer.submit(StudyLog(user_id=user_id, word=word, score=float(score), feedback=feedback))
 
     return {"status": "success", "score": score, "feedback": feedback, "recognized_text": word}
 
 @router.post("/complete")
-async def complete_step(user_id: str = Form(...), level: str = Form(...), db: Session = Depends(get_session)):
+async def complete_step(user_id: str = Form(...), level: str = Form(...), db: AsyncSession = Depends(get_async_session)):
     statement = select(StudyProgress).where(StudyProgress.user_id == user_id, StudyProgress.level == level)
-    progress = db.exec(statement).first()
-    if progress:
-        progress.current_page += 1
-        progress.updated_at = datetime.now()
-        db.add(progress)
-    else:
-        new_progress = StudyProgress(user_id=user_id, level=level, current_page=2)
-        db.add(new_progress)
-    db.commit()
-    return {"status": "success", "next_page": progress.current_page if progress else 2}
-
-@router.get("/review-words")
-async def get_review_words(user_id: str, db: Session = Depends(get_session)):
-    if not os.path.exists(EXCEL_PATH): return []
-
-    # 1. 넉넉하게 최근/취약 기록 50개를 먼저 가져옵니다.
-    statement = select(StudyLog).where(StudyLog.user_id == user_id).order_by(StudyLog.score.asc()).limit(50)
-    all_logs = db.exec(statement).all()
-    if not all_logs: return []
-
-    # 2. 파이썬에서 단어 중복 제거 (이미 나온 단어는 건너뜀)
-    unique_logs = []
-    seen_words = set()
-    for log in all_logs:
-        if log.word not in seen_words:
-            unique_logs.append(log)
-            seen_words.add(log.word)
-        if len(unique_logs) >= 10: # 최종적으로 10개만 선택
-            break
-
-    # 3. 엑셀 데이터 로드 및 매칭 (이후 로직은 동일)
+    progress = (await db.exec(statement)).first()
+    if not progress:
+        db.add(StudyProgress(user_id=user_id, level=level, current_page=2))
+        try:
+            await student_summary.refresh_async(db, [user_id])
+            await db.commit()
+            return {"status": "success", "next_page": 2}
+        except IntegrityError:
+            # 같은 (user_id, level) 행을 다른 요청이 먼저 만든 경우 (unique 인덱스) -> 그 행을 갱신
+            await db.rollback()
+            progress = (await db.exec(statement)).one()
+    progress.current_page += 1
+    progress.updated_at = datetime.now()
+    db.add(progress)
+    await student_summary.refresh_async(db, [user_id])
+    await db.commit()
+    return {"status": "success", "next_page": progress.current_page}
+
+def load_review_items(words: List[str]) -> List[Dict]:
+    """복습 단어 목록(순서 유지)에 엑셀/JSON의 뜻, 예문, 오디오, 이미지 정보를 붙임. 엑셀에 없는 단어는 제외"""
+    if not words or not os.path.exists(EXCEL_PATH): return []
+
+    # 엑셀 데이터 로드 및 매칭
     xls = pd.ExcelFile(EXCEL_PATH, engine="openpyxl")
     all_df = pd.concat([pd.read_excel(xls, sheet_name=s) for s in xls.sheet_names], ignore_index=True)
     all_df = all_df.rename(columns=COLUMN_MAPPING)
@@ -297,8 +308,8 @@ async def get_review_words(user_id: str, db: Session = Depends(get_session)):
     review_list = []
     json_cache = {}
 
-    for log in unique_logs: # 중복 제거된 리스트 사용
-        row = all_df[all_df['word'] == log.word].iloc[0] if any(all_df['word'] == log.word) else None
+    for idx, word in enumerate(words, start=1):
+        row = all_df[all_df['word'] == word].iloc[0] if any(all_df['word'] == word) else None
         
         if row is not None:
             file_id = str(row.get('audio_path', '')).strip()
@@ -332,10 +343,10 @@ async def get_review_words(user_id: str, db: Session = Depends(get_session)):
             res = json_cache[json_filename].get(file_id, {})
 
             review_list.append({
-                "id": log.id,
+                "id": idx,
                 "level": str(row.get('level', f"Level{level_num}")),
                 "topic": "전체 복습",
-                "word": log.word,
+                "word": word,
                 "pronunciation": str(row.get('pronunciation', '')),
                 "meaning": str(row.get('meaning', '')),
                 "eng_meaning": str(row.get('eng_meaning', '')),
@@ -347,6 +358,66 @@ async def get_review_words(user_id: str, db: Session = Depends(get_session)):
             
     return review_list
 
+@router.get("/review-words")
+def get_review_words(user_id: str, db: Session = Depends(get_read_session)):
+    if not os.path.exists(EXCEL_PATH): return []
+
+    # 단어별 숙련도(최근 점수 가중 평균)가 낮은 10개 (쓰기 지연 버퍼의 본인 기록 먼저 저장)
+    # WordMastery (user_id, ewma) 인덱스 top-K 조회라 과거 StudyLog는 읽지 않습니다.
+    log_writer.ensure_flushed(user_id)
+    words = [log.word for log in mastery.weakest(db, user_id, limit=10)]
+    db.close()  # 엑셀을 읽는 동안 읽기 연결 반납
+    return load_review_items(words)
+
+@router.get("/review-set")
+def get_review_set(
+    user_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    db: Session = Depends(get_read_session),
+):
+    """
+    오늘의 복습 세트 (간격 반복 스케줄러).
+    오늘 안에 복습 예정인 카드를 오래 밀린 순으로 limit개(기본: 설정의 하루 목표 단어 수).
+    설정에서 '틀린 단어 복습'(reviewWrong)을 끈 사용자는 빈 세트.
+    """
+    # 쓰기 지연 버퍼의 본인 평가 기록이 카드에 반영된 뒤 조회 (읽기 트랜잭션 시작 전에)
+    log_writer.ensure_flushed(user_id)
+    study_settings = user_progress.get_settings(db, user_id)
+    goal = int(study_settings["goal"])
+    now = datetime.now()
+    result = {"date": now.date().isoformat(), "goal": goal, "due_count": 0, "items": []}
+    if not study_settings["review_wrong"]:
+        return result
+
+    until = review_scheduler.end_of_day(now)
+    cards = review_scheduler.due_cards(db, user_id, until, limit or goal)
+    result["due_count"] = review_scheduler.due_count(db, user_id, until)
+
+    by_word = {card.word: card for card in cards}
+    db.close()  # 엑셀을 읽는 동안 읽기 연결 반납 (카드 속성은 이미 읽어 둠)
+    for item in load_review_items([card.word for card in cards]):
+        card = by_word[item["word"]]
+        item.update({
+            "due_at": card.due_at.isoformat(),
+            "interval_days": card.interval_days,
+            "reps": card.reps,
+        })
+        result["items"].append(item)
+    return result
+
+@router.post("/quiz/answer")
+def submit_quiz_answer(
+    user_id: str = Form(...),
+    word: str = Form(...),
+    correct: bool = Form(...),
+    db: Session = Depends(get_session),
+):
+    """퀴즈 답 한 번을 복습 카드에 반영 (정답/오답 -> SM-2 품질)"""
+    quality = review_scheduler.QUIZ_CORRECT if correct else review_scheduler.QUIZ_WRONG
+    card = review_scheduler.record(db, user_id, word, quality)
+    db.commit()
+    return {"status": "success", "due_at": card["due_at"].isoformat(), "interval_days": card["interval_days"]}
+
 @router.get("/quiz")
 async def get_quiz(level: str = "초급1"):
     """
@@ -396,73 +467,36 @@ async def get_quiz(level: str = "초급1"):
         return []
 
 @router.get("/stats")
-async def get_student_stats(user_id: str, db: Session = Depends(get_session)):
+async def get_student_stats(user_id: str, db: AsyncSession = Depends(get_async_session)):
     """
     학생 개인 학습 통계 조회 (사양서 기반)
+    StudyLog 대신 일별/누적 집계 테이블(app/services/rollups.py)에서 계산하므로 기록 길이와 무관하게 일정한 비용
     """
-    # 1. 학생의 모든 학습 로그 조회 (최신순)
-    logs = db.exec(select(StudyLog).where(StudyLog.user_id == user_id).order_by(StudyLog.created_at.desc())).all()
-    
-    # 2. 이번 주(최근 7일) 학습한 단어 수 계산
-    now = datetime.now()
-    seven_days_ago = now - timedelta(days=7)
-    
-    # 최근 7일 내의 로그만 필터링
-    weekly_logs = [log for log in logs if log.created_at >= seven_days_ago]
-    # 중복 단어를 제외하고 개수 세기 (set 이용)
-    weekly_learned_count = len({log.word for log in weekly_logs})
-    
-    # 3. 전체 평균 정확도 계산
-    avg_accuracy = 0
-    if logs:
-        total_score = sum(log.score for log in logs)
-        avg_accuracy = int(total_score / len(logs))
-    
-    # 4. 연속 학습일(Streak) 계산
-    streak = 0
-    if logs:
-        # 로그에서 날짜만 추출하여 중복 제거 후 내림차순 정렬
-        dates = sorted(list({log.created_at.date() for log in logs}), reverse=True)
-        today = now.date()
-        
-        # 가장 최근 학습일이 오늘이거나 어제여야 연속 학습으로 인정
-        if dates and (today - dates[0]).days <= 1:
-            streak = 1
-            # 과거 날짜들을 비교하며 연속 여부 확인
-            for i in range(len(dates) - 1):
-                if (dates[i] - dates[i+1]).days == 1:
-                    streak += 1
-                else:
-                    break
-    
-    # 5. 주간 학습 추이 (월~일)
-    # 0:월요일, ... 6:일요일
-    weekly_trend = [0] * 7
-    
-    # 이번 주의 시작일(월요일) 구하기
-    start_of_week = now.date() - timedelta(days=now.weekday())
-    
-    for log in logs:
-        log_date = log.created_at.date()
-        # 로그 날짜가 이번 주(월~일) 범위에 포함되는지 확인
-        if start_of_week <= log_date <= (start_of_week + timedelta(days=6)):
-            day_idx = log_date.weekday() # 0(월) ~ 6(일)
-            weekly_trend[day_idx] += 1
-            
-    # 그래프 표현을 위해 가장 많이 학습한 날을 100%로 잡고 정규화
+    # 쓰기 지연 버퍼의 본인 기록을 먼저 저장 (집계도 같은 트랜잭션에서 갱신됨)
+    await log_writer.ensure_flushed_async(user_id)
+    stats = await rollups.student_stats(db, user_id)
+
+    # 1. 이번 주(최근 7일) 학습한 서로 다른 단어 수
+    weekly_learned_count = stats["weekly_learned"]
+
+    # 2. 전체 평균 정확도
+    avg_accuracy = int(stats["avg_score"])
+
+    # 3. 연속 학습일(Streak)
+    streak = stats["streak"]
+
+    # 4. 주간 학습 추이 (월~일), 가장 많이 학습한 날을 100%로 정규화
+    weekly_trend = stats["weekly_counts"]
     max_val = max(weekly_trend) if max(weekly_trend) > 0 else 1
     normalized_trend = [int((val / max_val) * 100) for val in weekly_trend]
 
-    # 6. 숙련도 (점수 구간별 분포)
-    total_count = len(logs) if logs else 1
-    high_count = len([l for l in logs if l.score >= 90])      # 90점 이상: 완전 암기
-    mid_count = len([l for l in logs if 70 <= l.score < 90])  # 70~89점: 복습 필요
-    low_count = len([l for l in logs if l.score < 70])        # 70점 미만: 다시 학습
-    
+    # 5. 숙련도 (점수 구간별 분포: 90점 이상 / 70~89점 / 70점 미만)
+    total_count = stats["attempts"] or 1
+    buckets = stats["buckets"]
     proficiency = [
-        {"label": "완전 암기", "value": int((high_count / total_count) * 100), "color": "bg-green-500"},
-        {"label": "복습 필요", "value": int((mid_count / total_count) * 100), "color": "bg-orange-400"},
-        {"label": "다시 학습", "value": int((low_count / total_count) * 100), "color": "bg-red-400"},
+        {"label": "완전 암기", "value": int((buckets["high"] / total_count) * 100), "color": "bg-green-500"},
+        {"label": "복습 필요", "value": int((buckets["mid"] / total_count) * 100), "color": "bg-orange-400"},
+        {"label": "다시 학습", "value": int((buckets["low"] / total_count) * 100), "color": "bg-red-400"},
     ]
 
     # 응원 메시지 설정
@@ -475,4 +509,15 @@ async def get_student_stats(user_id: str, db: Session = Depends(get_session)):
         "weeklyTrend": normalized_trend,
         "proficiency": proficiency,
         "message": message
-    }
\ No newline at end of file
+    }
+
+@router.get("/weak-phones")
+def get_weak_phones(user_id: str, days: Optional[int] = None, limit: int = 10, db: Session = Depends(get_read_session)):
+    """
+    학생 개인의 취약 음소/음절 (틀린 비율 높은 순)
+    """
+    since = datetime.now() - timedelta(days=days) if days else None
+    return {
+        "phones": phone_scores.weak_phones(db, user_id=user_id, since=since, limit=limit),
+        "syllables": phone_scores.weak_syllables(db, user_id=user_id, since=since, limit=limit),
+    }
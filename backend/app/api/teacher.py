@@ -1,61 +1,74 @@
 # app/api/teacher.py
-from fastapi import APIRouter, HTTPException, Request, Depends, Body
-from sqlmodel import Session, select, func
-from typing import List, Optional
-from datetime import datetime
-from app.core.database import get_session
-from app.models import User, StudyProgress, StudyLog, Notice
+from fastapi import APIRouter, HTTPException, Request, Depends, Body, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, select
+from typing import List, Literal, Optional
+from datetime import date, datetime, timedelta
+from app.core.admission import AdmissionRejected
+from app.core.database import get_read_session, get_session
+from app.models import User, StudyProgress, Notice
 from app.core.config import settings
-from app.core.session import verify_session
+from app.core.session import Principal, session_principal, verify_session
+from app.services import log_export, phone_scores, student_summary
+from app.services.log_writer import log_writer
+from app.services.notice_feed import notice_feed
+from app.services.user_cache import user_cache
 
 router = APIRouter(tags=["teacher"])
 
-def _require_teacher(request: Request, session: Session) -> User:
+def _require_teacher(request: Request, session: Session) -> Principal:
     token = request.cookies.get(settings.SESSION_COOKIE_NAME, "")
     if not token: raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     sess = verify_session(token)
     if not sess: raise HTTPException(status_code=401, detail="세션 만료")
-    user = session.get(User, sess["uid"])
+    # 역할은 서명된 토큰에서 (DB 조회 없음)
+    user = session_principal(request, sess, lambda uid: session.get(User, uid))
     if not user or user.role not in ["teacher", "admin"]:
         raise HTTPException(status_code=403, detail="권한 없음")
     return user
 
 @router.get("/students")
-def list_students(request: Request, session: Session = Depends(get_session)):
-    # 1. 현재 로그인한 선생님 정보 가져오기
+def list_students(
+    request: Request,
+    sort: Literal["name", "score", "progress"] = "name",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, max_length=50),
+    session: Session = Depends(get_read_session),
+):
+    """
+    담당 학생 목록 (관리자는 전체 학생).
+    학생 요약 테이블(app/services/student_summary.py)에서 키셋 페이지네이션으로 한 페이지씩 조회합니다.
+    다음 페이지는 응답의 next_cursor를 cursor로 (같은 q와 함께) 넘겨 요청합니다.
+    q: 이름 검색. total / avg_progress 는 검색어와 무관하게 담당 학생 전체 기준입니다.
+    """
     teacher = _require_teacher(request, session)
-    
-    # 2. [수정됨] 해당 선생님이 담당하는 학생만 조회 (User.teacher_id == teacher.uid)
-    #    (관리자인 경우 모든 학생을 볼 수도 있겠지만, 여기선 엄격하게 자기 학생만 봅니다)
-    query = select(User).where(User.role == "student")
-    
-    # 만약 선생님이 'admin' 권한이 아니라 일반 'teacher'라면, 본인 학생만 필터링
-    if teacher.role == "teacher":
-        query = query.where(User.teacher_id == teacher.uid)
-        
-    students = session.exec(query).all()
 
-    items = []
-    for student in students:
-        prog = session.exec(select(StudyProgress).where(StudyProgress.user_id == student.uid)).first()
-        avg_score = session.exec(select(func.avg(StudyLog.score)).where(StudyLog.user_id == student.uid)).first() or 0.0
-        
-        current_page = prog.current_page if prog else 1
-        progress_rate = min(1.0, ((current_page - 1) * 10) / 100)
+    # 일반 선생님은 본인 학생만, 관리자는 전체 학생
+    teacher_id = teacher.uid if teacher.role == "teacher" else None
+    try:
+        rows, next_cursor = student_summary.list_page(session, teacher_id, sort, order, limit, cursor, q and q.strip())
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 입니다.")
 
-        items.append({
-            "uid": student.uid, 
-            "name": student.name, 
-            "country": student.country or "KR",
-            "current_level": prog.level if prog else "미시작", 
-            "current_page": current_page,
-            "avg_score": round(float(avg_score), 1), 
-            "progress_rate": progress_rate,
-        })
-    return {"ok": True, "items": items}
+    items = [
+        {
+            "uid": row.user_id,
+            "name": row.name,
+            "country": row.country,
+            "current_level": row.level,
+            "current_page": row.current_page,
+            "avg_score": row.avg_score,
+            "progress_rate": row.progress_rate,
+        }
+        for row in rows
+    ]
+    total, avg_progress = student_summary.aggregate(session, teacher_id)
+    return {"ok": True, "items": items, "next_cursor": next_cursor, "total": total, "avg_progress": avg_progress}
 
 @router.get("/notices", response_model=List[Notice])
-def list_teacher_notices(request: Request, session: Session = Depends(get_session)):
+def list_teacher_notices(request: Request, session: Session = Depends(get_read_session)):
     teacher = _require_teacher(request, session)
     # teacher_id가 일치하는 공지만 조회
     return session.exec(
@@ -65,7 +78,7 @@ def list_teacher_notices(request: Request, session: Session = Depends(get_sessio
     ).all()
 
 @router.post("/notice")
-async def send_notice(
+def send_notice(
     title: str = Body(...), 
     content: str = Body(...), 
     scheduled_at: Optional[str] = Body(None), 
@@ -80,6 +93,9 @@ async def send_notice(
             dt_scheduled = datetime.fromisoformat(scheduled_at)
         except ValueError:
             pass 
+        # 시간대가 붙어 오면 서버 현지 시각으로 (DB의 다른 시각들과 같은 기준)
+        if dt_scheduled and dt_scheduled.tzinfo:
+            dt_scheduled = dt_scheduled.astimezone().replace(tzinfo=None)
 
     new_notice = Notice(
         title=title, 
@@ -90,14 +106,17 @@ async def send_notice(
     )
     session.add(new_notice)
     session.commit()
+    session.refresh(new_notice)
+    # 예약이면 그 시각에, 아니면 지금 담당 학생들에게 알림 + 피드 캐시 무효화
+    notice_feed.created(new_notice)
     return {"status": "ok"}
 
 @router.get("/student/{student_id}")
-def get_student_detail(student_id: str, request: Request, session: Session = Depends(get_session)):
+def get_student_detail(student_id: str, request: Request, session: Session = Depends(get_read_session)):
     teacher = _require_teacher(request, session)
     
     # [수정] 상세 조회 시에도 내 학생인지 검증하는 것이 안전함
-    student = session.get(User, student_id)
+    student = user_cache.get(session, student_id)
     if not student:
         raise HTTPException(status_code=404, detail="학생을 찾을 수 없습니다.")
     
@@ -121,4 +140,93 @@ def get_student_detail(student_id: str, request: Request, session: Session = Dep
             "level": prog.level if prog else "미시작",
             "page": prog.current_page if prog else 0
         }
-    }
\ No newline at end of file
+    }
+
+@router.get("/weak-phones")
+def get_class_weak_phones(
+    request: Request,
+    student_id: Optional[str] = None,
+    days: Optional[int] = None,
+    limit: int = 10,
+    session: Session = Depends(get_read_session),
+):
+    """
+    반 전체(student_id 없음) 또는 담당 학생 한 명의 취약 음소/음절.
+    관리자는 student_id 없이 호출하면 전체 학생 기준으로 집계됩니다.
+    """
+    teacher = _require_teacher(request, session)
+
+    if student_id:
+        student = user_cache.get(session, student_id)
+        if not student:
+            raise HTTPException(status_code=404, detail="학생을 찾을 수 없습니다.")
+        if teacher.role == "teacher" and student.teacher_id != teacher.uid:
+            raise HTTPException(status_code=403, detail="담당 학생이 아닙니다.")
+        scope = {"user_id": student_id}
+    else:
+        scope = {"teacher_id": teacher.uid} if teacher.role == "teacher" else {}
+
+    since = datetime.now() - timedelta(days=days) if days else None
+    return {
+        "ok": True,
+        "phones": phone_scores.weak_phones(session, since=since, limit=limit, **scope),
+        "syllables": phone_scores.weak_syllables(session, since=since, limit=limit, **scope),
+    }
+
+
+@router.get("/export/logs")
+def export_logs(
+    request: Request,
+    format: Literal["csv", "parquet"] = "csv",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    level: Optional[str] = None,
+    student_id: Optional[str] = None,
+    session: Session = Depends(get_read_session),
+):
+    """
+    담당 학생(관리자는 전체 학생)의 학습 로그를 CSV/Parquet으로 스트리밍 내보내기.
+    start~end(날짜, 둘 다 포함), 레벨(단어장 시트), 학생으로 거를 수 있고,
+    월별 보관 파일과 DB를 묶음 단위로 읽어 바로 보내므로 행 수와 무관하게 메모리가 일정합니다.
+    """
+    teacher = _require_teacher(request, session)
+
+    if format == "parquet" and not log_export.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet 내보내기를 사용할 수 없습니다 (서버에 pyarrow 미설치). format=csv를 사용하세요.")
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start가 end보다 늦습니다.")
+
+    words = None
+    if level:
+        words = log_export.words_for_level(level)
+        if words is None:
+            raise HTTPException(status_code=400, detail=f"알 수 없는 레벨입니다: {level}")
+
+    # 일반 선생님은 본인 학생만, 관리자는 전체
+    user_ids = log_export.student_ids(session, teacher.uid) if teacher.role == "teacher" else None
+    if student_id:
+        student = user_cache.get(session, student_id)
+        if not student:
+            raise HTTPException(status_code=404, detail="학생을 찾을 수 없습니다.")
+        if teacher.role == "teacher" and student.teacher_id != teacher.uid:
+            raise HTTPException(status_code=403, detail="담당 학생이 아닙니다.")
+        user_ids = [student_id]
+
+    since = datetime.combine(start, datetime.min.time()) if start else None
+    until = datetime.combine(end + timedelta(days=1), datetime.min.time()) if end else None
+
+    # 요청 시점까지 버퍼에 있던 평가 기록도 포함되도록 먼저 저장
+    log_writer.ensure_flushed()
+    try:
+        # 요청 세션과 별도로 스트리밍이 끝날 때까지 내보내기 전용 연결 하나 사용
+        batches = log_export.open_batches(user_ids, since, until, words)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message,
+                            headers={"Retry-After": str(int(e.retry_after or 1))})
+
+    filename = f"studylog-{datetime.now():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        log_export.stream(format, batches),
+        media_type=log_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
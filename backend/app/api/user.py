@@ -1,22 +1,26 @@
 # backend/app/api/user.py
 from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import Session
-from app.core.database import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_async_session, run_async
 from app.models import User
-from app.schemas import UserProfileUpdate, UserSettingsUpdate, UserPasswordUpdate
+from app.core.admission import AdmissionRejected
+from app.core.session import revoke_user
+from app.services import student_summary, user_progress
+from app.services.passwords import passwords
+from app.services.user_cache import user_cache
+from app.schemas import UserProfileUpdate, UserSettingsUpdate, UserPasswordUpdate, UserPublic
 
 router = APIRouter()
 
 # 1. 프로필 조회
 @router.get("/{user_id}/profile")
-async def get_profile(user_id: str, session: Session = Depends(get_session)):
-    user = session.get(User, user_id)
+async def get_profile(user_id: str, session: AsyncSession = Depends(get_async_session)):
+    user = await user_cache.get_async(session, user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     
-    progress = user.progress if user.progress else {}
-    settings = progress.get("settings", {})
+    settings = await run_async(session, user_progress.get_settings, user_id)
     
     return {
         "uid": user.uid,
@@ -31,15 +35,22 @@ async def get_profile(user_id: str, session: Session = Depends(get_session)):
         "reviewWrong": settings.get("review_wrong", True)
     }
 
+# 학습 상태 전체 (예전 User.progress JSON과 같은 모양의 호환 조회)
+@router.get("/{user_id}/progress")
+async def get_progress(user_id: str, session: AsyncSession = Depends(get_async_session)):
+    if not await user_cache.get_async(session, user_id):
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    return await run_async(session, user_progress.compose, user_id)
+
 # 2. 프로필 수정
 @router.put("/{user_id}/profile")
 async def update_profile(
     user_id: str, 
     data: UserProfileUpdate, 
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     # 1. 유저 조회
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -49,59 +60,74 @@ async def update_profile(
     if data.country is not None: user.country = data.country
     
     # 3. 선생님 ID 연결 로직
+    old_teacher_id = user.teacher_id
     if data.teacher_id is not None:
         if data.teacher_id == "": 
             # 빈 문자열이면 연결 해제
             user.teacher_id = None
         else:
             # 선생님 ID가 유효한지 검증
-            teacher = session.get(User, data.teacher_id)
+            teacher = await user_cache.get_async(session, data.teacher_id)
             if teacher and teacher.role == "teacher":
                 user.teacher_id = data.teacher_id
             else:
                 # 존재하지 않거나 학생 계정인 경우 에러 처리
                 raise HTTPException(status_code=400, detail="존재하지 않는 선생님 ID입니다.")
 
-    # 4. 저장
+    # 4. 저장 (선생님 대시보드 요약도 함께 갱신)
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await student_summary.refresh_async(session, [user_id])
+    if user.teacher_id != old_teacher_id:
+        # 세션 토큰에 담긴 담당 선생님이 낡음 -> 다음 요청 때 DB에서 다시 읽고 새 토큰 발급
+        await run_async(session, revoke_user, user_id, False)
+    await session.commit()
+    user_cache.invalidate(user_id)
+    await session.refresh(user)
     
-    return {"status": "ok", "message": "Updated", "user": user}
+    return {"status": "ok", "message": "Updated", "user": UserPublic.model_validate(user)}
 
 @router.put("/{user_id}/settings")
-async def update_settings(user_id: str, data: UserSettingsUpdate, session: Session = Depends(get_session)):
-    user = session.get(User, user_id)
+async def update_settings(user_id: str, data: UserSettingsUpdate, session: AsyncSession = Depends(get_async_session)):
+    user = await user_cache.get_async(session, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    current_progress = dict(user.progress) if user.progress else {}
-    if "settings" not in current_progress:
-        current_progress["settings"] = {}
+    # 바뀐 설정 항목만 저장 (UserSetting 행 단위)
+    changes = {}
     if data.dailyGoal is not None:
-        current_progress["settings"]["goal"] = data.dailyGoal
+        changes["goal"] = data.dailyGoal
     if data.reviewWrong is not None:
-        current_progress["settings"]["review_wrong"] = data.reviewWrong
-    user.progress = current_progress
-    session.add(user)
-    session.commit()
+        changes["review_wrong"] = data.reviewWrong
+    await run_async(session, user_progress.set_settings, user_id, changes)
+    await session.commit()
     return {"status": "ok", "message": "Settings saved"}
 
 @router.put("/{user_id}/password")
-async def change_password(user_id: str, data: UserPasswordUpdate, session: Session = Depends(get_session)):
-    user = session.get(User, user_id)
+async def change_password(user_id: str, data: UserPasswordUpdate, session: AsyncSession = Depends(get_async_session)):
+    user = await session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    if user.pw != data.old_password:
-        raise HTTPException(status_code=400, detail="Wrong password")
-    user.pw = data.new_password
+    try:
+        is_valid, _ = await passwords.verify_async(user.pw, data.old_password)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail="Wrong password")
+        user.pw = await passwords.hash_async(data.new_password)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     session.add(user)
-    session.commit()
+    # 다른 기기에 남은 세션 모두 폐기
+    await run_async(session, revoke_user, user_id)
+    await session.commit()
+    user_cache.invalidate(user_id)
     return {"status": "ok", "message": "Password changed"}
 
 @router.delete("/{user_id}")
-async def withdraw_user(user_id: str, session: Session = Depends(get_session)):
-    user = session.get(User, user_id)
+async def withdraw_user(user_id: str, session: AsyncSession = Depends(get_async_session)):
+    user = await session.get(User, user_id)
     if user:
-        session.delete(user)
-        session.commit()
+        await session.delete(user)
+        await run_async(session, user_progress.delete_user, user_id)
+        await student_summary.refresh_async(session, [user_id])
+        await run_async(session, revoke_user, user_id)
+        await session.commit()
+        user_cache.invalidate(user_id)
     return {"status": "ok", "message": "User deleted"}
@@ -8,7 +8,8 @@ from typing import Union
 # app/audio_convert.py 수정 제안
 def convert_to_wav(input_path: Union[str, Path]) -> str:
     input_path = Path(input_path)
-    out_wav_path = input_path.with_suffix(".wav")
+    # 입력이 이미 .wav여도 ffmpeg가 같은 파일을 읽고 쓰지 않도록 출력은 항상 다른 이름
+    out_wav_path = input_path.with_name(f"{input_path.stem}_16k.wav")
 
     cmd = [
         "ffmpeg", "-y", "-i", str(input_path),
@@ -0,0 +1,270 @@
+# backend/app/core/admission.py
+"""
+발음 평가 엔진 호출에 대한 Admission control.
+
+1) 토큰 버킷: 사용자(user_id) 단위 + 반(담당 선생님 teacher_id) 단위
+2) 전역 동시 실행 제한: 엔진 호출 슬롯 수(EVAL_MAX_CONCURRENCY)
+3) 우선순위: 대화형(INTERACTIVE) 평가가 배치/재채점(BACKGROUND)보다 먼저 슬롯을 받음
+   - BACKGROUND는 EVAL_BACKGROUND_MAX 개까지만 동시에 실행됩니다.
+4) Load shedding: 대기열이 가득 차거나 대기 시간이 초과되면 AdmissionRejected 발생
+
+엔진 호출은 동기(requests) 코드이므로 슬롯 대기도 스레드 기반(threading.Condition)입니다.
+async 핸들러에서는 반드시 run_in_threadpool 안에서 engine_slot()을 사용해야 합니다.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # 학생이 녹음 버튼을 눌러 기다리는 평가
+    BACKGROUND = 1   # 재채점 등 일괄 작업
+
+
+class AdmissionRejected(Exception):
+    """요청 거부. code는 클라이언트가 분기할 수 있는 고정 문자열입니다."""
+
+    def __init__(self, code: str, message: str, status_code: int = 429, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"success": False, "code": self.code, "error": self.message}
+        if self.retry_after is not None:
+            data["retry_after"] = round(self.retry_after, 2)
+        return data
+
+
+# ----------------------------------------------------------------------
+# 토큰 버킷
+# ----------------------------------------------------------------------
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self, now: float, n: float = 1.0) -> float:
+        """토큰을 꺼냅니다. 성공 시 0.0, 실패 시 다시 시도할 수 있을 때까지의 초를 반환"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= n:
+            self.tokens -= n
+            return 0.0
+        if self.rate <= 0:
+            return float("inf")
+        return (n - self.tokens) / self.rate
+
+
+class BucketRegistry:
+    """키별 토큰 버킷 모음. 오래 안 쓰인 키부터 제거해 메모리를 제한합니다."""
+
+    def __init__(self, rate: float, capacity: float, max_keys: int = 10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, n: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity)
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.take(now, n)
+
+    def refund(self, key: str, n: float = 1.0) -> None:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.tokens = min(bucket.capacity, bucket.tokens + n)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# ----------------------------------------------------------------------
+# 우선순위 동시 실행 게이트
+# ----------------------------------------------------------------------
+class ConcurrencyGate:
+    def __init__(self, max_concurrency: int, background_max: int, max_queue: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.background_max = max(0, min(background_max, self.max_concurrency))
+        self.max_queue = max(0, max_queue)
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self.active = 0
+        self.active_background = 0
+
+    def _eligible(self, ticket: Tuple[int, int]) -> bool:
+        if self.active >= self.max_concurrency:
+            return False
+        if ticket[0] == Priority.BACKGROUND and self.active_background >= self.background_max:
+            return False
+        return bool(self._queue) and self._queue[0] == ticket
+
+    def acquire(self, priority: Priority, timeout: float) -> None:
+        with self._cond:
+            if len(self._queue) >= self.max_queue and self.active >= self.max_concurrency:
+                raise AdmissionRejected(
+                    "ENGINE_OVERLOADED",
+                    "지금은 평가 요청이 많아요. 잠시 후 다시 시도해 주세요.",
+                    status_code=503,
+                    retry_after=1.0,
+                )
+
+            ticket = (int(priority), next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            deadline = time.monotonic() + timeout
+            try:
+                while not self._eligible(ticket):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise AdmissionRejected(
+                            "ENGINE_QUEUE_TIMEOUT",
+                            "평가 대기 시간이 초과되었습니다. 잠시 후 다시 시도해 주세요.",
+                            status_code=503,
+                            retry_after=1.0,
+                        )
+                    self._cond.wait(remaining)
+                heapq.heappop(self._queue)
+                self.active += 1
+                if priority == Priority.BACKGROUND:
+                    self.active_background += 1
+            except BaseException:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                raise
+            finally:
+                # 대기열 head가 바뀌었을 수 있으므로 모두 깨워 재확인
+                self._cond.notify_all()
+
+    def release(self, priority: Priority) -> None:
+        with self._cond:
+            self.active -= 1
+            if priority == Priority.BACKGROUND:
+                self.active_background -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            waiting_bg = sum(1 for p, _ in self._queue if p == Priority.BACKGROUND)
+            return {
+                "active": self.active,
+                "active_background": self.active_background,
+                "waiting": len(self._queue),
+                "waiting_background": waiting_bg,
+                "max_concurrency": self.max_concurrency,
+                "background_max": self.background_max,
+                "max_queue": self.max_queue,
+            }
+
+
+# ----------------------------------------------------------------------
+# 컨트롤러
+# ----------------------------------------------------------------------
+class AdmissionController:
+    def __init__(
+        self,
+        user_rate: float,
+        user_burst: float,
+        cohort_rate: float,
+        cohort_burst: float,
+        max_concurrency: int,
+        background_max: int,
+        max_queue: int,
+        queue_timeout: float,
+    ):
+        self.users = BucketRegistry(user_rate, user_burst)
+        self.cohorts = BucketRegistry(cohort_rate, cohort_burst)
+        self.gate = ConcurrencyGate(max_concurrency, background_max, max_queue)
+        self.queue_timeout = queue_timeout
+
+    def check_rate(self, user_id: str, cohort_id: Optional[str] = None) -> None:
+        """대화형 평가 1건에 대한 사용자/반 토큰 차감. 초과 시 AdmissionRejected(429)"""
+        wait = self.users.take(f"user:{user_id}")
+        if wait > 0:
+            metrics.inc("admission_rejected_total", code="RATE_LIMIT_USER")
+            raise AdmissionRejected(
+                "RATE_LIMIT_USER",
+                "너무 빠르게 녹음하고 있어요. 잠시 후 다시 시도해 주세요.",
+                retry_after=wait,
+            )
+
+        if cohort_id:
+            wait = self.cohorts.take(f"cohort:{cohort_id}")
+            if wait > 0:
+                # 반 한도로 거절된 경우 개인 토큰은 돌려줌
+                self.users.refund(f"user:{user_id}")
+                metrics.inc("admission_rejected_total", code="RATE_LIMIT_COHORT")
+                raise AdmissionRejected(
+                    "RATE_LIMIT_COHORT",
+                    "지금 반 전체의 평가 요청이 많아요. 잠시 후 다시 시도해 주세요.",
+                    retry_after=wait,
+                )
+
+        metrics.inc("admission_admitted_total")
+
+    @contextmanager
+    def engine_slot(self, priority: Priority = Priority.INTERACTIVE, timeout: Optional[float] = None) -> Iterator[None]:
+        """엔진 호출 구간을 감싸는 슬롯. 동기 코드(스레드)에서만 사용합니다."""
+        wait_start = time.monotonic()
+        try:
+            self.gate.acquire(priority, self.queue_timeout if timeout is None else timeout)
+        except AdmissionRejected as e:
+            metrics.inc("admission_rejected_total", code=e.code)
+            raise
+        metrics.inc("engine_slot_wait_seconds_total", time.monotonic() - wait_start, priority=priority.name.lower())
+        metrics.inc("engine_calls_total", priority=priority.name.lower())
+        try:
+            yield
+        finally:
+            self.gate.release(priority)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.gate.stats(),
+            "tracked_users": len(self.users),
+            "tracked_cohorts": len(self.cohorts),
+            "user_rate": self.users.rate,
+            "user_burst": self.users.capacity,
+            "cohort_rate": self.cohorts.rate,
+            "cohort_burst": self.cohorts.capacity,
+        }
+
+
+admission = AdmissionController(
+    user_rate=settings.EVAL_USER_RATE,
+    user_burst=settings.EVAL_USER_BURST,
+    cohort_rate=settings.EVAL_COHORT_RATE,
+    cohort_burst=settings.EVAL_COHORT_BURST,
+    max_concurrency=settings.EVAL_MAX_CONCURRENCY,
+    background_max=settings.EVAL_BACKGROUND_MAX,
+    max_queue=settings.EVAL_MAX_QUEUE,
+    queue_timeout=settings.EVAL_QUEUE_TIMEOUT,
+)
+metrics.register_gauge("admission", admission.stats)
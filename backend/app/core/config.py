@@ -4,15 +4,121 @@ from pathlib import Path
 class Settings:
     BACKEND_ROOT = Path(__file__).resolve().parents[2]
     DATA_DIR = BACKEND_ROOT / "data"
+    INDEX_DIR = BACKEND_ROOT.parent / "data" / "index"
+    # 원어민 참조 음성/이미지 루트 (index JSON의 resources.*.file 경로 기준)
+    ASSETS_DIR = Path(os.getenv("ASSETS_DIR", str(BACKEND_ROOT.parent / "frontend" / "public" / "assets")))
+    VOCAB_XLSX = DATA_DIR / "vocab" / "vocabulary.xlsx"
     TEMP_UPLOAD_DIR = BACKEND_ROOT / "temp_uploads"
     USERS_FILE = DATA_DIR / "users.json"
     
     SESSION_SECRET = os.getenv("SESSION_SECRET", "dev-secret-jsv-2026")
+    # 키 교체: 예전 SESSION_SECRET을 쉼표로 나열하면 그 키로 서명된 토큰도 받고 현재 키로 다시 발급
+    SESSION_PREVIOUS_SECRETS = [s for s in os.getenv("SESSION_PREVIOUS_SECRETS", "").split(",") if s]
     SESSION_COOKIE_NAME = "access_token"
-    SESSION_TTL_SECONDS = 1209600
+    SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "1209600"))
+    SESSION_REVOCATION_REFRESH = float(os.getenv("SESSION_REVOCATION_REFRESH", "5"))  # 다른 워커의 폐기 목록 반영 주기(초)
+
+    # 비밀번호 해싱 (app/services/passwords.py). 조정: backend/bench_login.py
+    PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))  # 2배마다 시간/메모리 2배 (2**14: 16MB)
+    PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+    PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+    PASSWORD_HASH_POOL = os.getenv("PASSWORD_HASH_POOL", "thread")  # thread | process
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))  # 넘으면 바로 503
+    LOGIN_USER_RATE = float(os.getenv("LOGIN_USER_RATE", "0.2"))      # 아이디당 초당 로그인 시도 (성공은 차감 안 함)
+    LOGIN_USER_BURST = float(os.getenv("LOGIN_USER_BURST", "5"))
+    LOGIN_CLIENT_RATE = float(os.getenv("LOGIN_CLIENT_RATE", "2"))    # 접속 주소당
+    LOGIN_CLIENT_BURST = float(os.getenv("LOGIN_CLIENT_BURST", "20"))
+
+    # 사용자 조회 캐시 (app/services/user_cache.py). URL: "" 메모리 | file:///경로 | redis://...
+    USER_CACHE_URL = os.getenv("USER_CACHE_URL", "")
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))  # 초 (0이면 끔)
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+
+    # 공지 피드 캐시/예약 발송/실시간 알림 (app/services/notice_feed.py)
+    NOTICE_FEED_TTL = float(os.getenv("NOTICE_FEED_TTL", "300"))          # 초 (0이면 캐시 끔)
+    NOTICE_SYNC_INTERVAL = float(os.getenv("NOTICE_SYNC_INTERVAL", "5"))  # 다른 워커가 만든 공지 확인 주기(초, 0이면 끔)
+    NOTICE_STREAM_HEARTBEAT = float(os.getenv("NOTICE_STREAM_HEARTBEAT", "15"))
+    NOTICE_STREAM_MAX_SUBSCRIBERS = int(os.getenv("NOTICE_STREAM_MAX_SUBSCRIBERS", "5000"))
+
+    # 발음 평가 Admission control (app/core/admission.py)
+    EVAL_USER_RATE = float(os.getenv("EVAL_USER_RATE", "0.5"))        # 사용자당 초당 평가 수
+    EVAL_USER_BURST = float(os.getenv("EVAL_USER_BURST", "5"))
+    EVAL_COHORT_RATE = float(os.getenv("EVAL_COHORT_RATE", "5"))      # 반(담당 선생님)당 초당 평가 수
+    EVAL_COHORT_BURST = float(os.getenv("EVAL_COHORT_BURST", "40"))
+    EVAL_MAX_CONCURRENCY = int(os.getenv("EVAL_MAX_CONCURRENCY", "4"))  # 동시 엔진 호출 수
+    EVAL_BACKGROUND_MAX = int(os.getenv("EVAL_BACKGROUND_MAX", "1"))    # 그 중 배치 작업이 쓸 수 있는 수
+    EVAL_MAX_QUEUE = int(os.getenv("EVAL_MAX_QUEUE", "32"))
+    EVAL_QUEUE_TIMEOUT = float(os.getenv("EVAL_QUEUE_TIMEOUT", "15"))
+    # 재채점 CLI (app/services/rescore.py): 이 서버의 /metrics에 대화형 평가가 보이면 끝날 때까지 대기
+    RESCORE_SERVER_URL = os.getenv("RESCORE_SERVER_URL", "http://127.0.0.1:8000")
+    RESCORE_IDLE_POLL = float(os.getenv("RESCORE_IDLE_POLL", "1.0"))  # 초
+
+    # 업로드 수집/정리 (app/services/upload_ingest.py, upload_janitor.py)
+    # 녹음 업로드/변환 작업 폴더 (spool, ffmpeg 입출력, 재채점/보관 임시 파일). janitor 정리 대상.
+    # 학생 녹음이 들어가므로 /files로 공개되는 TEMP_UPLOAD_DIR와 분리
+    UPLOAD_WORK_DIR = Path(os.getenv("UPLOAD_WORK_DIR", str(DATA_DIR / "uploads")))
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+    UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(1024 * 1024)))  # 이하면 메모리에만 보관
+    UPLOAD_TTL_SECONDS = int(os.getenv("UPLOAD_TTL_SECONDS", "3600"))
+    UPLOAD_MIN_AGE_SECONDS = int(os.getenv("UPLOAD_MIN_AGE_SECONDS", "120"))
+    UPLOAD_DIR_QUOTA_BYTES = int(os.getenv("UPLOAD_DIR_QUOTA_BYTES", str(500 * 1024 * 1024)))
+    UPLOAD_JANITOR_INTERVAL = int(os.getenv("UPLOAD_JANITOR_INTERVAL", "300"))
+
+    # 녹음 아카이브 (app/services/recording_archive.py)
+    RECORDING_ARCHIVE_ENABLED = os.getenv("RECORDING_ARCHIVE_ENABLED", "1") == "1"
+    RECORDING_BACKEND = os.getenv("RECORDING_BACKEND", "local")
+    RECORDING_DIR = Path(os.getenv("RECORDING_DIR", str(DATA_DIR / "recordings")))
+    RECORDING_CODEC = os.getenv("RECORDING_CODEC", "flac")  # flac | opus
+
+    # 엔진 장애 시 로컬 대체 채점 (app/services/fallback_scorer.py)
+    FALLBACK_SCORER_ENABLED = os.getenv("FALLBACK_SCORER_ENABLED", "1") == "1"
+    FEATURE_STORE_DIR = Path(os.getenv("FEATURE_STORE_DIR", str(DATA_DIR / "features")))
+    FALLBACK_SCORE_D0 = float(os.getenv("FALLBACK_SCORE_D0", "3.3"))      # 이 평균 거리에서 50점
+    FALLBACK_SCORE_SLOPE = float(os.getenv("FALLBACK_SCORE_SLOPE", "0.35"))
+
+    # 억양/세기 곡선 (app/services/contours.py, 참조 곡선은 FEATURE_STORE_DIR에 저장)
+    CONTOURS_ENABLED = os.getenv("CONTOURS_ENABLED", "1") == "1"
+
+    # G2P (app/services/g2p.py): remote = 엔진 /gtp 사용, local = 로컬 G2P 후 /model 호출
+    # local은 `python -m app.services.g2p validate` 가 코퍼스 일치율 G2P_LOCAL_MIN_RATE 이상으로 통과한 뒤에만 적용
+    G2P_MODE = os.getenv("G2P_MODE", "remote")
+    G2P_LOCAL_MIN_RATE = float(os.getenv("G2P_LOCAL_MIN_RATE", "0.99"))
+    G2P_CORPUS_PATH = Path(os.getenv("G2P_CORPUS_PATH", str(DATA_DIR / "g2p" / "gtp_corpus.jsonl")))
+
+    # DB (app/core/storage.py): sqlite:///... 또는 postgresql://user:pw@host/db
+    DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BACKEND_ROOT / 'database.db'}")
+    DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", "")  # PostgreSQL 읽기 복제본 (선택)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+    SQLITE_ASYNC_MAX_OVERFLOW = int(os.getenv("SQLITE_ASYNC_MAX_OVERFLOW", "16"))  # 비동기 엔진 추가 연결
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(32 * 1024)))
+    MIGRATIONS_AUTO = os.getenv("MIGRATIONS_AUTO", "1") == "1"  # 시작 시 app/core/migrations.py 적용
+
+    # StudyLog 쓰기 지연 버퍼 (app/services/log_writer.py)
+    LOG_WRITE_BEHIND = os.getenv("LOG_WRITE_BEHIND", "1") == "1"
+    LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "200"))
+    LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "0.5"))  # 초
+    LOG_SPILL_PATH = Path(os.getenv("LOG_SPILL_PATH", str(DATA_DIR / "studylog_spill.jsonl")))
+    LOG_FLUSH_MAX_ATTEMPTS = int(os.getenv("LOG_FLUSH_MAX_ATTEMPTS", "5"))  # 연속 실패 후 배치를 나눠 저장, 실패 행만 보관
+
+    # 오래된 StudyLog 월별 보관 (app/services/log_archive.py)
+    LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", "0"))  # 이 일수보다 오래된 끝난 달을 보관 (0이면 끔)
+    LOG_ARCHIVE_DIR = Path(os.getenv("LOG_ARCHIVE_DIR", str(DATA_DIR / "archive" / "studylog")))
+    LOG_ARCHIVE_INTERVAL = int(os.getenv("LOG_ARCHIVE_INTERVAL", str(6 * 3600)))  # 초
+
+    # 학습 로그 내보내기 (app/services/log_export.py): 동시에 스트리밍하는 내보내기 수 상한 (넘으면 503)
+    EXPORT_MAX_CONCURRENT = int(os.getenv("EXPORT_MAX_CONCURRENT", "2"))
 
 settings = Settings()
 
 os.makedirs(settings.DATA_DIR, exist_ok=True)
 os.makedirs(settings.TEMP_UPLOAD_DIR, exist_ok=True)
+os.makedirs(settings.UPLOAD_WORK_DIR, exist_ok=True)
 USERS_FILE = settings.USERS_FILE
\ No newline at end of file
@@ -1,15 +1,81 @@
 # backend/app/core/database.py
-from sqlmodel import SQLModel, create_engine, Session
+from typing import Any, AsyncIterator, Callable
 
-sqlite_file_name = "database.db"
-sqlite_url = f"sqlite:///{sqlite_file_name}"
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-# SQLite 전용 설정 (check_same_thread=False)
-engine = create_engine(sqlite_url, connect_args={"check_same_thread": False})
+from app.core import storage
+from app.core.config import settings
+from app.core.migrations import upgrade as run_migrations
+
+# settings.DATABASE_URL 기준 (SQLite: WAL + 쓰기 연결 1개/읽기 연결 풀, PostgreSQL: 크기 지정 풀)
+# engine은 쓰기용, read_engine은 조회 전용 (SQLite는 query_only 연결)
+engine, read_engine = storage.create_engines(settings.DATABASE_URL)
+# 로그 내보내기 스트리밍 전용 (NullPool, 읽기 풀을 점유하지 않음)
+export_engine = storage.create_export_engine(settings.DATABASE_URL)
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+    if settings.MIGRATIONS_AUTO:
+        run_migrations(engine)
 
 def get_session():
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+def get_read_session():
+    """조회 전용 GET 핸들러용. 쓰기 연결을 점유하지 않으며 WAL에서는 쓰기를 막지 않습니다."""
+    with Session(read_engine) as session:
+        yield session
+
+
+# ----------------------------------------------------------------------
+# 비동기 세션 (async def 핸들러용)
+# ----------------------------------------------------------------------
+# 동기 Session을 async def 핸들러에서 쓰면 쿼리가 이벤트 루프 스레드에서 실행되어
+# 느린 쿼리 하나가 다른 모든 요청을 멈춥니다. async 핸들러는 get_async_session을 사용하세요.
+#   sqlite://      -> sqlite+aiosqlite://   (aiosqlite: 연결마다 전용 스레드에서 실행)
+#   postgresql://  -> postgresql+asyncpg://
+_async_engine = None
+
+
+def to_async_url(url: str) -> str:
+    for prefix, driver in (
+        ("sqlite://", "sqlite+aiosqlite://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+    ):
+        if url.startswith(prefix):
+            return driver + url[len(prefix):]
+    return url
+
+
+def get_async_engine():
+    """처음 사용할 때 생성 (비동기 드라이버가 없는 환경에서도 동기 경로는 그대로 동작하도록)"""
+    global _async_engine
+    if _async_engine is None:
+        url = to_async_url(settings.DATABASE_URL)
+        _async_engine = create_async_engine(url, **storage.async_engine_kwargs(url))
+        if storage.is_sqlite(url):
+            storage.install_sqlite_pragmas(_async_engine.sync_engine)
+    return _async_engine
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    # commit 후에도 응답 직렬화 시 속성을 읽을 수 있도록 만료시키지 않음 (lazy load는 async에서 불가)
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+async def run_async(session: AsyncSession, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """AsyncSession의 현재 트랜잭션 안에서 동기 함수 fn(sync_session, ...) 실행 (commit은 호출한 쪽에서)"""
+    await session.flush()
+    return await session.run_sync(lambda s: fn(s, *args, **kwargs))
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
@@ -0,0 +1,61 @@
+# backend/app/core/metrics.py
+"""
+프로세스 내 경량 메트릭 레지스트리.
+
+- 카운터/게이지를 이름 + 라벨 단위로 누적합니다.
+- 각 서브시스템은 register_gauge()로 스냅샷 함수를 등록할 수 있습니다.
+- main.py의 GET /metrics 가 snapshot()을 그대로 JSON으로 노출합니다.
+"""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict
+
+
+def _key(name: str, labels: Dict[str, Any]) -> str:
+    if not labels:
+        return name
+    inner = ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+    return f"{name}{{{inner}}}"
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+        self._collectors: Dict[str, Callable[[], Any]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        k = _key(name, labels)
+        with self._lock:
+            self._counters[k] += value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        k = _key(name, labels)
+        with self._lock:
+            self._gauges[k] = value
+
+    def register_gauge(self, name: str, fn: Callable[[], Any]) -> None:
+        """스냅샷 시점에 호출되는 수집 함수 등록 (예: 큐 길이, 캐시 적중률)"""
+        with self._lock:
+            self._collectors[name] = fn
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            collectors = dict(self._collectors)
+
+        collected: Dict[str, Any] = {}
+        for name, fn in collectors.items():
+            try:
+                collected[name] = fn()
+            except Exception as e:
+                collected[name] = {"error": str(e)}
+
+        return {"counters": counters, "gauges": gauges, **collected}
+
+
+metrics = Metrics()
@@ -0,0 +1,412 @@
+# backend/app/core/migrations.py
+"""
+스키마 마이그레이션.
+
+create_all 은 없는 테이블만 만들고 기존 DB의 인덱스/제약은 바꾸지 않으므로,
+기존 database.db 를 고쳐야 하는 변경은 여기에 번호를 붙여 추가합니다.
+  - 적용 이력: schema_migrations(version, name, applied_at)
+  - 서버 시작 시 create_db_and_tables() 에서 자동 적용 (MIGRATIONS_AUTO=0 이면 끔)
+  - 각 단계는 IF NOT EXISTS 등으로 다시 실행해도 안전하게 작성 (새 DB는 create_all 이 먼저 만듦)
+
+CLI (backend 폴더에서):
+    python -m app.core.migrations status
+    python -m app.core.migrations upgrade
+    python -m app.core.migrations explain   # 주요 조회 쿼리가 인덱스를 쓰는지 확인 (실패 시 종료 코드 1)
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Date, DateTime, Float, Integer, String, column, delete, insert, select, table, text
+from sqlalchemy.engine import Connection, Engine
+
+Migration = Tuple[int, str, Callable[[Connection], None]]
+
+
+def _sql(*statements: str) -> Callable[[Connection], None]:
+    def apply(conn: Connection) -> None:
+        for stmt in statements:
+            conn.execute(text(stmt))
+    return apply
+
+
+# ----------------------------------------------------------------------
+# 003~006 채우기: 적용 당시의 계산 규칙과 테이블 구조를 여기에 고정
+# (서비스 모듈의 rebuild()/refresh()가 나중에 바뀌어도 이미 배포된 마이그레이션 결과는 바뀌지 않도록
+#  모델/서비스를 import하지 않고 필요한 컬럼만 가진 table()로 읽고 씀)
+# 적용 시점에는 월별 보관(008 이후)이 아직 돌지 않았으므로 studylog 테이블이 전체 기록입니다.
+# ----------------------------------------------------------------------
+_BATCH = 5000
+
+_studylog = table(
+    "studylog",
+    column("id", Integer), column("user_id", String), column("word", String),
+    column("score", Float), column("created_at", DateTime),
+)
+_daily_stat = table(
+    "studydailystat",
+    column("user_id", String), column("day", Date), column("attempts", Integer), column("score_sum", Float),
+    column("high", Integer), column("mid", Integer), column("low", Integer), column("words", Integer),
+)
+_daily_word = table(
+    "studydailyword",
+    column("user_id", String), column("day", Date), column("word", String), column("last_at", DateTime),
+)
+_user_total = table(
+    "studyusertotal",
+    column("user_id", String), column("attempts", Integer), column("score_sum", Float),
+    column("high", Integer), column("mid", Integer), column("low", Integer),
+)
+_user = table(
+    "user",
+    column("uid", String), column("teacher_id", String), column("name", String),
+    column("country", String), column("role", String),
+)
+_progress = table(
+    "studyprogress",
+    column("id", Integer), column("user_id", String), column("level", String),
+    column("current_page", Integer), column("updated_at", DateTime),
+)
+_student_summary = table(
+    "studentsummary",
+    column("user_id", String), column("teacher_id", String), column("name", String), column("country", String),
+    column("level", String), column("current_page", Integer), column("progress_rate", Float),
+    column("attempts", Integer), column("avg_score", Float), column("updated_at", DateTime),
+)
+_word_mastery = table(
+    "wordmastery",
+    column("user_id", String), column("word", String), column("attempts", Integer), column("last_score", Float),
+    column("best_score", Float), column("ewma", Float), column("last_at", DateTime),
+)
+_review_card = table(
+    "reviewcard",
+    column("user_id", String), column("word", String), column("reps", Integer), column("lapses", Integer),
+    column("ease", Float), column("interval_days", Float), column("due_at", DateTime),
+    column("last_reviewed_at", DateTime),
+)
+
+
+def _iter_studylog(conn: Connection) -> Iterator[Dict[str, Any]]:
+    """studylog 행을 id 순으로 (id 키셋으로 _BATCH개씩 읽음)"""
+    after = 0
+    while True:
+        rows = conn.execute(
+            select(_studylog).where(_studylog.c.id > after).order_by(_studylog.c.id).limit(_BATCH)
+        ).mappings().all()
+        if not rows:
+            return
+        yield from rows
+        after = rows[-1]["id"]
+
+
+def _insert_all(conn: Connection, target, rows: List[Dict[str, Any]]) -> None:
+    for i in range(0, len(rows), _BATCH):
+        conn.execute(insert(target), rows[i:i + _BATCH])
+
+
+def _backfill_rollups(conn: Connection) -> None:
+    """기존 StudyLog로 통계 집계 테이블 채우기 (90점 이상 high, 70점 이상 mid, 나머지 low)"""
+    counters = ("attempts", "score_sum", "high", "mid", "low")
+    daily: Dict[Tuple[str, date], Dict[str, float]] = defaultdict(lambda: dict.fromkeys(counters, 0))
+    totals: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(counters, 0))
+    words: Dict[Tuple[str, date, str], datetime] = {}
+    for row in _iter_studylog(conn):
+        day = row["created_at"].date()
+        score = float(row["score"])
+        band = "high" if score >= 90 else "mid" if score >= 70 else "low"
+        for acc in (daily[(row["user_id"], day)], totals[row["user_id"]]):
+            acc["attempts"] += 1
+            acc["score_sum"] += score
+            acc[band] += 1
+        key = (row["user_id"], day, row["word"])
+        words[key] = max(words.get(key, row["created_at"]), row["created_at"])
+
+    per_day: Dict[Tuple[str, date], int] = defaultdict(int)
+    for user_id, day, _word in words:
+        per_day[(user_id, day)] += 1
+    for target in (_daily_word, _daily_stat, _user_total):
+        conn.execute(delete(target))
+    _insert_all(conn, _daily_word, [{"user_id": u, "day": d, "word": w, "last_at": at} for (u, d, w), at in words.items()])
+    _insert_all(conn, _daily_stat, [{"user_id": u, "day": d, "words": per_day[(u, d)], **acc} for (u, d), acc in daily.items()])
+    _insert_all(conn, _user_total, [{"user_id": u, **acc} for u, acc in totals.items()])
+
+
+def _backfill_student_summary(conn: Connection) -> None:
+    """학생마다 가장 최근 진도 + 누적 집계(003)로 선생님 대시보드 학생 요약 채우기"""
+    latest: Dict[str, Tuple[str, int]] = {}
+    for user_id, level, page in conn.execute(
+        select(_progress.c.user_id, _progress.c.level, _progress.c.current_page)
+        .order_by(_progress.c.user_id, _progress.c.updated_at.desc(), _progress.c.id.desc())
+    ):
+        latest.setdefault(user_id, (level, page))
+    totals = {
+        user_id: (attempts, score_sum)
+        for user_id, attempts, score_sum in conn.execute(
+            select(_user_total.c.user_id, _user_total.c.attempts, _user_total.c.score_sum)
+        )
+    }
+
+    now = datetime.now()
+    rows = []
+    for uid, teacher_id, name, country in conn.execute(
+        select(_user.c.uid, _user.c.teacher_id, _user.c.name, _user.c.country).where(_user.c.role == "student")
+    ):
+        level, page = latest.get(uid, (None, None))
+        attempts, score_sum = totals.get(uid, (0, 0.0))
+        page = page or 1
+        rows.append({
+            "user_id": uid,
+            "teacher_id": teacher_id,
+            "name": name or "",
+            "country": country or "KR",
+            "level": level or "미시작",
+            "current_page": page,
+            "progress_rate": min(1.0, ((page - 1) * 10) / 100),
+            "attempts": attempts or 0,
+            "avg_score": round(score_sum / attempts, 1) if attempts else 0.0,
+            "updated_at": now,
+        })
+    conn.execute(delete(_student_summary))
+    _insert_all(conn, _student_summary, rows)
+
+
+def _backfill_mastery(conn: Connection) -> None:
+    """기존 StudyLog(id 순)로 단어 숙련도 채우기. ewma <- 0.7 * ewma + 0.3 * score (첫 시도는 그 점수)"""
+    cards: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for row in _iter_studylog(conn):
+        score, at = float(row["score"]), row["created_at"]
+        card = cards.get((row["user_id"], row["word"]))
+        if card is None:
+            cards[(row["user_id"], row["word"])] = {
+                "attempts": 1, "last_score": score, "best_score": score, "ewma": score, "last_at": at,
+            }
+            continue
+        card["attempts"] += 1
+        card["ewma"] = 0.7 * card["ewma"] + 0.3 * score
+        card["best_score"] = max(card["best_score"], score)
+        if at >= card["last_at"]:
+            card["last_score"] = score
+            card["last_at"] = at
+    conn.execute(delete(_word_mastery))
+    _insert_all(conn, _word_mastery, [{"user_id": u, "word": w, **c} for (u, w), c in cards.items()])
+
+
+def _sm2_step(card: Optional[Dict[str, Any]], score: float, at: datetime) -> Dict[str, Any]:
+    """발음 점수 한 번을 SM-2 카드에 반영 (006 적용 당시 규칙)"""
+    quality = next((q for q, cutoff in ((5, 90), (4, 80), (3, 70), (2, 50), (1, 30)) if score >= cutoff), 0)
+    passed = quality >= 3
+    if card is None:
+        card = {"reps": 0, "lapses": 0, "ease": 2.5, "interval_days": 0.0, "due_at": at, "last_reviewed_at": at}
+    elif at < card["due_at"] and passed == (card["reps"] > 0):
+        # 복습 예정 전에 같은 결과를 반복: 간격/ease 그대로
+        card["last_reviewed_at"] = at
+        if not passed:
+            card["due_at"] = at + timedelta(minutes=10)
+        return card
+
+    card["ease"] = max(1.3, card["ease"] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if passed:
+        card["reps"] += 1
+        interval = 1.0 if card["reps"] == 1 else 6.0 if card["reps"] == 2 else round(card["interval_days"] * card["ease"], 1)
+        card["interval_days"] = min(365.0, interval)
+        card["due_at"] = at + timedelta(days=card["interval_days"])
+    else:
+        if card["reps"] > 0:
+            card["lapses"] += 1
+        card["reps"] = 0
+        card["interval_days"] = 0.0
+        card["due_at"] = at + timedelta(minutes=10)
+    card["last_reviewed_at"] = at
+    return card
+
+
+def _backfill_review_cards(conn: Connection) -> None:
+    """기존 StudyLog(id 순)로 복습 카드 채우기"""
+    cards: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for row in _iter_studylog(conn):
+        key = (row["user_id"], row["word"])
+        cards[key] = _sm2_step(cards.get(key), float(row["score"]), row["created_at"])
+    conn.execute(delete(_review_card))
+    _insert_all(conn, _review_card, [{"user_id": u, "word": w, **c} for (u, w), c in cards.items()])
+
+
+def _import_progress_blobs(conn: Connection) -> None:
+    """User.progress JSON을 설정/학습 상태 테이블(app/services/user_progress.py)로 이전"""
+    from sqlmodel import Session
+    from app.services import user_progress
+
+    user_progress.import_blobs(Session(bind=conn))
+
+
+# ----------------------------------------------------------------------
+# 마이그레이션 목록 (버전 순, 이미 배포된 항목은 수정하지 말고 새 번호로 추가)
+# ----------------------------------------------------------------------
+MIGRATIONS: List[Migration] = [
+    (
+        1,
+        "studylog composite indexes (user_id, created_at) / (user_id, score)",
+        _sql(
+            "CREATE INDEX IF NOT EXISTS ix_studylog_user_created ON studylog (user_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS ix_studylog_user_score ON studylog (user_id, score)",
+            # 두 복합 인덱스의 앞부분과 같으므로 불필요
+            "DROP INDEX IF EXISTS ix_studylog_user_id",
+        ),
+    ),
+    (
+        2,
+        "studyprogress unique (user_id, level) + (user_id, updated_at)",
+        _sql(
+            # 같은 (user_id, level) 중복 행은 가장 진도가 많이 나간 행 하나만 남김
+            """
+            DELETE FROM studyprogress WHERE id NOT IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY user_id, level ORDER BY current_page DESC, updated_at DESC, id
+                    ) AS rn
+                    FROM studyprogress
+                ) ranked WHERE rn = 1
+            )
+            """,
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_studyprogress_user_level ON studyprogress (user_id, level)",
+            "CREATE INDEX IF NOT EXISTS ix_studyprogress_user_updated ON studyprogress (user_id, updated_at)",
+            "DROP INDEX IF EXISTS ix_studyprogress_user_id",
+        ),
+    ),
+    (
+        3,
+        "backfill study stat rollups from studylog",
+        _backfill_rollups,
+    ),
+    (
+        4,
+        "backfill teacher dashboard student summary",
+        _backfill_student_summary,
+    ),
+    (
+        5,
+        "backfill per-word mastery from studylog",
+        _backfill_mastery,
+    ),
+    (
+        6,
+        "backfill spaced-repetition review cards from studylog",
+        _backfill_review_cards,
+    ),
+    (
+        7,
+        "move user.progress json into setting/state/topic tables",
+        _import_progress_blobs,
+    ),
+    (
+        8,
+        "studylog created_at index for monthly archiving",
+        _sql("CREATE INDEX IF NOT EXISTS ix_studylog_created ON studylog (created_at)"),
+    ),
+]
+
+
+def _ensure_table(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at TIMESTAMP NOT NULL)"
+    ))
+
+
+def applied_versions(engine: Engine) -> Dict[int, str]:
+    with engine.begin() as conn:
+        _ensure_table(conn)
+        rows = conn.execute(text("SELECT version, applied_at FROM schema_migrations")).all()
+    return {int(v): str(at) for v, at in rows}
+
+
+def upgrade(engine: Engine) -> List[int]:
+    """미적용 마이그레이션을 버전 순으로 하나씩(각각 트랜잭션) 적용. 적용한 버전 목록을 반환"""
+    done = applied_versions(engine)
+    applied = []
+    for version, name, apply in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            apply(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :at)"),
+                {"v": version, "n": name, "at": datetime.now()},
+            )
+        print(f"[Migration] {version:03d} {name} 적용")
+        applied.append(version)
+    return applied
+
+
+# ----------------------------------------------------------------------
+# EXPLAIN 검사: 주요 조회 쿼리가 인덱스를 타는지
+# ----------------------------------------------------------------------
+# (이름, SQL, 기대 인덱스, 파라미터)
+HOT_QUERIES = [
+    ("study.review_words", "SELECT * FROM studylog WHERE user_id = :u ORDER BY score ASC LIMIT 50",
+     "ix_studylog_user_score", {"u": "x"}),
+    ("study.stats", "SELECT * FROM studylog WHERE user_id = :u ORDER BY created_at DESC",
+     "ix_studylog_user_created", {"u": "x"}),
+    ("teacher.avg_score", "SELECT avg(score) FROM studylog WHERE user_id = :u",
+     "ix_studylog_user_score", {"u": "x"}),
+    ("study.progress_level", "SELECT * FROM studyprogress WHERE user_id = :u AND level = :l",
+     "ux_studyprogress_user_level", {"u": "x", "l": "초급1"}),
+    ("study.current_progress", "SELECT * FROM studyprogress WHERE user_id = :u ORDER BY updated_at DESC LIMIT 1",
+     "ix_studyprogress_user_updated", {"u": "x"}),
+    ("study.review_words_mastery", "SELECT * FROM wordmastery WHERE user_id = :u ORDER BY ewma ASC, word ASC LIMIT 10",
+     "ix_wordmastery_user_ewma", {"u": "x"}),
+    ("study.review_set", "SELECT * FROM reviewcard WHERE user_id = :u AND due_at < :d ORDER BY due_at ASC, word ASC LIMIT 10",
+     "ix_reviewcard_user_due", {"u": "x", "d": "2100-01-01"}),
+    ("teacher.students", "SELECT * FROM studentsummary WHERE teacher_id = :t AND (avg_score < :v OR "
+     "(avg_score = :v AND user_id < :u)) ORDER BY avg_score DESC, user_id DESC LIMIT 51",
+     "ix_studentsummary_teacher_score", {"t": "x", "v": 50.0, "u": "x"}),
+]
+
+
+def explain(engine: Engine) -> List[Dict[str, object]]:
+    """각 쿼리의 실행 계획과 기대 인덱스 사용 여부. 정렬용 임시 B-tree나 전체 스캔이 있으면 실패"""
+    results = []
+    is_sqlite = engine.dialect.name == "sqlite"
+    with engine.connect() as conn:
+        for name, sql, index, params in HOT_QUERIES:
+            if is_sqlite:
+                plan = " | ".join(str(r[-1]) for r in conn.execute(text("EXPLAIN QUERY PLAN " + sql), params))
+                ok = index in plan and "TEMP B-TREE" not in plan and "SCAN studylog" not in plan \
+                    and "SCAN studyprogress" not in plan
+            else:
+                plan = " | ".join(str(r[0]) for r in conn.execute(text("EXPLAIN " + sql), params))
+                ok = index in plan and "Seq Scan" not in plan and "Sort" not in plan
+            results.append({"query": name, "index": index, "ok": ok, "plan": plan})
+    return results
+
+
+def main() -> None:
+    from app.core.database import engine
+    from sqlmodel import SQLModel
+    import app.models  # noqa: F401  (테이블 등록)
+
+    parser = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    parser.add_argument("command", choices=["status", "upgrade", "explain"])
+    args = parser.parse_args()
+
+    if args.command == "status":
+        done = applied_versions(engine)
+        for version, name, _ in MIGRATIONS:
+            print(f"{version:03d} {'적용 ' + done[version] if version in done else '미적용'}  {name}")
+    elif args.command == "upgrade":
+        SQLModel.metadata.create_all(engine)
+        applied = upgrade(engine)
+        print(f"[Migration] {len(applied)}개 적용" if applied else "[Migration] 최신 상태")
+    elif args.command == "explain":
+        failed = 0
+        for r in explain(engine):
+            failed += not r["ok"]
+            print(f"{'OK  ' if r['ok'] else 'FAIL'} {r['query']:<24} {r['index']:<32} {r['plan']}")
+        sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,248 @@
+import base64
 import hashlib
-from typing import Tuple, Optional, Dict, Any
-from fastapi import Request, HTTPException, status
+import hmac
+import json
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Tuple, Optional, Dict, Any, Callable
+from fastapi import Request, Response, HTTPException, status
+from sqlalchemy import delete
+from sqlmodel import select
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.storage import dialect_insert
+from app.models import SessionRevocation
 
 # [변경 완료] JSON 파일 로드/저장 함수(load_users, save_users 등) 삭제됨
 # 이제 모든 데이터 관리는 SQL DB(app.api.*)에서 직접 수행합니다.
 
-# --- 세션/인증 헬퍼 함수 ---
+# --- 세션 토큰 ---
+# 형식: v1.<키 id>.<claims(base64url JSON)>.<HMAC-SHA256 서명(base64url)>
+#   claims: u(uid) r(역할) t(담당 선생님) n(이름) iat(발급, ms) exp(만료, 초) j(토큰 id)
+# 역할/담당 선생님이 토큰에 들어 있으므로 권한 확인에 DB 조회가 필요 없습니다.
+# 바뀐 경우에는 폐기 목록(SessionRevocation)에 "낡음"으로 기록해 다음 요청 때 DB에서 다시 읽고 새 토큰을 발급합니다.
+
+TOKEN_VERSION = "v1"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """토큰에 담긴 로그인 사용자 정보 (권한 확인용)"""
+    uid: str
+    role: str
+    teacher_id: Optional[str] = None
+    name: str = ""
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        return cls(uid=user.uid, role=user.role, teacher_id=user.teacher_id, name=user.name or "")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+@lru_cache(maxsize=8)
+def _keyring(current: str, previous: Tuple[str, ...]) -> Tuple[str, Dict[str, bytes]]:
+    """(현재 키 id, {키 id: 키}). 키 id는 비밀값 해시 앞 8자리"""
+    keys = {}
+    for secret in (current, *previous):
+        keys.setdefault(hashlib.sha256(secret.encode()).hexdigest()[:8], secret.encode())
+    return hashlib.sha256(current.encode()).hexdigest()[:8], keys
+
+
+def _keys() -> Tuple[str, Dict[str, bytes]]:
+    return _keyring(settings.SESSION_SECRET, tuple(settings.SESSION_PREVIOUS_SECRETS))
+
+
+def _sign(key: bytes, body: str) -> str:
+    return _b64encode(hmac.new(key, body.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue_token(principal: Principal, now: Optional[float] = None) -> str:
+    """현재 키로 서명한 세션 토큰 (유효 기간 SESSION_TTL_SECONDS)"""
+    now = time.time() if now is None else now
+    kid, keys = _keys()
+    claims = {
+        "u": principal.uid, "r": principal.role, "t": principal.teacher_id, "n": principal.name,
+        "iat": int(now * 1000), "exp": int(now) + settings.SESSION_TTL_SECONDS, "j": secrets.token_urlsafe(9),
+    }
+    payload = _b64encode(json.dumps(claims, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    body = f"{TOKEN_VERSION}.{kid}.{payload}"
+    return f"{body}.{_sign(keys[kid], body)}"
+
+
+def set_session_cookie(response: Response, token: str) -> None:
+    response.set_cookie(
+        key=settings.SESSION_COOKIE_NAME,
+        value=token,
+        max_age=settings.SESSION_TTL_SECONDS,
+        path="/",           # 모든 경로 허용
+        httponly=True,
+        samesite="lax",
+        secure=False        # 로컬(http) 환경이므로 False
+    )
+
+
+# --- 폐기 목록 ---
+# DB(SessionRevocation)가 기준이고, 프로세스마다 메모리 사본을 SESSION_REVOCATION_REFRESH초마다 다시 읽습니다.
+# (요청마다 조회하지 않음. 같은 프로세스에서 폐기한 항목은 바로 반영)
+
+class _RevocationList:
+    def __init__(self):
+        self._entries: Dict[str, Tuple[int, int]] = {}  # key -> (revoked_before, stale_before)
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        if time.monotonic() - self._loaded_at < settings.SESSION_REVOCATION_REFRESH:
+            return
+        with self._lock:
+            if time.monotonic() - self._loaded_at < settings.SESSION_REVOCATION_REFRESH:
+                return
+            from app.core.database import read_engine
+
+            try:
+                with read_engine.connect() as conn:
+                    rows = conn.execute(
+                        select(SessionRevocation.key, SessionRevocation.revoked_before, SessionRevocation.stale_before)
+                        .where(SessionRevocation.expires_at > datetime.now())
+                    ).all()
+            except Exception as e:  # 테이블이 아직 없는 경우 등: 이번 사본 유지
+                print(f"[Session] 폐기 목록 읽기 실패: {e}")
+                rows = None
+            if rows is not None:
+                self._entries = {key: (revoked_before, stale_before) for key, revoked_before, stale_before in rows}
+            self._loaded_at = time.monotonic()
+            metrics.inc("session_revocation_reloads_total")
+
+    def check(self, uid: str, jti: str, iat: int) -> Optional[str]:
+        """None(유효) | "revoked"(거부) | "stale"(DB에서 다시 읽어야 함)"""
+        self._refresh()
+        if f"jti:{jti}" in self._entries:
+            return "revoked"
+        revoked_before, stale_before = self._entries.get(f"uid:{uid}", (0, 0))
+        if iat < revoked_before:
+            return "revoked"
+        if iat < stale_before:
+            return "stale"
+        return None
+
+    def add(self, key: str, column: str, before: int) -> None:
+        with self._lock:
+            revoked_before, stale_before = self._entries.get(key, (0, 0))
+            if column == "revoked_before":
+                revoked_before = before
+            else:
+                stale_before = before
+            self._entries[key] = (revoked_before, stale_before)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._loaded_at = 0.0
+
+
+revocations = _RevocationList()
+
+
+def _revoke(session: Any, key: str, column: str, before: int) -> None:
+    now = datetime.now()
+    conn = session.connection()
+    # 만료된 항목은 어떤 토큰에도 해당하지 않으므로 정리
+    conn.execute(delete(SessionRevocation).where(SessionRevocation.expires_at <= now))
+    stmt = dialect_insert(conn)(SessionRevocation)
+    # 같은 사용자의 다른 기준 시각(거부/낡음)은 그대로 둠
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["key"],
+            set_={column: getattr(stmt.excluded, column), "expires_at": stmt.excluded.expires_at},
+        ),
+        [{"key": key, column: before, "expires_at": now + timedelta(seconds=settings.SESSION_TTL_SECONDS + 60)}],
+    )
+    revocations.add(key, column, before)
+
+
+def revoke_token(session: Any, token: str) -> bool:
+    """토큰 하나 폐기 (로그아웃). commit은 호출한 쪽에서. 형식이 잘못된 토큰이면 False"""
+    sess = verify_session(token)
+    if not sess:
+        return False
+    _revoke(session, f"jti:{sess['jti']}", "revoked_before", 1)
+    return True
+
+
+def revoke_user(session: Any, uid: str, hard: bool = True) -> None:
+    """
+    지금까지 발급된 uid의 토큰 전체를 폐기(hard) 또는 낡음 표시(hard=False: 역할/담당 선생님 변경).
+    commit은 호출한 쪽에서. AsyncSession에서는 app.core.database.run_async(session, revoke_user, uid)
+    """
+    _revoke(session, f"uid:{uid}", "revoked_before" if hard else "stale_before", int(time.time() * 1000) + 1)
+
 
 def verify_session(token: str) -> Optional[Dict[str, Any]]:
     """
-    세션 토큰 유효성 검사.
-    현재는 토큰 문자열 자체가 uid인 단순 구조를 가정합니다.
-    (JWT 도입 시 이곳에서 token decode 로직을 수행하면 됩니다.)
-    
+    세션 토큰 검증 (서명, 만료, 폐기 목록). DB 조회 없음.
+
     Returns:
-        세션 데이터 딕셔너리 (예: {"uid": "student"}) 또는 None
+        {"uid", "role", "teacher_id", "name", "iat", "exp", "jti",
+         "stale": 역할 등이 바뀌어 DB에서 다시 읽어야 함, "rotate": 예전 키로 서명됨} 또는 None
     """
     if not token:
         return None
-    
-    # 토큰이 존재하면 유효한 세션으로 간주하고 uid 반환
-    return {"uid": token}
+    parts = token.split(".")
+    if len(parts) != 4 or parts[0] != TOKEN_VERSION:
+        metrics.inc("session_verify_total", result="malformed")
+        return None
+    version, kid, payload, signature = parts
+    current_kid, keys = _keys()
+    key = keys.get(kid)
+    if key is None or not hmac.compare_digest(_sign(key, f"{version}.{kid}.{payload}"), signature):
+        metrics.inc("session_verify_total", result="bad_signature")
+        return None
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        metrics.inc("session_verify_total", result="malformed")
+        return None
+    if claims["exp"] <= time.time():
+        metrics.inc("session_verify_total", result="expired")
+        return None
+    state = revocations.check(claims["u"], claims["j"], claims["iat"])
+    if state == "revoked":
+        metrics.inc("session_verify_total", result="revoked")
+        return None
+    metrics.inc("session_verify_total", result=state or "ok")
+    return {
+        "uid": claims["u"], "role": claims["r"], "teacher_id": claims.get("t"), "name": claims.get("n") or "",
+        "iat": claims["iat"], "exp": claims["exp"], "jti": claims["j"],
+        "stale": state == "stale", "rotate": kid != current_kid,
+    }
 
-def hash_password(password: str) -> str:
-    """비밀번호 해싱 (SHA-256)"""
-    return hashlib.sha256(password.encode()).hexdigest()
 
-def verify_password(stored_pw: str, input_pw: str) -> Tuple[bool, bool]:
+def session_principal(
+    request: Request, sess: Dict[str, Any], load_user: Callable[[str], Any],
+) -> Optional[Principal]:
     """
-    저장된 비밀번호(stored_pw)와 입력된 비밀번호(input_pw)를 비교합니다.
-    
-    Returns:
-        (일치 여부, 해시 업데이트 필요 여부)
+    검증된 세션 -> Principal. 보통은 토큰 내용만 사용하고,
+    낡은 토큰이면 load_user(uid)로 DB에서 다시 읽습니다 (사용자가 없으면 None).
+    낡았거나 예전 키로 서명된 토큰은 새 토큰을 request.state.session_token에 두어 응답 쿠키로 교체합니다.
     """
-    # 1. 평문 비교 (기존 데이터 호환용: 예 - 초기 admin 계정 "1111")
-    if stored_pw == input_pw:
-        return True, True # 일치하지만, 보안을 위해 해시로 업데이트 권장
-        
-    # 2. 해시 비교 (정상적인 경우)
-    if stored_pw == hash_password(input_pw):
-        return True, False # 일치하고 해시 상태도 최신임
-        
-    return False, False
\ No newline at end of file
+    if sess["stale"]:
+        user = load_user(sess["uid"])
+        if not user:
+            return None
+        principal = Principal.from_user(user)
+    else:
+        principal = Principal(uid=sess["uid"], role=sess["role"], teacher_id=sess["teacher_id"], name=sess["name"])
+    if sess["stale"] or sess["rotate"]:
+        request.state.session_token = issue_token(principal)
+    return principal
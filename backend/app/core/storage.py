@@ -0,0 +1,145 @@
+# backend/app/core/storage.py
+"""
+DB 엔진 구성 (settings.DATABASE_URL 기준).
+
+SQLite
+    - 연결마다 PRAGMA 적용: journal_mode=WAL, synchronous=NORMAL, busy_timeout, mmap_size, cache_size
+    - 쓰기 엔진: 연결 1개 (프로세스 안 쓰기를 한 줄로 세워 'database is locked' 경합 제거)
+    - 읽기 엔진: 연결 SQLITE_READ_POOL_SIZE개, query_only=ON
+      WAL에서는 읽기가 쓰기를 막지 않으므로 긴 조회 중에도 평가 결과 저장이 바로 끝납니다.
+    - 비동기 엔진: 연결 SQLITE_READ_POOL_SIZE + SQLITE_ASYNC_MAX_OVERFLOW개 (쓰기 경합은 busy_timeout)
+    - 내보내기 엔진: NullPool, query_only=ON (긴 스트리밍이 읽기 풀 연결을 잡지 않도록)
+
+PostgreSQL
+    - QueuePool (DB_POOL_SIZE + DB_MAX_OVERFLOW), pool_pre_ping, pool_recycle
+    - DATABASE_READ_URL(복제본)이 있으면 읽기 엔진으로 사용, 없으면 쓰기 엔진 공유
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, QueuePool
+from sqlmodel import create_engine
+
+from app.core.config import settings
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def sqlite_pragmas(read_only: bool = False) -> Dict[str, Any]:
+    pragmas: Dict[str, Any] = {
+        "journal_mode": "WAL",
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,  # 음수 = KiB 단위
+        "foreign_keys": "ON",
+        "temp_store": "MEMORY",
+    }
+    if read_only:
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+
+def install_sqlite_pragmas(engine: Engine, read_only: bool = False) -> None:
+    """연결이 만들어질 때마다 PRAGMA 실행 (동기/비동기 엔진 공통, 비동기는 engine.sync_engine 전달)"""
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for key, value in pragmas.items():
+                cursor.execute(f"PRAGMA {key}={value}")
+        finally:
+            cursor.close()
+
+
+def _sqlite_engines(url: str) -> Tuple[Engine, Engine]:
+    connect_args = {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+    writer = create_engine(
+        url, connect_args=connect_args, poolclass=QueuePool, pool_size=1, max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    reader = create_engine(
+        url, connect_args=connect_args, poolclass=QueuePool,
+        pool_size=settings.SQLITE_READ_POOL_SIZE, max_overflow=0, pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    install_sqlite_pragmas(writer)
+    install_sqlite_pragmas(reader, read_only=True)
+    return writer, reader
+
+
+def _server_engine(url: str) -> Engine:
+    return create_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+
+
+def create_engines(url: str | None = None, read_url: str | None = None) -> Tuple[Engine, Engine]:
+    """(쓰기 엔진, 읽기 엔진)"""
+    url = url or settings.DATABASE_URL
+    if is_sqlite(url):
+        return _sqlite_engines(url)
+    writer = _server_engine(url)
+    read_url = read_url if read_url is not None else settings.DATABASE_READ_URL
+    return writer, (_server_engine(read_url) if read_url else writer)
+
+
+def create_export_engine(url: str | None = None, read_url: str | None = None) -> Engine:
+    """
+    로그 내보내기 전용 엔진 (NullPool: 내보내기마다 연결을 새로 열고 끝나면 닫음).
+    스트리밍 응답은 다 보낼 때까지 연결을 잡고 있으므로, 읽기 풀(SQLite는 overflow 0)을 쓰면
+    내보내기 몇 개가 일반 조회를 모두 막습니다. 동시 내보내기 수는 EXPORT_MAX_CONCURRENT로 제한합니다.
+    """
+    url = url or settings.DATABASE_URL
+    if is_sqlite(url):
+        connect_args = {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+        exporter = create_engine(url, connect_args=connect_args, poolclass=NullPool)
+        install_sqlite_pragmas(exporter, read_only=True)
+        return exporter
+    read_url = read_url if read_url is not None else settings.DATABASE_READ_URL
+    return create_engine(read_url or url, poolclass=NullPool)
+
+
+def dialect_insert(conn):
+    """ON CONFLICT 절(upsert)을 지원하는 방언별 insert (SQLite / PostgreSQL)"""
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def async_engine_kwargs(url: str) -> Dict[str, Any]:
+    """
+    create_async_engine 인자.
+
+    SQLite도 연결 여러 개 (SQLITE_READ_POOL_SIZE + SQLITE_ASYNC_MAX_OVERFLOW).
+    AsyncSession은 첫 쿼리부터 닫힐 때까지 연결을 잡고 있으므로 (평가 중 ffmpeg/엔진 호출, 로그인 중 해싱 대기),
+    연결이 하나뿐이면 그동안 다른 async 요청이 모두 멈춥니다. WAL에서 읽기는 서로 막지 않고,
+    pysqlite는 SELECT에는 트랜잭션을 열지 않으므로 쓰기끼리는 첫 INSERT/UPDATE 때 busy_timeout만큼 기다립니다.
+    """
+    if is_sqlite(url):
+        return {
+            "connect_args": {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+            "pool_size": settings.SQLITE_READ_POOL_SIZE,
+            "max_overflow": settings.SQLITE_ASYNC_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+        }
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.legacy.utils_compat import atomic_write_json
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """프로세스 간 배타 잠금 (잠금 전용 파일 사용, 같은 프로세스의 스레드끼리는 따로 막아야 함)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class JournaledStore:
+    """
+    JSON 스냅샷({key: dict}) + 추가 전용 변경 저널(JSONL)로 된 사용자 저장소.
+
+    - 읽기: 메모리 맵에서 바로 (다른 프로세스가 쓴 변경은 파일 크기/스냅샷 변경을 보고 저널 뒷부분만 읽어 반영)
+    - 쓰기: 잠금 -> 최신 상태 따라잡기 -> 메모리 반영 -> 저널에 한 줄 추가(fsync). 파일 전체를 다시 쓰지 않음
+    - 압축: 저널이 compact_bytes를 넘으면 스냅샷을 원자적으로 새로 쓰고 저널을 비움
+    잠금 안에서 따라잡은 뒤 쓰므로 여러 프로세스가 동시에 고쳐도 변경이 사라지지 않습니다.
+
+    저널 한 줄: {"op": "put", "key": k, "value": {...}} | {"op": "patch", "key": k, "fields": {...}}
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        normalize: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None,
+        default: Optional[Callable[[], Dict[str, Any]]] = None,
+        compact_bytes: int = 1 << 20,
+    ):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_name(self.snapshot_path.name + ".journal")
+        self.lock_path = self.snapshot_path.with_name(self.snapshot_path.name + ".lock")
+        self.normalize = normalize
+        self.default = default
+        self.compact_bytes = compact_bytes
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._snapshot_sig: Optional[Tuple[int, int, int]] = None
+        self._offset = 0  # 저널에서 이미 반영한 바이트 수
+        self._loaded = False
+        self._mutex = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 파일 -> 메모리
+    # ------------------------------------------------------------------
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        key = entry["key"]
+        if entry["op"] == "put":
+            self._data[key] = entry["value"]
+        elif entry["op"] == "patch":
+            self._data.setdefault(key, {}).update(entry["fields"])
+
+    def _replay(self) -> None:
+        """저널에서 아직 반영하지 않은 완전한 줄만 반영 (쓰다 만 마지막 줄은 다음에)"""
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(self._offset)
+                tail = f.read()
+        except FileNotFoundError:
+            return
+        end = tail.rfind(b"\n") + 1
+        for line in tail[:end].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+        self._offset += end
+
+    def _reload(self) -> List[Dict[str, Any]]:
+        """스냅샷 + 저널 전체를 다시 읽음. 정규화로 바뀐 항목의 patch 목록을 반환"""
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                self._data = json.load(f) or {}
+        else:
+            self._data = {}
+        self._snapshot_sig = _signature(self.snapshot_path)
+        self._offset = 0
+        self._replay()
+        self._loaded = True
+
+        patches = []
+        if self.normalize:
+            for key, value in self._data.items():
+                if isinstance(value, dict):
+                    fields = self.normalize(key, value)
+                    if fields:
+                        patches.append({"op": "patch", "key": key, "fields": fields})
+        return patches
+
+    def _stale(self) -> bool:
+        if not self._loaded or _signature(self.snapshot_path) != self._snapshot_sig:
+            return True
+        sig = _signature(self.journal_path)
+        return (sig[2] if sig else 0) != self._offset
+
+    def _sync_locked(self) -> None:
+        """잠금을 잡은 상태에서 최신 상태로 맞춤"""
+        if not self._loaded or _signature(self.snapshot_path) != self._snapshot_sig:
+            if self.default and not self.snapshot_path.exists() and _signature(self.journal_path) is None:
+                self._write_snapshot(self.default())
+            patches = self._reload()
+            if patches:
+                self._append(patches)
+        else:
+            self._replay()
+
+    def refresh(self) -> None:
+        with self._mutex:
+            if self._stale():
+                with file_lock(self.lock_path):
+                    self._sync_locked()
+
+    # ------------------------------------------------------------------
+    # 메모리 -> 파일
+    # ------------------------------------------------------------------
+    def _append(self, entries: List[Dict[str, Any]]) -> None:
+        for entry in entries:
+            self._apply(entry)
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries).encode("utf-8")
+        with open(self.journal_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._offset += len(data)
+        if self._offset >= self.compact_bytes:
+            self._write_snapshot(self._data)
+
+    def _write_snapshot(self, data: Dict[str, Any]) -> None:
+        """스냅샷을 원자적으로 교체하고 저널을 비움 (잠금 안에서)"""
+        atomic_write_json(str(self.snapshot_path), data)
+        with open(self.journal_path, "wb"):
+            pass
+        self._data = data
+        self._snapshot_sig = _signature(self.snapshot_path)
+        self._offset = 0
+        self._loaded = True
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._mutex, file_lock(self.lock_path):
+            self._sync_locked()
+            yield
+
+    # ------------------------------------------------------------------
+    # 공개 API (반환값은 복사본이므로 고쳐도 저장소에는 영향 없음)
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        self.refresh()
+        with self._mutex:
+            return copy.deepcopy(self._data)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        with self._mutex:
+            value = self._data.get(key)
+            return copy.deepcopy(value) if value is not None else None
+
+    def put(self, key: str, value: Dict[str, Any], only_if_absent: bool = False) -> bool:
+        with self._locked():
+            if only_if_absent and key in self._data:
+                return False
+            self._append([{"op": "put", "key": key, "value": copy.deepcopy(value)}])
+            return True
+
+    def patch(self, key: str, fields: Dict[str, Any]) -> bool:
+        """있는 항목의 필드 일부만 변경. 항목이 없으면 False"""
+        with self._locked():
+            if key not in self._data:
+                return False
+            self._append([{"op": "patch", "key": key, "fields": copy.deepcopy(fields)}])
+            return True
+
+    def replace_all(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """전체 교체 (예전 save_users 호환). 스냅샷을 새로 씀"""
+        with self._locked():
+            self._write_snapshot(copy.deepcopy(data))
+
+    def compact(self) -> None:
+        with self.compacted():
+            pass
+
+    @contextmanager
+    def compacted(self) -> Iterator[Path]:
+        """
+        잠금을 잡고 저널을 스냅샷에 합친 뒤 블록이 끝날 때까지 잠금 유지 (그동안 다른 프로세스의 쓰기는 대기).
+        스냅샷 파일을 직접 읽는 도구(app/services/legacy_import.py)가 저널에만 있는 변경을 놓치지 않도록.
+        """
+        with self._locked():
+            if self._offset:
+                self._write_snapshot(self._data)
+            yield self.snapshot_path
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+from typing import IO, Any, Iterator
+
+_WHITESPACE = " \t\r\n"
+
+
+class JsonStream:
+    """
+    큰 JSON 파일을 통째로 읽지 않고 앞에서부터 조금씩 해석하는 리더 (표준 라이브러리만 사용).
+
+    객체/배열은 items()/elements()로 한 항목씩 순회하고, 각 항목 값은 value()로 읽거나
+    다시 items()/elements()로 내려갈 수 있습니다. 메모리는 한 번에 읽는 값 하나 크기만큼만 씁니다.
+
+        stream = JsonStream(f)
+        for uid in stream.items():          # {"uid": [...], ...}
+            for i in stream.elements():     # [{...}, ...]
+                entry = stream.value()
+    """
+
+    def __init__(self, f: IO[str], chunk_size: int = 1 << 16):
+        self._f = f
+        self.chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        if self._eof:
+            return False
+        data = self._f.read(size)
+        if not data:
+            self._eof = True
+            return False
+        # 이미 해석한 앞부분은 버림
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """다음 공백이 아닌 문자 (파일 끝이면 '')"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"JSON 형식 오류: '{ch}' 필요, '{got}' 발견 (위치 근처: {self._buf[self._pos:self._pos + 40]!r})")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """현재 위치의 값 하나를 해석해서 반환"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+                # 버퍼 끝에서 끝난 숫자 등은 뒤에 이어지는 글자가 있을 수 있으므로 더 읽고 다시 확인
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # 값이 커도 재시도 횟수가 로그 수준이 되도록 읽는 양을 늘림
+            self._fill(max(self.chunk_size, len(self._buf) - self._pos))
+
+    def items(self) -> Iterator[str]:
+        """객체의 키를 차례로 반환. 다음 키로 넘어가기 전에 호출한 쪽이 값을 읽어야 함"""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError(f"JSON 형식 오류: 객체 키가 문자열이 아님 ({key!r})")
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def elements(self) -> Iterator[int]:
+        """배열 원소의 순번을 차례로 반환. 다음 원소로 넘어가기 전에 호출한 쪽이 값을 읽어야 함"""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from typing import Any, Dict, Optional, Tuple
 
 from app.core.config import USERS_FILE
-from app.legacy.utils_compat import atomic_write_json, hash_password, verify_password
+from app.legacy.journal_store import JournaledStore
+from app.legacy.utils_compat import hash_password, verify_password
 
 
 def _default_users() -> Dict[str, Any]:
@@ -17,66 +17,65 @@ def _default_users() -> Dict[str, Any]:
     }
 
 
+def _normalize(uid: str, u: Dict[str, Any]) -> Dict[str, Any]:
+    """예전 형식 보정 (u를 직접 고침). 저장해야 할 바뀐 필드만 반환"""
+    u["uid"] = uid
+    u["id"] = uid
+    changed: Dict[str, Any] = {}
+
+    if "role" not in u:
+        changed["role"] = "student"
+    if "country" not in u:
+        changed["country"] = "KR"
+
+    # teacher만 기본 승인 False :contentReference[oaicite:10]{index=10}
+    if "is_approved" not in u:
+        changed["is_approved"] = False if changed.get("role", u.get("role")) == "teacher" else True
+
+    if "progress" not in u:
+        changed["progress"] = {"settings": {"goal": 10, "ui_lang": "ko"}, "topics": {}}
+    elif "settings" not in u["progress"]:
+        changed["progress"] = {**u["progress"], "settings": {"goal": 10, "ui_lang": "ko"}}
+
+    # pw 없으면 pw_hash 있으면 승계, 없으면 1111 해시 :contentReference[oaicite:11]{index=11}
+    if "pw" not in u:
+        if "pw_hash" in u:
+            changed["pw"] = u["pw_hash"]
+        else:
+            changed["pw"] = hash_password("1111")
+
+    u.update(changed)
+    return changed
+
+
+# users.json 스냅샷 + users.json.journal (사용자 한 명 변경 = 저널 한 줄 추가, 1MB마다 스냅샷으로 압축)
+_store = JournaledStore(USERS_FILE, normalize=_normalize, default=_default_users)
+
+
 def load_users() -> Dict[str, Any]:
-    if not USERS_FILE.exists():
-        users = _default_users()
-        save_users(users)
-        return users
-
-    with USERS_FILE.open("r", encoding="utf-8") as f:
-        data = json.load(f) or {}
-
-    changed = False
-    for uid, u in data.items():
-        if not isinstance(u, dict):
-            continue
-        u["uid"] = uid
-        u["id"] = uid
-
-        if "role" not in u:
-            u["role"] = "student"
-            changed = True
-        if "country" not in u:
-            u["country"] = "KR"
-            changed = True
-
-        # teacher만 기본 승인 False :contentReference[oaicite:10]{index=10}
-        if "is_approved" not in u:
-            u["is_approved"] = False if u["role"] == "teacher" else True
-            changed = True
-
-        if "progress" not in u:
-            u["progress"] = {"settings": {"goal": 10, "ui_lang": "ko"}, "topics": {}}
-            changed = True
-        elif "settings" not in u["progress"]:
-            u["progress"]["settings"] = {"goal": 10, "ui_lang": "ko"}
-            changed = True
-
-        # pw 없으면 pw_hash 있으면 승계, 없으면 1111 해시 :contentReference[oaicite:11]{index=11}
-        if "pw" not in u:
-            if "pw_hash" in u:
-                u["pw"] = u["pw_hash"]
-            else:
-                u["pw"] = hash_password("1111")
-            changed = True
-
-    if changed:
-        save_users(data)
-    return data
+    """전체 사용자 (복사본). 한 명만 필요하면 get_user()"""
+    users = _store.snapshot()
+    for uid, u in users.items():
+        if isinstance(u, dict):
+            _normalize(uid, u)
+    return users
+
+
+def get_user(uid: str) -> Optional[Dict[str, Any]]:
+    u = _store.get(uid)
+    if u is not None:
+        _normalize(uid, u)
+    return u
 
 
 def save_users(users_data: Dict[str, Any]) -> None:
-    USERS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    atomic_write_json(str(USERS_FILE), users_data)
+    """전체 교체 (스냅샷을 새로 씀). 한 명만 바꿀 때는 update_user()"""
+    _store.replace_all(users_data)
 
 
 def register_user(uid: str, pw: str, name: str, email: str, phone: str, country: str, role: str, phone_verified: bool):
-    users = load_users()
-    if uid in users:
-        return False, "이미 존재하는 아이디입니다."
-
     is_approved = False if role == "teacher" else True  # :contentReference[oaicite:12]{index=12}
-    users[uid] = {
+    created = _store.put(uid, {
         "uid": uid,
         "pw": hash_password(pw),
         "name": name,
@@ -88,14 +87,14 @@ def register_user(uid: str, pw: str, name: str, email: str, phone: str, country:
         "phone_verified": phone_verified,
         "created_at": datetime.now().isoformat(),
         "progress": {},
-    }
-    save_users(users)
+    }, only_if_absent=True)
+    if not created:
+        return False, "이미 존재하는 아이디입니다."
     return True, "회원가입이 완료되었습니다."
 
 
 def authenticate_user(uid: str, pw: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
-    users = load_users()
-    u = users.get(uid.strip())
+    u = get_user(uid.strip())
     if not u:
         return False, None
 
@@ -113,15 +112,13 @@ def authenticate_user(uid: str, pw: str) -> Tuple[bool, Optional[Dict[str, Any]]
 
 
 def update_user(uid: str, new_user_obj: Dict[str, Any]) -> None:
-    users = load_users()
-    users[uid] = new_user_obj
-    save_users(users)
+    _store.put(uid, new_user_obj)
 
 
 def update_user_approval(uid: str, approved: bool) -> bool:
-    users = load_users()
-    if uid in users:
-        users[uid]["is_approved"] = approved
-        save_users(users)
-        return True
-    return False
+    return _store.patch(uid, {"is_approved": approved})
+
+
+def compact_users() -> None:
+    """저널을 스냅샷(users.json)에 합치기"""
+    _store.compact()
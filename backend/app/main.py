@@ -1,33 +1,86 @@
 # backend/app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
 import os
+import traceback
 
 from sqlmodel import Session, select
-from app.core.database import create_db_and_tables, engine
+from app.core.database import create_db_and_tables, dispose_async_engine, engine
 from app.models import User
 
 # [수정] 모든 라우터 임포트 확인 (notice 포함)
 from app.api import auth, study, user, teacher, admin, speech, notice 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.session import set_session_cookie
+from app.services import upload_janitor, fallback_scorer, contours, student_summary, log_archive
+from app.services.log_writer import log_writer
+from app.services.notice_feed import notice_feed
+from app.services.passwords import hash_password, passwords
 
 def create_default_users():
+    """개발용 기본 계정 (비밀번호 1111, 해시로 저장)"""
     with Session(engine) as session:
         if not session.get(User, "admin"):
-            session.add(User(uid="admin", name="총괄 관리자", pw="1111", role="admin", progress={"settings": {"goal": 10, "review_wrong": True}}))
+            session.add(User(uid="admin", name="총괄 관리자", pw=hash_password("1111"), role="admin"))
         if not session.get(User, "teacher"):
-            session.add(User(uid="teacher", name="김선생님", pw="1111", role="teacher", progress={"settings": {"goal": 10, "review_wrong": True}}))
+            session.add(User(uid="teacher", name="김선생님", pw=hash_password("1111"), role="teacher"))
         if not session.get(User, "student"):
-            session.add(User(uid="student", name="학생1", pw="1111", role="student", progress={"settings": {"goal": 10, "review_wrong": True}}))
+            session.add(User(uid="student", name="학생1", pw=hash_password("1111"), role="student"))
+            session.flush()
+            student_summary.refresh(session.connection(), ["student"])
         session.commit()
 
+def _start_build(tasks: set, name: str, build) -> None:
+    """참조 저장소 생성(build)을 스레드에서 실행. 실패하면 로그를 남기고, 종료 때 취소하도록 tasks에 보관"""
+    task = asyncio.create_task(asyncio.to_thread(build), name=name)
+    task.add_done_callback(_log_build_result)
+    tasks.add(task)
+
+def _log_build_result(task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        print(f"[Startup] {task.get_name()} 생성 실패 (다음 서버 시작 때 다시 시도):")
+        traceback.print_exception(task.exception())
+    else:
+        print(f"[Startup] {task.get_name()} 생성 완료: {task.result()}개")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
     create_default_users()
+    # StudyLog 일괄 저장 스레드 (이전 종료 때 남은 행 복구 포함)
+    log_writer.start()
+    # 임시 업로드 폴더 TTL/용량 정리
+    janitor_task = asyncio.create_task(upload_janitor.run_forever())
+    # 오래된 StudyLog 월별 보관 (LOG_RETENTION_DAYS=0 이면 끔)
+    archive_task = asyncio.create_task(log_archive.run_forever()) if settings.LOG_RETENTION_DAYS > 0 else None
+    # 예약 공지 발송 + 공지 피드 캐시 무효화/실시간 알림
+    notice_task = asyncio.create_task(notice_feed.run_forever())
+    # 로컬 대체 채점용 참조 음성 특징/곡선 저장소가 없으면 백그라운드에서 생성
+    build_tasks: set = set()
+    if settings.FALLBACK_SCORER_ENABLED and not fallback_scorer.feature_store().exists():
+        _start_build(build_tasks, "fallback feature store", fallback_scorer.build_feature_store)
+    if settings.CONTOURS_ENABLED and not contours.reference_store().exists():
+        _start_build(build_tasks, "reference contours", contours.build_reference_contours)
     yield
+    janitor_task.cancel()
+    notice_task.cancel()
+    if archive_task:
+        archive_task.cancel()
+    # 생성 중인 스레드는 멈출 수 없으므로 기다리지 않음 (저장소는 다 만든 뒤 한 번에 교체되어, 끝나지 않았으면 다음 시작 때 다시 생성)
+    for task in build_tasks:
+        if not task.done():
+            print(f"[Startup] {task.get_name()} 생성 중 종료")
+        task.cancel()
+    # 버퍼에 남은 StudyLog 저장 후 종료
+    await asyncio.to_thread(log_writer.stop)
+    passwords.shutdown()
+    await dispose_async_engine()
 
 app = FastAPI(title="JustVoca API", lifespan=lifespan)
 
@@ -60,10 +113,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def refresh_session_cookie(request: Request, call_next):
+    """낡았거나 예전 키로 서명된 세션 토큰을 인증 헬퍼가 새로 발급했으면 응답 쿠키로 교체"""
+    response = await call_next(request)
+    token = getattr(request.state, "session_token", None)
+    if token:
+        set_session_cookie(response, token)
+    return response
+
 @app.get("/")
 async def root():
     return {"status": "ok", "message": "JustVoca Backend is running!"}
 
+# 운영 메트릭 (Admission control 등 각 서브시스템 상태)
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
+
 # --- 라우터 등록 (경로 동기화) ---
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(study.router, prefix="/study", tags=["Study"])
@@ -1,7 +1,7 @@
 # backend/app/models.py
-from typing import Optional, Dict
-from datetime import datetime
-from sqlmodel import Field, SQLModel, JSON
+from typing import Any, Optional, Dict
+from datetime import date, datetime
+from sqlmodel import Field, SQLModel, JSON, UniqueConstraint, Index
 
 # 1. 유저 모델
 class User(SQLModel, table=True):
@@ -19,20 +19,30 @@ class User(SQLModel, table=True):
     is_approved: bool = Field(default=True) 
     created_at: datetime = Field(default_factory=datetime.now)
 
-    progress: Dict = Field(default={}, sa_type=JSON)
+    progress: Dict = Field(default={}, sa_type=JSON)  # 이전 형식 (현재는 18~22 테이블에 저장, app/services/user_progress.py)
 
 # 2. 학습 진도 모델
+# (user_id, level) 당 한 행. 인덱스 변경은 app/core/migrations.py 에도 추가
 class StudyProgress(SQLModel, table=True):
+    __table_args__ = (
+        Index("ux_studyprogress_user_level", "user_id", "level", unique=True),
+        Index("ix_studyprogress_user_updated", "user_id", "updated_at"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: str = Field(index=True)
+    user_id: str
     level: str
     current_page: int = 1
     updated_at: datetime = Field(default_factory=datetime.now)
 
 # 3. 학습 로그 모델
 class StudyLog(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_studylog_user_created", "user_id", "created_at"),  # 최근 기록/통계
+        Index("ix_studylog_user_score", "user_id", "score"),         # 복습 단어(낮은 점수 순)/평균 점수
+        Index("ix_studylog_created", "created_at"),                   # 월별 보관 (app/services/log_archive.py)
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: str = Field(index=True)
+    user_id: str
     word: str
     score: float
     feedback: str
@@ -58,4 +68,232 @@ class Notice(SQLModel, table=True):
     # [신규 추가] 선생님 ID (타겟팅용)
     teacher_id: str = Field(index=True)
     scheduled_at: Optional[datetime] = None
-    created_at: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
+    created_at: datetime = Field(default_factory=datetime.now)
+
+# 6. 녹음 아카이브 (내용 해시 기준으로 한 번만 저장, app/services/recording_archive.py)
+class Recording(SQLModel, table=True):
+    sha256: str = Field(primary_key=True)  # 변환된 16k WAV의 SHA-256
+    codec: str = "flac"                    # flac | opus
+    size: int = 0                          # 압축 후 저장 크기
+    wav_size: int = 0
+    duration: float = 0.0
+    created_at: datetime = Field(default_factory=datetime.now)
+
+# 7. 학습 로그 <-> 녹음 연결
+class StudyLogRecording(SQLModel, table=True):
+    log_id: int = Field(primary_key=True)  # StudyLog.id
+    recording_sha256: str = Field(index=True)
+    text: str = ""                         # 엔진에 전달한 문장 (재채점 시 사용)
+
+# 8. 재채점 결과 (엔진/모델 버전별, 기존 StudyLog.score는 그대로 유지)
+class StudyLogRescore(SQLModel, table=True):
+    __table_args__ = (UniqueConstraint("log_id", "engine_version"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    log_id: int = Field(index=True)        # StudyLog.id
+    engine_version: str = Field(index=True)
+    score: float
+    created_at: datetime = Field(default_factory=datetime.now)
+
+# 9. 억양/세기 곡선 (app/services/contours.py, float16 [F0, 에너지] 쌍의 바이트열)
+class StudyLogContour(SQLModel, table=True):
+    log_id: int = Field(primary_key=True)  # StudyLog.id
+    reference: str = ""                    # 참조 음성 상대 경로 (assets 기준)
+    hop_ms: int = 20
+    student: bytes = b""                   # 학생 곡선 (발화 구간)
+    aligned: bytes = b""                   # 참조 시간축에 맞춘 학생 곡선 (참조 음성이 없으면 비어 있음)
+    created_at: datetime = Field(default_factory=datetime.now)
+
+# 10. 음절 단위 점수 (app/services/phone_scores.py, 평가 1회당 음절 수만큼)
+class SyllableScore(SQLModel, table=True):
+    __table_args__ = (
+        # 집계 질의가 테이블을 읽지 않도록 score, created_at까지 포함한 커버링 인덱스
+        Index("ix_syllablescore_user_syllable", "user_id", "syllable", "score", "created_at"),
+        Index("ix_syllablescore_teacher_syllable", "teacher_id", "syllable", "score", "created_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    log_id: int = Field(index=True)         # StudyLog.id
+    user_id: str
+    teacher_id: Optional[str] = None        # 평가 시점의 담당 선생님 (반 단위 집계용)
+    word: str = ""
+    syllable: str
+    position: int = 0                       # 문장 안 음절 순서
+    score: float
+    created_at: datetime = Field(default_factory=datetime.now)
+
+# 11. 음소 단위 점수
+class PhoneScore(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_phonescore_user_phone", "user_id", "phone", "score", "created_at"),
+        Index("ix_phonescore_teacher_phone", "teacher_id", "phone", "score", "created_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    log_id: int = Field(index=True)
+    user_id: str
+    teacher_id: Optional[str] = None
+    phone: str                              # 엔진 음소 기호
+    syllable: str = ""
+    score: float
+    created_at: datetime = Field(default_factory=datetime.now)
+
+# 12. 사용자별 일일 학습 집계 (app/services/rollups.py, StudyLog 저장 시 함께 갱신)
+class StudyDailyStat(SQLModel, table=True):
+    user_id: str = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    attempts: int = 0
+    score_sum: float = 0.0
+    high: int = 0                           # 90점 이상
+    mid: int = 0                            # 70~89점
+    low: int = 0                            # 70점 미만
+    words: int = 0                          # 그날 학습한 서로 다른 단어 수
+
+# 13. 일별 학습 단어 (최근 7일 서로 다른 단어 수 계산용)
+class StudyDailyWord(SQLModel, table=True):
+    user_id: str = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    word: str = Field(primary_key=True)
+    last_at: datetime                       # 그날 이 단어의 마지막 학습 시각 (7일 경계일 판정용)
+
+# 14. 사용자별 누적 집계 (전체 평균 점수/숙련도 분포)
+class StudyUserTotal(SQLModel, table=True):
+    user_id: str = Field(primary_key=True)
+    attempts: int = 0
+    score_sum: float = 0.0
+    high: int = 0
+    mid: int = 0
+    low: int = 0
+
+# 15. 선생님 대시보드 학생 요약 (app/services/student_summary.py, 원본 변경 시 함께 갱신)
+class StudentSummary(SQLModel, table=True):
+    __table_args__ = (
+        # 키셋 페이지네이션: (담당 선생님, 정렬 컬럼, user_id) / 관리자 전체 조회는 teacher_id 없이
+        Index("ix_studentsummary_teacher_score", "teacher_id", "avg_score", "user_id"),
+        Index("ix_studentsummary_teacher_progress", "teacher_id", "progress_rate", "user_id"),
+        Index("ix_studentsummary_teacher_name", "teacher_id", "name", "user_id"),
+        Index("ix_studentsummary_score", "avg_score", "user_id"),
+        Index("ix_studentsummary_progress", "progress_rate", "user_id"),
+        Index("ix_studentsummary_name", "name", "user_id"),
+    )
+
+    user_id: str = Field(primary_key=True)
+    teacher_id: Optional[str] = None
+    name: str = ""
+    country: str = "KR"
+    level: str = "미시작"                  # 가장 최근 진도의 레벨
+    current_page: int = 1
+    progress_rate: float = 0.0
+    attempts: int = 0
+    avg_score: float = 0.0
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+# 16. 사용자별 단어 숙련도 (app/services/mastery.py, StudyLog 저장 시 함께 갱신)
+class WordMastery(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_wordmastery_user_ewma", "user_id", "ewma", "word"),  # 복습 단어: 숙련도 낮은 순 top-K
+    )
+
+    user_id: str = Field(primary_key=True)
+    word: str = Field(primary_key=True)
+    attempts: int = 0
+    last_score: float = 0.0
+    best_score: float = 0.0
+    ewma: float = 0.0                       # 지수 가중 평균 (최근 점수에 가중치)
+    last_at: datetime = Field(default_factory=datetime.now)
+
+# 17. 단어 복습 카드 (app/services/review_scheduler.py, SM-2 방식 간격 반복)
+class ReviewCard(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_reviewcard_user_due", "user_id", "due_at", "word"),  # 오늘 복습할 카드: 복습 예정 시각 순 범위 조회
+    )
+
+    user_id: str = Field(primary_key=True)
+    word: str = Field(primary_key=True)
+    reps: int = 0                           # 연속 통과 횟수 (실패하면 0)
+    lapses: int = 0                         # 통과했던 카드를 다시 틀린 횟수
+    ease: float = 2.5                       # 간격 배수 (1.3 이상)
+    interval_days: float = 0.0
+    due_at: datetime = Field(default_factory=datetime.now)
+    last_reviewed_at: datetime = Field(default_factory=datetime.now)
+
+# 18~22. 사용자 설정/학습 상태 (예전 User.progress JSON을 항목 단위로 나눈 테이블, app/services/user_progress.py)
+# 18. 학습 설정: progress["settings"][key]
+class UserSetting(SQLModel, table=True):
+    user_id: str = Field(primary_key=True)
+    key: str = Field(primary_key=True)      # goal, review_wrong, ui_lang ...
+    value: Optional[Any] = Field(default=None, sa_type=JSON)
+
+# 19. 기타 상태: progress[key] (last_session, today_flags ...)
+class UserState(SQLModel, table=True):
+    user_id: str = Field(primary_key=True)
+    key: str = Field(primary_key=True)
+    value: Optional[Any] = Field(default=None, sa_type=JSON)
+
+# 20. 주제별 통계: progress["topics"][topic]["stats"][key]
+class UserTopicStat(SQLModel, table=True):
+    user_id: str = Field(primary_key=True)
+    topic: str = Field(primary_key=True)
+    key: str = Field(primary_key=True)      # studied_count ...
+    value: Optional[Any] = Field(default=None, sa_type=JSON)
+
+# 21. 주제별 학습한 단어: progress["topics"][topic]["learned"][word]
+class UserLearnedWord(SQLModel, table=True):
+    user_id: str = Field(primary_key=True)
+    topic: str = Field(primary_key=True)
+    word: str = Field(primary_key=True)
+    mean: str = ""
+    last_score: Optional[float] = None
+    last_seen: Optional[datetime] = None
+
+# 22. 주제별 오답 노트: progress["topics"][topic]["wrong_notes"] (추가만)
+class UserWrongNote(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_userwrongnote_user_topic", "user_id", "topic", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str
+    topic: str
+    q: str = ""
+    a: str = ""
+    user_answer: str = ""                   # 예전 JSON의 "user"
+    ts: Optional[datetime] = None
+
+# 23. 공지 읽음 표시 (예전 notices.json의 read_by)
+class NoticeRead(SQLModel, table=True):
+    notice_id: int = Field(primary_key=True)  # Notice.id
+    user_id: str = Field(primary_key=True)
+    read_at: Optional[datetime] = None        # 예전 데이터는 시각 없음
+
+# 24. 퀴즈 결과 기록 (예전 history.json)
+class QuizResult(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_quizresult_user_taken", "user_id", "taken_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str
+    name: str = ""
+    level: str = ""
+    score: int = 0                          # 맞힌 문제 수
+    total: int = 0
+    wrong_words: list = Field(default=[], sa_type=JSON)
+    taken_at: datetime = Field(default_factory=datetime.now)
+
+# 25. 예전 JSON 가져오기 기록 (app/services/legacy_import.py, 같은 항목을 두 번 넣지 않도록)
+class LegacyImportKey(SQLModel, table=True):
+    source: str = Field(primary_key=True)   # notices | history
+    key: str = Field(primary_key=True)      # 공지 UUID, "<uid>#<순번>"
+    target_id: Optional[int] = None         # 만들어진 Notice.id / QuizResult.id
+
+# 26. 세션 토큰 폐기 목록 (app/core/session.py, 토큰 만료 시각이 지나면 지워도 됨)
+#   "jti:<토큰 id>"  : 그 토큰 하나 (로그아웃)
+#   "uid:<사용자 id>": 그 사용자의 토큰 중 발급 시각(ms)이
+#                      revoked_before 이전 -> 거부 (비밀번호 변경, 탈퇴)
+#                      stale_before 이전   -> 역할/담당 선생님이 낡음: DB에서 다시 읽고 새 토큰 발급
+class SessionRevocation(SQLModel, table=True):
+    key: str = Field(primary_key=True)
+    revoked_before: int = 0
+    stale_before: int = 0
+    expires_at: datetime = Field(index=True)
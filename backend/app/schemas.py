@@ -1,11 +1,31 @@
 # backend/app/schemas.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
+from datetime import datetime
 
 class UserLogin(BaseModel):
     id: str
     password: str
 
+# 로그인 응답의 사용자 정보 (비밀번호 해시 pw는 내보내지 않음)
+class UserPublic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    uid: str
+    name: str
+    role: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    country: Optional[str] = None
+    teacher_id: Optional[str] = None
+    is_approved: bool = True
+    created_at: Optional[datetime] = None
+    progress: Dict[str, Any] = {}
+
+class LoginResponse(BaseModel):
+    status: str
+    user: UserPublic
+
 class UserRegister(BaseModel):
     id: str
     password: str
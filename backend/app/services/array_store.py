@@ -0,0 +1,93 @@
+# backend/app/services/array_store.py
+"""
+키별 2차원 배열을 하나의 .npy 파일에 이어 붙여 저장하는 읽기 전용 저장소.
+
+    <name>.npy        : 모든 배열을 행 방향으로 이어 붙인 (총 행 수, 열 수) 배열
+    <name>.index.json : {"key": [시작 행, 끝 행], ...}
+
+읽을 때는 mmap으로 열기 때문에 서버 시작 비용과 상주 메모리가 거의 없고,
+get()은 슬라이스 하나라서 수 µs에 끝납니다.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+class ArrayStore:
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._data: Optional[np.ndarray] = None
+        self._index: Dict[str, Tuple[int, int]] = {}
+
+    @property
+    def data_path(self) -> Path:
+        return self.path.with_suffix(".npy")
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_suffix(".index.json")
+
+    def exists(self) -> bool:
+        return self.data_path.exists() and self.index_path.exists()
+
+    def load(self) -> "ArrayStore":
+        with self.index_path.open("r", encoding="utf-8") as f:
+            self._index = {k: (v[0], v[1]) for k, v in json.load(f).items()}
+        self._data = np.load(self.data_path, mmap_mode="r")
+        return self
+
+    def _ensure_loaded(self) -> None:
+        if self._data is None:
+            self.load()
+
+    def keys(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        self._ensure_loaded()
+        return key in self._index
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        self._ensure_loaded()
+        span = self._index.get(key)
+        if span is None:
+            return None
+        return self._data[span[0]:span[1]]
+
+    @classmethod
+    def build(cls, path: Union[str, Path], items: Iterable[Tuple[str, np.ndarray]], dtype=np.float32) -> "ArrayStore":
+        store = cls(path)
+        store.data_path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays: List[np.ndarray] = []
+        index: Dict[str, List[int]] = {}
+        row = 0
+        for key, arr in items:
+            arr = np.asarray(arr, dtype=dtype)
+            if arr.ndim == 1:
+                arr = arr[:, None]
+            index[key] = [row, row + len(arr)]
+            row += len(arr)
+            arrays.append(arr)
+
+        data = np.concatenate(arrays, axis=0) if arrays else np.zeros((0, 1), dtype=dtype)
+
+        # 데이터 -> 인덱스 순으로 원자적 교체 (읽는 쪽은 인덱스 기준으로 열기 때문)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=".npy", dir=str(store.data_path.parent))
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, data)
+        os.replace(tmp, store.data_path)
+
+        fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=str(store.index_path.parent))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp, store.index_path)
+
+        return store.load()
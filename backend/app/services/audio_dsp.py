@@ -0,0 +1,183 @@
+# backend/app/services/audio_dsp.py
+"""
+NumPy만 사용하는 음성 특징 추출 유틸 (CPU 전용, 외부 DSP 라이브러리 없음).
+
+- read_wav_mono: PCM WAV -> float32 mono 신호 (-1 ~ 1)
+- frame_signal: 25ms 창 / 10ms 간격 프레임 분할
+- mfcc: 로그 멜 필터뱅크 + DCT (켑스트럼 평균/분산 정규화 포함)
+- trim_silence: 앞뒤 무음 프레임 구간 계산
+- pitch_track: 정규화 자기상관 기반 F0 (무성 구간은 0)
+"""
+from __future__ import annotations
+
+import wave
+from functools import lru_cache
+from typing import BinaryIO, Tuple, Union
+from pathlib import Path
+
+import numpy as np
+
+FRAME_SEC = 0.025
+HOP_SEC = 0.010
+N_MELS = 26
+N_MFCC = 13
+DYNAMIC_RANGE_DB = 30.0
+PITCH_FRAME_SEC = 0.040  # 75Hz 기준 약 3주기
+PITCH_MIN_HZ = 70.0
+PITCH_MAX_HZ = 400.0
+VOICING_THRESHOLD = 0.45
+
+
+def read_wav_mono(path: Union[str, Path, BinaryIO]) -> Tuple[np.ndarray, int]:
+    with wave.open(path if hasattr(path, "read") else str(path), "rb") as wf:
+        sr = wf.getframerate()
+        n_ch = wf.getnchannels()
+        width = wf.getsampwidth()
+        raw = wf.readframes(wf.getnframes())
+
+    if width == 2:
+        x = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 4:
+        x = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    elif width == 1:
+        x = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        raise ValueError(f"지원하지 않는 샘플 폭: {width}")
+
+    if n_ch > 1:
+        x = x.reshape(-1, n_ch).mean(axis=1)
+    return x, sr
+
+
+def frame_signal(x: np.ndarray, sr: int, frame_sec: float = FRAME_SEC, hop_sec: float = HOP_SEC) -> np.ndarray:
+    """(n_frames, frame_len) 프레임 배열. 짧은 신호는 0으로 채움"""
+    frame_len = int(round(frame_sec * sr))
+    hop = int(round(hop_sec * sr))
+    if len(x) < frame_len:
+        x = np.pad(x, (0, frame_len - len(x)))
+    n_frames = 1 + (len(x) - frame_len) // hop
+    idx = np.arange(frame_len)[None, :] + hop * np.arange(n_frames)[:, None]
+    return x[idx]
+
+
+def _hz_to_mel(f):
+    return 2595.0 * np.log10(1.0 + np.asarray(f) / 700.0)
+
+
+def _mel_to_hz(m):
+    return 700.0 * (10.0 ** (np.asarray(m) / 2595.0) - 1.0)
+
+
+@lru_cache(maxsize=8)
+def _mel_filterbank(sr: int, n_fft: int, n_mels: int = N_MELS) -> np.ndarray:
+    fmax = min(sr / 2.0, 8000.0)  # 샘플레이트가 달라도(16k/24k) 같은 대역을 보도록 8kHz로 제한
+    mel_pts = np.linspace(_hz_to_mel(20.0), _hz_to_mel(fmax), n_mels + 2)
+    bins = np.floor((n_fft + 1) * _mel_to_hz(mel_pts) / sr).astype(int)
+    fb = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            fb[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            fb[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return fb
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n_in: int, n_out: int) -> np.ndarray:
+    n = np.arange(n_in)
+    k = np.arange(n_out)[:, None]
+    mat = np.cos(np.pi * k * (2 * n + 1) / (2 * n_in)) * np.sqrt(2.0 / n_in)
+    mat[0] /= np.sqrt(2.0)
+    return mat.astype(np.float32)
+
+
+def frame_energy_db(frames: np.ndarray) -> np.ndarray:
+    return 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+
+def trim_silence(energy_db: np.ndarray, floor_db: float = 20.0) -> Tuple[int, int]:
+    """최대 에너지 대비 floor_db 이상 작은 앞뒤 프레임을 잘라낸 [start, end) 구간"""
+    if len(energy_db) == 0:
+        return 0, 0
+    voiced = np.flatnonzero(energy_db > energy_db.max() - floor_db)
+    if len(voiced) == 0:
+        return 0, len(energy_db)
+    return int(voiced[0]), int(voiced[-1]) + 1
+
+
+def _pre_emphasis(x: np.ndarray) -> np.ndarray:
+    return np.append(x[:1], x[1:] - 0.97 * x[:-1])
+
+
+def speech_span(x: np.ndarray, sr: int) -> Tuple[int, int]:
+    """mfcc(trim=True)가 잘라내는 것과 같은 발화 프레임 구간 [start, end)"""
+    return trim_silence(frame_energy_db(frame_signal(_pre_emphasis(x), sr)))
+
+
+def mfcc(x: np.ndarray, sr: int, trim: bool = True) -> np.ndarray:
+    """(n_frames, N_MFCC) float32. c0 자리에는 프레임 로그 에너지를 사용"""
+    frames = frame_signal(_pre_emphasis(x), sr)
+    energy = frame_energy_db(frames)
+    if trim:
+        start, end = trim_silence(energy)
+        frames, energy = frames[start:end], energy[start:end]
+
+    n_fft = 1 << (frames.shape[1] - 1).bit_length()
+    window = np.hamming(frames.shape[1]).astype(np.float32)
+    power = np.abs(np.fft.rfft(frames * window, n=n_fft, axis=1)) ** 2 / n_fft
+    mel_power = power @ _mel_filterbank(sr, n_fft).T
+    # 발화 최대값 기준 하한(-DYNAMIC_RANGE_DB)을 둬서 무음/배경잡음 대역의 차이가 거리를 지배하지 않게 함
+    floor = mel_power.max() * 10.0 ** (-DYNAMIC_RANGE_DB / 10.0) + 1e-10
+    mel = np.log(np.maximum(mel_power, floor))
+    ceps = mel @ _dct_matrix(N_MELS, N_MFCC).T
+    ceps[:, 0] = energy / 10.0
+    # 켑스트럼 평균/분산 정규화(CMVN): 마이크/녹음 환경 차이 보정
+    ceps -= ceps.mean(axis=0, keepdims=True)
+    ceps /= ceps.std(axis=0, keepdims=True) + 1e-5
+    return ceps.astype(np.float32)
+
+
+def pitch_track(x: np.ndarray, sr: int) -> np.ndarray:
+    """
+    HOP_SEC 간격 F0(Hz) 배열, 무성/무음 프레임은 0.
+    프레임별 정규화 자기상관을 FFT 한 번으로 모든 프레임에 대해 계산합니다.
+    """
+    frames = frame_signal(x, sr, frame_sec=PITCH_FRAME_SEC)
+    frames = frames - frames.mean(axis=1, keepdims=True)
+    n = frames.shape[1]
+    n_fft = 1 << (2 * n - 1).bit_length()
+    spec = np.fft.rfft(frames * np.hanning(n).astype(np.float32), n=n_fft, axis=1)
+    ac = np.fft.irfft(np.abs(spec) ** 2, n=n_fft, axis=1)[:, :n]
+    # 창 함수 자체의 자기상관으로 나눠 지연이 길수록 작아지는 편향 보정
+    win_ac = np.fft.irfft(np.abs(np.fft.rfft(np.hanning(n), n=n_fft)) ** 2, n=n_fft)[:n]
+    ac = ac / (ac[:, :1] + 1e-10) / (win_ac / win_ac[0] + 1e-10)
+
+    lag_min = int(sr / PITCH_MAX_HZ)
+    lag_max = min(int(sr / PITCH_MIN_HZ), n - 1)
+    rows = np.arange(len(ac))
+    region = ac[:, lag_min:lag_max + 1]
+    peak = region.max(axis=1)
+    # 옥타브 아래 오류 방지: 최댓값의 90% 이상인 첫 번째 국소 최댓값(가장 짧은 주기)을 선택
+    local_max = np.zeros_like(region, dtype=bool)
+    local_max[:, 1:-1] = (region[:, 1:-1] >= region[:, :-2]) & (region[:, 1:-1] >= region[:, 2:])
+    best = ((region >= 0.9 * peak[:, None]) & local_max).argmax(axis=1)
+    lag = (best + lag_min).astype(np.float64)
+
+    # 포물선 보간으로 정수 지연 오차 보정
+    i = np.clip(best + lag_min, 1, n - 2)
+    a, b, c = ac[rows, i - 1], ac[rows, i], ac[rows, i + 1]
+    denom = a - 2 * b + c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lag += np.where(np.abs(denom) > 1e-10, 0.5 * (a - c) / denom, 0.0)
+
+    energy = frame_energy_db(frames)
+    voiced = (peak > VOICING_THRESHOLD) & (energy > energy.max() - DYNAMIC_RANGE_DB)
+    f0 = np.where(voiced, sr / np.maximum(lag, 1.0), 0.0)
+
+    # 옥타브 튐 완화: 유성 프레임만 3프레임 중앙값
+    if len(f0) >= 3:
+        padded = np.pad(f0, 1, mode="edge")
+        med = np.median(np.stack([padded[:-2], padded[1:-1], padded[2:]]), axis=0)
+        f0 = np.where(voiced, np.where(med > 0, med, f0), 0.0)
+    return f0.astype(np.float32)
@@ -0,0 +1,231 @@
+# backend/app/services/contours.py
+"""
+억양(피치)/세기(에너지) 곡선.
+
+- 참조 음성: 모든 assets/audio 클립의 곡선을 미리 계산해 ArrayStore(float16)에 보관
+      python -m app.services.contours build
+- 학생 녹음: 평가 직후 백그라운드에서 곡선을 계산하고, MFCC DTW 경로로
+  참조 음성 시간축에 맞춘(aligned) 곡선과 함께 StudyLogContour에 저장
+- GET /speech/contours/{log_id} 가 두 곡선을 같은 길이로 돌려줍니다.
+
+곡선은 발화 구간(앞뒤 무음 제외)만, CONTOUR_HOP_MS 간격 [F0(Hz, 무성=0), 에너지(dB, 발화 최대=0)] 입니다.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import metrics
+from app.models import StudyLogContour
+from app.services import fallback_scorer
+from app.services.array_store import ArrayStore
+from app.services.audio_dsp import (
+    HOP_SEC,
+    frame_energy_db,
+    frame_signal,
+    mfcc,
+    pitch_track,
+    read_wav_mono,
+    speech_span,
+)
+from app.services.reference_audio import iter_reference_clips, reference_for
+
+DOWNSAMPLE = 2  # 10ms 분석 프레임 2개 -> 곡선 1점
+CONTOUR_HOP_MS = int(round(HOP_SEC * 1000 * DOWNSAMPLE))
+
+_store: Optional[ArrayStore] = None
+
+
+def reference_store() -> ArrayStore:
+    global _store
+    if _store is None:
+        _store = ArrayStore(Path(settings.FEATURE_STORE_DIR) / "ref_contour")
+    return _store
+
+
+def _downsample(values: np.ndarray, voiced_only: bool) -> np.ndarray:
+    n = len(values) // DOWNSAMPLE * DOWNSAMPLE
+    if n == 0:
+        return values[:0]
+    blocks = values[:n].reshape(-1, DOWNSAMPLE)
+    if not voiced_only:
+        return blocks.mean(axis=1)
+    count = (blocks > 0).sum(axis=1)
+    return np.where(count > 0, blocks.sum(axis=1) / np.maximum(count, 1), 0.0)
+
+
+def extract_contour(x: np.ndarray, sr: int) -> np.ndarray:
+    """(n, 2) float32 [F0, 에너지]"""
+    start, end = speech_span(x, sr)
+    f0 = pitch_track(x, sr)
+    energy = frame_energy_db(frame_signal(x, sr))
+    n = min(len(f0), len(energy))
+    f0, energy = f0[:n][start:end], energy[:n][start:end]
+    if len(energy):
+        energy = np.maximum(energy - energy.max(), -60.0)
+    return np.stack(
+        [_downsample(f0, voiced_only=True), _downsample(energy, voiced_only=False)], axis=1
+    ).astype(np.float32)
+
+
+def build_reference_contours() -> int:
+    """모든 참조 음성의 곡선을 계산해 저장. 저장된 클립 수를 반환"""
+    global _store
+
+    def items():
+        for rel in iter_reference_clips():
+            try:
+                x, sr = read_wav_mono(Path(settings.ASSETS_DIR) / rel)
+                yield rel, extract_contour(x, sr)
+            except Exception as e:
+                print(f"[Contour] 곡선 추출 실패 {rel}: {e}")
+
+    _store = ArrayStore.build(Path(settings.FEATURE_STORE_DIR) / "ref_contour", items(), dtype=np.float16)
+    return len(_store.keys())
+
+
+def reference_contour(rel: str) -> Optional[np.ndarray]:
+    store = reference_store()
+    if store.exists() and rel in store:
+        return np.asarray(store.get(rel), dtype=np.float32)
+    path = Path(settings.ASSETS_DIR) / rel
+    if not path.exists():
+        return None
+    x, sr = read_wav_mono(path)
+    return extract_contour(x, sr)
+
+
+def _reference_mfcc(rel: str) -> Optional[np.ndarray]:
+    store = fallback_scorer.feature_store()
+    if store.exists() and rel in store:
+        return np.asarray(store.get(rel))
+    path = Path(settings.ASSETS_DIR) / rel
+    if not path.exists():
+        return None
+    x, sr = read_wav_mono(path)
+    return mfcc(x, sr)
+
+
+def align_to_reference(student: np.ndarray, path: np.ndarray, n_ref: int) -> np.ndarray:
+    """
+    DTW 경로(10ms 프레임 [학생, 참조])를 곡선 해상도로 줄여
+    참조 곡선의 각 점에 대응하는 학생 곡선 값(F0는 유성 프레임 평균)을 구합니다.
+    """
+    s_idx = np.minimum(path[:, 0] // DOWNSAMPLE, len(student) - 1)
+    r_idx = np.minimum(path[:, 1] // DOWNSAMPLE, n_ref - 1)
+    keep = (s_idx >= 0) & (r_idx >= 0)
+    s_idx, r_idx = s_idx[keep], r_idx[keep]
+
+    f0 = student[s_idx, 0]
+    voiced = f0 > 0
+    f0_sum = np.bincount(r_idx, weights=np.where(voiced, f0, 0.0), minlength=n_ref)
+    f0_cnt = np.bincount(r_idx, weights=voiced.astype(np.float64), minlength=n_ref)
+    en_sum = np.bincount(r_idx, weights=student[s_idx, 1], minlength=n_ref)
+    en_cnt = np.bincount(r_idx, minlength=n_ref)
+
+    aligned = np.zeros((n_ref, 2), dtype=np.float32)
+    aligned[:, 0] = np.where(f0_cnt > 0, f0_sum / np.maximum(f0_cnt, 1), 0.0)
+    aligned[:, 1] = np.where(en_cnt > 0, en_sum / np.maximum(en_cnt, 1), -60.0)
+    return aligned
+
+
+def compute_student_contours(
+    wav_bytes: bytes, text: str, word: str
+) -> Optional[Tuple[Optional[str], np.ndarray, Optional[np.ndarray]]]:
+    """(참조 경로, 학생 곡선, 참조 시간축 정렬 곡선). 참조 음성이 없으면 정렬 곡선은 None"""
+    x, sr = read_wav_mono(io.BytesIO(wav_bytes))
+    student = extract_contour(x, sr)
+    if len(student) == 0:
+        return None
+
+    rel = reference_for(word, text)
+    ref_feat = _reference_mfcc(rel) if rel else None
+    ref_contour = reference_contour(rel) if rel else None
+    if ref_feat is None or ref_contour is None or len(ref_contour) == 0:
+        return rel, student, None
+
+    stu_feat = mfcc(x, sr)
+    if len(stu_feat) < 5:
+        return rel, student, None
+    _cost, path = fallback_scorer.align(stu_feat, ref_feat)
+    return rel, student, align_to_reference(student, path, len(ref_contour))
+
+
+# ----------------------------------------------------------------------
+# 저장 / 직렬화
+# ----------------------------------------------------------------------
+def to_bytes(arr: np.ndarray) -> bytes:
+    return np.ascontiguousarray(arr, dtype="<f2").tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<f2").reshape(-1, 2).astype(np.float32)
+
+
+def pack_binary(reference: np.ndarray, student: np.ndarray) -> bytes:
+    """(n, 4) float16 [참조 F0, 참조 에너지, 학생 F0, 학생 에너지]"""
+    return to_bytes(np.hstack([reference, student]))
+
+
+def contour_task(log_id: int, wav_bytes: bytes, text: str, word: str) -> None:
+    """BackgroundTasks용: 학생 곡선 계산 후 저장. 실패해도 평가 결과에는 영향 없음"""
+    started = time.perf_counter()
+    try:
+        computed = compute_student_contours(wav_bytes, text, word)
+        if computed is None:
+            return
+        rel, student, aligned = computed
+        with Session(engine) as session:
+            session.merge(
+                StudyLogContour(
+                    log_id=log_id,
+                    reference=rel or "",
+                    hop_ms=CONTOUR_HOP_MS,
+                    student=to_bytes(student),
+                    aligned=to_bytes(aligned) if aligned is not None else b"",
+                )
+            )
+            session.commit()
+        metrics.inc("contour_computed_total")
+        metrics.inc("contour_seconds_total", time.perf_counter() - started)
+    except Exception as e:
+        metrics.inc("contour_failed_total")
+        print(f"[Contour] log_id={log_id} 곡선 계산 실패: {e}")
+
+
+def contour_payload(row: StudyLogContour) -> Dict[str, object]:
+    """
+    응답용 곡선. 참조 곡선이 있으면 student는 참조 시간축에 맞춘 곡선(길이 동일),
+    없으면 학생 원본 곡선만 돌려줍니다.
+    """
+    student_raw = from_bytes(row.student)
+    ref = reference_contour(row.reference) if row.reference else None
+    aligned = from_bytes(row.aligned) if row.aligned else None
+    if ref is not None and aligned is not None:
+        n = min(len(ref), len(aligned))
+        ref, aligned = ref[:n], aligned[:n]
+    else:
+        ref, aligned = None, None
+    return {"hop_ms": row.hop_ms, "reference": ref, "student": aligned, "student_raw": student_raw}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="참조 음성 억양/세기 곡선 저장소 관리")
+    parser.add_argument("command", choices=["build"])
+    args = parser.parse_args()
+    if args.command == "build":
+        started = time.time()
+        n = build_reference_contours()
+        print(f"[Contour] 참조 음성 {n}개 곡선 저장 완료 ({time.time() - started:.1f}s) -> {settings.FEATURE_STORE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# backend/app/services/fallback_scorer.py
+"""
+원격 엔진 장애 시 사용하는 로컬(CPU) 근사 발음 점수.
+
+1) 모든 참조 음성(assets/audio)의 MFCC를 미리 계산해 특징 저장소(ArrayStore)에 보관
+     python -m app.services.fallback_scorer build
+2) 학생 녹음의 MFCC를 참조 MFCC와 DTW로 정렬
+3) 정렬 경로의 평균 프레임 거리를 0~100 점수로 변환, 음절 구간별 거리도 함께 반환
+
+엔진 점수와 같은 척도가 아니므로 결과에는 항상 "fallback": True 가 붙습니다.
+1~3초 발화 기준 특징 추출 + DTW 합쳐 수 ms 수준입니다.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.array_store import ArrayStore
+from app.services.audio_dsp import mfcc, read_wav_mono
+from app.services.reference_audio import iter_reference_clips, reference_for
+
+# 평균 프레임 거리 -> 점수 변환 (logistic). D0 거리에서 50점, SLOPE가 작을수록 급격히 변함
+SCORE_D0 = settings.FALLBACK_SCORE_D0
+SCORE_SLOPE = settings.FALLBACK_SCORE_SLOPE
+
+_store: Optional[ArrayStore] = None
+
+
+def feature_store() -> ArrayStore:
+    global _store
+    if _store is None:
+        _store = ArrayStore(Path(settings.FEATURE_STORE_DIR) / "ref_mfcc")
+    return _store
+
+
+def build_feature_store() -> int:
+    """모든 참조 음성의 MFCC를 계산해 저장. 저장된 클립 수를 반환"""
+    global _store
+
+    def items():
+        for rel in iter_reference_clips():
+            try:
+                x, sr = read_wav_mono(Path(settings.ASSETS_DIR) / rel)
+                yield rel, mfcc(x, sr)
+            except Exception as e:
+                print(f"[Fallback] 특징 추출 실패 {rel}: {e}")
+
+    _store = ArrayStore.build(Path(settings.FEATURE_STORE_DIR) / "ref_mfcc", items())
+    return len(_store.keys())
+
+
+# ----------------------------------------------------------------------
+# DTW
+# ----------------------------------------------------------------------
+def _cost_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """프레임 간 유클리드 거리 (n, m)"""
+    d2 = (a * a).sum(1)[:, None] + (b * b).sum(1)[None, :] - 2.0 * (a @ b.T)
+    return np.sqrt(np.maximum(d2, 0.0))
+
+
+def dtw(cost: np.ndarray, band: Optional[int] = None) -> Tuple[float, np.ndarray]:
+    """
+    누적 비용과 정렬 경로((k, 2) 배열: [학생 프레임, 참조 프레임])를 반환.
+    반대각선(anti-diagonal) 단위로 벡터화해서 파이썬 루프는 n+m 번뿐입니다.
+    """
+    n, m = cost.shape
+    if band is not None:
+        # Sakoe-Chiba 밴드: 길이 비율을 반영한 대각선 주변만 허용
+        ii = np.arange(n)[:, None] * (m / n)
+        jj = np.arange(m)[None, :]
+        cost = np.where(np.abs(ii - jj) <= band, cost, np.inf)
+
+    acc = np.full((n + 1, m + 1), np.inf)
+    acc[0, 0] = 0.0
+    for k in range(n + m - 1):
+        i_lo, i_hi = max(0, k - m + 1), min(k, n - 1)
+        i = np.arange(i_lo, i_hi + 1)
+        j = k - i
+        prev = np.minimum(np.minimum(acc[i, j + 1], acc[i + 1, j]), acc[i, j])
+        acc[i + 1, j + 1] = cost[i, j] + prev
+
+    # 역추적
+    i, j = n, m
+    path = [(i - 1, j - 1)]
+    while i > 1 or j > 1:
+        candidates = ((acc[i - 1, j - 1], i - 1, j - 1), (acc[i - 1, j], i - 1, j), (acc[i, j - 1], i, j - 1))
+        _, i, j = min(candidates, key=lambda c: c[0])
+        path.append((i - 1, j - 1))
+    path.reverse()
+    return float(acc[n, m]), np.asarray(path, dtype=np.int32)
+
+
+def align(student: np.ndarray, reference: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(프레임 거리 행렬, DTW 경로). 밴드 폭은 길이 차이와 긴 쪽 30% 중 큰 값"""
+    cost = _cost_matrix(student, reference)
+    band = max(abs(len(student) - len(reference)), int(0.3 * max(len(student), len(reference))))
+    _total, path = dtw(cost, band=band)
+    return cost, path
+
+
+def distance_to_score(d: float) -> float:
+    return float(100.0 / (1.0 + np.exp((d - SCORE_D0) / SCORE_SLOPE)))
+
+
+def _syllables(text: str) -> List[str]:
+    return re.findall(r"[가-힣]", text) or [text]
+
+
+def score_features(student: np.ndarray, reference: np.ndarray, text: str) -> Dict[str, Any]:
+    cost, path = align(student, reference)
+    step_cost = cost[path[:, 0], path[:, 1]]
+    mean_d = float(step_cost.mean())
+
+    # 참조 프레임을 음절 수만큼 균등 분할해 구간별 평균 거리 계산 (근사)
+    sylls = _syllables(text)
+    edges = np.linspace(0, len(reference), len(sylls) + 1)
+    seg_of_step = np.clip(np.searchsorted(edges, path[:, 1], side="right") - 1, 0, len(sylls) - 1)
+    segments = []
+    for idx, syl in enumerate(sylls):
+        mask = seg_of_step == idx
+        d = float(step_cost[mask].mean()) if mask.any() else mean_d
+        segments.append({"text": syl, "distance": round(d, 3), "score": round(distance_to_score(d), 1)})
+
+    return {"score": round(distance_to_score(mean_d), 1), "distance": round(mean_d, 3), "segments": segments}
+
+
+def score_recording(text: str, word: str, wav_path: Path) -> Optional[Tuple[float, Dict[str, Any]]]:
+    """
+    (점수, 결과) 또는 참조 음성이 없으면 None.
+    결과는 프론트엔드가 엔진 응답과 같은 방식으로 읽을 수 있도록 quality.sentences 구조를 흉내 냅니다.
+    """
+    rel = reference_for(word, text)
+    store = feature_store()
+    if not rel or not store.exists() or rel not in store:
+        return None
+
+    started = time.perf_counter()
+    x, sr = read_wav_mono(wav_path)
+    student = mfcc(x, sr)
+    if len(student) < 5:
+        return 0.0, {"fallback": True, "error": "음성이 감지되지 않았습니다."}
+
+    result = score_features(student, np.asarray(store.get(rel)), text)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    metrics.inc("fallback_scored_total")
+    metrics.inc("fallback_seconds_total", elapsed_ms / 1000)
+
+    score = result["score"]
+    syll = [{"text": s["text"], "score": s["score"], "phones": []} for s in result["segments"]]
+    return score, {
+        "fallback": True,
+        "score": score,
+        "distance": result["distance"],
+        "segments": result["segments"],
+        "reference": rel,
+        "elapsed_ms": round(elapsed_ms, 1),
+        "quality": {
+            "score": score,
+            "sentences": [{"text": text, "score": score, "words": [{"text": text, "score": score, "syll": syll}]}],
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="로컬 대체 채점기 특징 저장소 관리")
+    parser.add_argument("command", choices=["build"])
+    args = parser.parse_args()
+    if args.command == "build":
+        started = time.time()
+        n = build_feature_store()
+        print(f"[Fallback] 참조 음성 {n}개 특징 저장 완료 ({time.time() - started:.1f}s) -> {settings.FEATURE_STORE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
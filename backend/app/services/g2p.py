@@ -0,0 +1,506 @@
+# backend/app/services/g2p.py
+"""
+한국어 G2P (grapheme-to-phoneme), 엔진 /gtp 호출 대체용.
+
+표준 발음법의 주요 규칙을 음절 경계마다 순서대로 적용합니다. (어절 경계 포함, 예: 것 같다 -> 걷깓따)
+    0) 어절 경계/실질 형태소(없다) 앞 받침: 대표음으로 바꾼 뒤 연음 (맛없다 -> 마덥따)
+    1) ㅎ 규칙: ㅎ 탈락, 격음화(ㅎ+ㄱㄷㅈ, ㄱㄷㅂㅈ+ㅎ), ㅎ+ㅅ→ㅆ, ㅎ+ㄴ→ㄴ
+    2) 구개음화: ㄷ/ㅌ + 이 → 지/치
+    3) 연음: 받침 + ㅇ 초성 (겹받침은 뒤 자음만 넘어감)
+    4) 받침 대표음화(7종성)
+    5) 경음화: ㄱㄷㅂ 받침 뒤 ㄱㄷㅂㅅㅈ → ㄲㄸㅃㅆㅉ,
+       한자어 ㄹ 받침 뒤 ㄷㅅㅈ(일정), 관형형 -ㄹ 뒤(할게요), 접미사 -성/-점,
+       용언 어간 겹받침 ㄵㄻㄼㄾ 뒤(앉고, 넓다 -> 널따), 밟- -> 밥-(밥따), ㄺ + ㄱ -> ㄹㄲ(읽고 -> 일꼬)
+    6) 비음화: ㄱㄷㅂ + ㄴㅁ, ㅁㅇ + ㄹ→ㄴ, ㄱㅂ + ㄹ→ㅇㄴ/ㅁㄴ
+    7) 유음화: ㄴ+ㄹ, ㄹ+ㄴ → ㄹㄹ
+    8) 자음 뒤 ㅢ → ㅣ
+
+형태소 분석이 필요한 나머지 예외(사잇소리, 용언 어간 경음화, ㄴ 첨가 등)는 다루지 않습니다.
+엔진 응답과 다른 문장은 validate 명령으로 확인합니다.
+
+    python -m app.services.g2p record     # 전체 어휘에 대해 엔진 /gtp 응답을 코퍼스로 기록
+    python -m app.services.g2p validate   # 로컬 결과를 코퍼스/어휘표 발음 컬럼과 비교
+
+음소 기호표와 구분자는 엔진 응답으로 확인된 것이 아니므로, 기본은 엔진 /gtp(G2P_MODE=remote)입니다.
+G2P_MODE=local 이어도 validate가 코퍼스 일치율 G2P_LOCAL_MIN_RATE 이상으로 통과해
+검증 기록(<코퍼스>.validated.json)을 남긴 경우에만 로컬 결과를 씁니다 (local_ready).
+코퍼스나 이 파일(규칙/기호표)이 바뀌면 기록은 무효가 되어 다시 validate 해야 합니다.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+# ----------------------------------------------------------------------
+# 자모
+# ----------------------------------------------------------------------
+ONSETS = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+VOWELS = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+CODAS = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+         "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 겹받침 -> (남는 받침, 연음되는 자음)
+DOUBLE_CODAS = {
+    "ㄳ": ("ㄱ", "ㅆ"), "ㄵ": ("ㄴ", "ㅈ"), "ㄶ": ("ㄴ", "ㅎ"), "ㄺ": ("ㄹ", "ㄱ"), "ㄻ": ("ㄹ", "ㅁ"),
+    "ㄼ": ("ㄹ", "ㅂ"), "ㄽ": ("ㄹ", "ㅆ"), "ㄾ": ("ㄹ", "ㅌ"), "ㄿ": ("ㄹ", "ㅍ"), "ㅀ": ("ㄹ", "ㅎ"),
+    "ㅄ": ("ㅂ", "ㅆ"),
+}
+
+# 받침 대표음 (제9~11항)
+NEUTRAL_CODA = {
+    "ㄲ": "ㄱ", "ㅋ": "ㄱ", "ㄳ": "ㄱ", "ㄺ": "ㄱ",
+    "ㅅ": "ㄷ", "ㅆ": "ㄷ", "ㅈ": "ㄷ", "ㅊ": "ㄷ", "ㅌ": "ㄷ", "ㅎ": "ㄷ",
+    "ㅍ": "ㅂ", "ㅄ": "ㅂ", "ㄿ": "ㅂ",
+    "ㄵ": "ㄴ", "ㄶ": "ㄴ",
+    "ㄼ": "ㄹ", "ㄽ": "ㄹ", "ㄾ": "ㄹ", "ㅀ": "ㄹ",
+    "ㄻ": "ㅁ",
+}
+
+ASPIRATE = {"ㄱ": "ㅋ", "ㄷ": "ㅌ", "ㅂ": "ㅍ", "ㅈ": "ㅊ"}
+TENSE = {"ㄱ": "ㄲ", "ㄷ": "ㄸ", "ㅂ": "ㅃ", "ㅅ": "ㅆ", "ㅈ": "ㅉ"}
+NASAL = {"ㄱ": "ㅇ", "ㄷ": "ㄴ", "ㅂ": "ㅁ"}
+# 뒤 ㄱㄷㅅㅈ을 된소리로 만드는 용언 어간 겹받침 (앉고, 젊다, 넓지, 핥다)
+STEM_TENSE_CODAS = ("ㄵ", "ㄻ", "ㄼ", "ㄾ")
+# 위 규칙에서 제외할 겹받침 체언 음절 (닭고기 -> 닥꼬기, 삶도 -> 삼도, 여덟과 -> 여덜과)
+_DOUBLE_CODA_NOUNS = ("닭", "흙", "칡", "삵", "삶", "앎", "덟")
+
+# 받침 + 초성 ㅎ 격음화 시 (남는 받침, 격음)
+CODA_H_ASPIRATION = {
+    "ㄱ": ("", "ㅋ"), "ㄲ": ("", "ㅋ"), "ㄺ": ("ㄹ", "ㅋ"),
+    "ㄷ": ("", "ㅌ"), "ㅅ": ("", "ㅌ"), "ㅌ": ("", "ㅌ"),
+    "ㅈ": ("", "ㅊ"), "ㅊ": ("", "ㅊ"), "ㄵ": ("ㄴ", "ㅊ"),
+    "ㅂ": ("", "ㅍ"), "ㄼ": ("ㄹ", "ㅍ"),
+}
+
+# ----------------------------------------------------------------------
+# 음소 기호 (엔진 phone set과 맞춰야 하는 부분은 이 표만 수정)
+# ----------------------------------------------------------------------
+ONSET_PHONES = {
+    "ㄱ": "g", "ㄲ": "kk", "ㄴ": "n", "ㄷ": "d", "ㄸ": "tt", "ㄹ": "r", "ㅁ": "m", "ㅂ": "b", "ㅃ": "pp",
+    "ㅅ": "s", "ㅆ": "ss", "ㅇ": "", "ㅈ": "j", "ㅉ": "jj", "ㅊ": "ch", "ㅋ": "k", "ㅌ": "t", "ㅍ": "p", "ㅎ": "h",
+}
+VOWEL_PHONES = {
+    "ㅏ": "a", "ㅐ": "ae", "ㅑ": "ya", "ㅒ": "yae", "ㅓ": "eo", "ㅔ": "e", "ㅕ": "yeo", "ㅖ": "ye", "ㅗ": "o",
+    "ㅘ": "wa", "ㅙ": "wae", "ㅚ": "oe", "ㅛ": "yo", "ㅜ": "u", "ㅝ": "wo", "ㅞ": "we", "ㅟ": "wi", "ㅠ": "yu",
+    "ㅡ": "eu", "ㅢ": "ui", "ㅣ": "i",
+}
+CODA_PHONES = {"ㄱ": "K", "ㄴ": "N", "ㄷ": "T", "ㄹ": "L", "ㅁ": "M", "ㅂ": "P", "ㅇ": "NG"}
+
+# 엔진 "syll ltrs"/"syll phns" 직렬화 구분자
+WORD_SEP = " "
+SYLL_SEP = "_"
+PHONE_SEP = "."
+
+_HANGUL_RE = re.compile(r"[가-힣]+")
+
+
+# ----------------------------------------------------------------------
+# 음절 분해/조합
+# ----------------------------------------------------------------------
+def decompose(ch: str) -> List[str]:
+    """'각' -> ['ㄱ', 'ㅏ', 'ㄱ']"""
+    code = ord(ch) - 0xAC00
+    return [ONSETS[code // 588], VOWELS[(code % 588) // 28], CODAS[code % 28]]
+
+
+def compose(onset: str, vowel: str, coda: str) -> str:
+    return chr(0xAC00 + ONSETS.index(onset) * 588 + VOWELS.index(vowel) * 28 + CODAS.index(coda))
+
+
+# ㄹ 받침 뒤 ㄷㅅㅈ 경음화(제26항, 한자어)에서 제외할 용언 어미/조사 (살다, 알지만, 물도 ...)
+_NON_SINO_TAILS = ("다", "도", "지", "지만", "자", "죠", "지요", "서", "세요", "셔요", "시다", "습니다", "시")
+# 관형형 어미 -ㄹ 뒤 경음화 (할게요 -> 할께요, 갈까요 -> 갈까요)
+_RIEUL_ENDINGS = ("게", "게요", "까", "까요", "거야", "거예요", "걸", "께", "께요")
+# 받침 뒤에서 연음 전에 대표음으로 바뀌는 실질 형태소 첫 음절 (제15항: 맛없다 -> 마덥따)
+_INDEPENDENT_VOWEL_SYLLS = ("없",)
+
+
+def _apply_boundary(prev: List[str], cur: List[str], word_boundary: bool = False, tail: str = "") -> None:
+    """
+    앞 음절 받침(prev[2])과 뒤 음절 초성(cur[0]) 사이의 음운 규칙 (제자리 수정).
+    tail: 어절 안에서 cur 음절부터 끝까지의 원래 글자 (형태 기반 예외 판단용)
+    """
+    coda = prev[2]
+
+    # 어절 경계 또는 실질 형태소 앞: 대표음으로 바꾼 뒤 연음 (제15항)
+    if cur[0] == "ㅇ" and coda not in ("", "ㅇ") and (word_boundary or tail[:1] in _INDEPENDENT_VOWEL_SYLLS):
+        if coda != "ㅎ":
+            # 겹받침도 대표음 하나만 넘어감 (닭 앞에 -> 다가페)
+            prev[2], cur[0] = "", NEUTRAL_CODA.get(coda, coda)
+            return
+
+    # 1) 받침 ㅎ (제12항)
+    if coda in ("ㅎ", "ㄶ", "ㅀ"):
+        rest = {"ㅎ": "", "ㄶ": "ㄴ", "ㅀ": "ㄹ"}[coda]
+        if cur[0] in ASPIRATE:
+            cur[0] = ASPIRATE[cur[0]]
+            prev[2] = rest
+        elif cur[0] == "ㅅ":
+            cur[0] = "ㅆ"
+            prev[2] = rest
+        elif cur[0] == "ㄴ":
+            prev[2] = rest or "ㄴ"
+        elif cur[0] == "ㅇ":
+            prev[2] = rest
+        coda = prev[2]
+
+    # 받침 + 초성 ㅎ 격음화
+    if cur[0] == "ㅎ" and coda in CODA_H_ASPIRATION:
+        prev[2], cur[0] = CODA_H_ASPIRATION[coda]
+        # 2) ㄷ+히 -> 치 (굳히다)
+        if cur[0] == "ㅌ" and cur[1] == "ㅣ":
+            cur[0] = "ㅊ"
+        return
+
+    # 2) 구개음화 (제17항)
+    if cur[0] == "ㅇ" and cur[1] == "ㅣ" and coda in ("ㄷ", "ㅌ", "ㄾ"):
+        if coda == "ㄾ":
+            prev[2], cur[0] = "ㄹ", "ㅊ"
+        else:
+            prev[2], cur[0] = "", {"ㄷ": "ㅈ", "ㅌ": "ㅊ"}[coda]
+        return
+
+    # 3) 연음 (제13~14항)
+    if cur[0] == "ㅇ" and coda not in ("", "ㅇ"):
+        if coda in DOUBLE_CODAS:
+            prev[2], cur[0] = DOUBLE_CODAS[coda]
+        else:
+            prev[2], cur[0] = "", coda
+        return
+
+    # 겹받침 용언 어간 (제10~11항 다만, 제24~25항): 밟다 -> 밥따, 넓다 -> 널따, 앉고 -> 안꼬, 읽고 -> 일꼬
+    if not word_boundary and compose(*prev) not in _DOUBLE_CODA_NOUNS:
+        if coda == "ㄼ" and prev[:2] == ["ㅂ", "ㅏ"]:
+            coda = prev[2] = "ㅂ"  # 밟-만 ㅂ으로 (아래 경음화/비음화: 밟다 -> 밥따, 밟는 -> 밤는)
+        elif coda == "ㄺ" and cur[0] == "ㄱ":
+            prev[2], cur[0] = "ㄹ", "ㄲ"
+            return
+        elif coda in STEM_TENSE_CODAS and cur[0] in ("ㄱ", "ㄷ", "ㅅ", "ㅈ"):
+            prev[2], cur[0] = NEUTRAL_CODA[coda], TENSE[cur[0]]
+            return
+
+    # 4) 대표음
+    coda = prev[2] = NEUTRAL_CODA.get(coda, coda)
+
+    # 5) 경음화 (제23항, 제26~27항)
+    if coda in ("ㄱ", "ㄷ", "ㅂ") and cur[0] in TENSE:
+        cur[0] = TENSE[cur[0]]
+        return
+    if coda == "ㄹ" and not word_boundary and cur[0] in TENSE:
+        if tail in _RIEUL_ENDINGS or (cur[0] in ("ㄷ", "ㅅ", "ㅈ") and tail not in _NON_SINO_TAILS):
+            cur[0] = TENSE[cur[0]]
+            return
+
+    # 6) 비음화 (제18~19항)
+    if cur[0] == "ㄹ" and coda in ("ㅁ", "ㅇ", "ㄱ", "ㄷ", "ㅂ"):
+        cur[0] = "ㄴ"
+    if coda in NASAL and cur[0] in ("ㄴ", "ㅁ"):
+        prev[2] = NASAL[coda]
+        return
+
+    # 7) 유음화 (제20항)
+    if (coda, cur[0]) in (("ㄴ", "ㄹ"), ("ㄹ", "ㄴ")):
+        prev[2], cur[0] = "ㄹ", "ㄹ"
+
+
+# 한자어 접미사 경음화: 중요성 -> 중요썽, 장점 -> 장쩜 (완성, 상점처럼 두 음절 단어의 '성'은 제외)
+_SUFFIX_TENSE = {"성": 3, "점": 2}
+
+
+def pronounce_phrase(words: List[str]) -> List[List[List[str]]]:
+    """어절 목록 -> 어절별 발음 음절 자모 [[[초성, 중성, 종성], ...], ...]. 규칙은 어절 경계를 넘어서도 적용"""
+    flat: List[Tuple[int, int, List[str]]] = []
+    for w_idx, word in enumerate(words):
+        for s_idx, ch in enumerate(word):
+            flat.append((w_idx, s_idx, decompose(ch)))
+        min_len = _SUFFIX_TENSE.get(word[-1])
+        if min_len and len(word) >= min_len and flat[-1][2][0] in TENSE:
+            flat[-1][2][0] = TENSE[flat[-1][2][0]]
+
+    for k in range(1, len(flat)):
+        w_prev, _, prev = flat[k - 1]
+        w_cur, s_cur, cur = flat[k]
+        _apply_boundary(prev, cur, word_boundary=w_prev != w_cur, tail=words[w_cur][s_cur:])
+
+    out: List[List[List[str]]] = [[] for _ in words]
+    for w_idx, _, s in flat:
+        s[2] = NEUTRAL_CODA.get(s[2], s[2])
+        # 8) 자음 뒤 ㅢ -> ㅣ (제5항)
+        if s[1] == "ㅢ" and s[0] != "ㅇ":
+            s[1] = "ㅣ"
+        out[w_idx].append(s)
+    return out
+
+
+def pronounce_word(word: str) -> List[List[str]]:
+    """한글 어절 -> 발음 음절 자모 목록 [[초성, 중성, 종성], ...]"""
+    return pronounce_phrase([word])[0] if word else []
+
+
+def _syllable_phones(onset: str, vowel: str, coda: str) -> List[str]:
+    phones = [ONSET_PHONES[onset], VOWEL_PHONES[vowel], CODA_PHONES.get(coda, "")]
+    return [p for p in phones if p]
+
+
+def words_of(text: str) -> List[str]:
+    """G2P 대상 어절 (한글만 남김, 문장부호/공백 제거)"""
+    text = unicodedata.normalize("NFC", text or "")
+    return _HANGUL_RE.findall(text)
+
+
+@lru_cache(maxsize=4096)
+def g2p(text: str) -> Dict[str, Any]:
+    """
+    {"words": [{"text": 어절, "pron": 발음, "sylls": [{"ltr": 글자, "pron": 발음 글자, "phones": [...]}]}],
+     "syll ltrs": ..., "syll phns": ...}
+    """
+    words = []
+    tokens = words_of(text)
+    for word, pron in zip(tokens, pronounce_phrase(tokens)):
+        words.append({
+            "text": word,
+            "pron": "".join(compose(*s) for s in pron),
+            "sylls": [
+                {"ltr": ltr, "pron": compose(*s), "phones": _syllable_phones(*s)}
+                for ltr, s in zip(word, pron)
+            ],
+        })
+    return {
+        "words": words,
+        "syll ltrs": WORD_SEP.join(SYLL_SEP.join(s["ltr"] for s in w["sylls"]) for w in words),
+        "syll phns": WORD_SEP.join(
+            SYLL_SEP.join(PHONE_SEP.join(s["phones"]) for s in w["sylls"]) for w in words
+        ),
+    }
+
+
+def pronounce(text: str) -> str:
+    """'감사합니다' -> '감사함니다'"""
+    return " ".join(w["pron"] for w in g2p(text)["words"])
+
+
+def engine_fields(text: str) -> Tuple[str, str]:
+    """엔진 /model 요청용 (syll ltrs, syll phns)"""
+    result = g2p(text)
+    return result["syll ltrs"], result["syll phns"]
+
+
+# ----------------------------------------------------------------------
+# 엔진 응답 코퍼스 기록 / 검증
+# ----------------------------------------------------------------------
+def iter_vocabulary() -> Iterator[Dict[str, str]]:
+    """어휘표의 단어/예문 텍스트. {"text", "pron"(단어만, 어휘표 발음 컬럼)}"""
+    import pandas as pd
+
+    xls = pd.ExcelFile(settings.VOCAB_XLSX, engine="openpyxl")
+    seen = set()
+    for sheet in xls.sheet_names:
+        df = pd.read_excel(xls, sheet_name=sheet)
+        for row in df.to_dict(orient="records"):
+            word = str(row.get("단어") or "").strip()
+            pron = str(row.get("발음") or "").strip()
+            candidates = [(word, pron)] + [
+                (str(row.get(k) or "").strip(), "") for k in ("예문1", "예문2", "예문3")
+            ]
+            for text, p in candidates:
+                if text and text != "nan" and text not in seen:
+                    seen.add(text)
+                    yield {"text": text, "pron": p if p != "nan" else ""}
+
+
+def _load_corpus(path: Path) -> Dict[str, Dict[str, Any]]:
+    corpus: Dict[str, Dict[str, Any]] = {}
+    if path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    corpus[entry["text"]] = entry
+    return corpus
+
+
+def record_corpus(path: Optional[Path] = None, limit: Optional[int] = None) -> int:
+    """엔진 /gtp 응답을 JSONL로 기록. 이미 기록된 문장은 건너뛰므로 중단 후 재실행 가능"""
+    from app.speechpro_client import ENGINE_URL, _engine_error_code, _get_any, _make_session, normalize_spaces
+
+    path = path or settings.G2P_CORPUS_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    done = _load_corpus(path)
+    s = _make_session()
+    added = 0
+    try:
+        with path.open("a", encoding="utf-8") as out:
+            for item in iter_vocabulary():
+                text = normalize_spaces(item["text"])
+                if text in done:
+                    continue
+                if limit is not None and added >= limit:
+                    break
+                r = s.post(f"{ENGINE_URL}/gtp", json={"id": f"g2p_{added}", "text": text}, timeout=(5, 30))
+                r.raise_for_status()
+                gtp = r.json()
+                if _engine_error_code(gtp) != 0:
+                    print(f"[G2P] 엔진 오류 {text!r}: {gtp}")
+                    continue
+                entry = {
+                    "text": text,
+                    "syll ltrs": _get_any(gtp, "syll ltrs", "syll_ltrs"),
+                    "syll phns": _get_any(gtp, "syll phns", "syll_phns"),
+                }
+                out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                out.flush()
+                done[text] = entry
+                added += 1
+    finally:
+        s.close()
+    return added
+
+
+def _squash(text: str) -> str:
+    return "".join(words_of(text))
+
+
+def validate(path: Optional[Path] = None, show: int = 20) -> Dict[str, Any]:
+    """
+    - engine: 기록된 엔진 응답과 syll ltrs / syll phns 완전 일치율
+    - lexicon: 어휘표 '발음' 컬럼(단어)과 발음 일치율
+      (발음 컬럼은 받침을 철자대로 적은 경우가 많아 컬럼 값도 G2P를 한 번 거쳐 비교)
+    """
+    path = path or settings.G2P_CORPUS_PATH
+    report: Dict[str, Any] = {}
+
+    corpus = _load_corpus(path)
+    if corpus:
+        mismatches = []
+        for text, entry in corpus.items():
+            ltrs, phns = engine_fields(text)
+            if (ltrs, phns) != (entry.get("syll ltrs"), entry.get("syll phns")):
+                mismatches.append({"text": text, "engine": [entry.get("syll ltrs"), entry.get("syll phns")],
+                                   "local": [ltrs, phns]})
+        report["engine"] = {
+            "total": len(corpus),
+            "match": len(corpus) - len(mismatches),
+            "rate": round(1 - len(mismatches) / len(corpus), 4),
+            "mismatches": mismatches[:show],
+        }
+
+    try:
+        words = [v for v in iter_vocabulary() if v["pron"]]
+    except Exception as e:
+        print(f"[G2P] 어휘표 로드 실패: {e}")
+        words = []
+    if words:
+        mismatches = [
+            {"text": v["text"], "expected": v["pron"], "local": pronounce(v["text"])}
+            for v in words
+            if _squash(pronounce(v["text"])) != _squash(pronounce(v["pron"]))
+        ]
+        report["lexicon"] = {
+            "total": len(words),
+            "match": len(words) - len(mismatches),
+            "rate": round(1 - len(mismatches) / len(words), 4),
+            "mismatches": mismatches[:show],
+        }
+    return report
+
+
+# ----------------------------------------------------------------------
+# 로컬 G2P 사용 승인 (코퍼스 검증 통과 기록)
+# ----------------------------------------------------------------------
+_ready_cache: Dict[str, Any] = {"key": None, "ready": False}
+
+
+def validation_path(corpus: Optional[Path] = None) -> Path:
+    corpus = corpus or settings.G2P_CORPUS_PATH
+    return corpus.with_name(corpus.name + ".validated.json")
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _rules_fingerprint() -> str:
+    """규칙/기호표(이 파일)가 바뀌면 검증을 다시 하도록"""
+    return _sha256(Path(__file__))
+
+
+def write_validation(corpus: Path, report: Dict[str, Any]) -> Path:
+    path = validation_path(corpus)
+    stamp = {
+        "rate": report["engine"]["rate"],
+        "total": report["engine"]["total"],
+        "corpus_sha256": _sha256(corpus),
+        "rules_sha256": _rules_fingerprint(),
+    }
+    path.write_text(json.dumps(stamp, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def local_ready() -> bool:
+    """코퍼스 검증을 통과했고 그 뒤로 코퍼스/규칙이 바뀌지 않았으면 True"""
+    corpus, stamp_path = settings.G2P_CORPUS_PATH, validation_path()
+    try:
+        key = (corpus.stat().st_mtime_ns, stamp_path.stat().st_mtime_ns, settings.G2P_LOCAL_MIN_RATE)
+    except OSError:
+        return False
+    if _ready_cache["key"] != key:
+        try:
+            stamp = json.loads(stamp_path.read_text(encoding="utf-8"))
+            ready = (
+                stamp.get("rate", 0) >= settings.G2P_LOCAL_MIN_RATE
+                and stamp.get("corpus_sha256") == _sha256(corpus)
+                and stamp.get("rules_sha256") == _rules_fingerprint()
+            )
+        except (OSError, ValueError):
+            ready = False
+        _ready_cache.update(key=key, ready=ready)
+    return _ready_cache["ready"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="로컬 한국어 G2P 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_rec = sub.add_parser("record", help="엔진 /gtp 응답 코퍼스 기록")
+    p_rec.add_argument("--corpus", type=Path, default=None)
+    p_rec.add_argument("--limit", type=int, default=None)
+    p_val = sub.add_parser("validate", help="코퍼스/어휘표 대비 검증")
+    p_val.add_argument("--corpus", type=Path, default=None)
+    p_val.add_argument("--show", type=int, default=20)
+    p_val.add_argument("--min-rate", type=float, default=settings.G2P_LOCAL_MIN_RATE,
+                       help="엔진 일치율이 이 이상이면 검증 기록을 남겨 로컬 G2P 사용 허용, 낮으면 종료 코드 1")
+    p_txt = sub.add_parser("show", help="문장 하나의 G2P 결과 출력")
+    p_txt.add_argument("text")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        n = record_corpus(args.corpus, args.limit)
+        print(f"[G2P] {n}개 문장 기록 -> {args.corpus or settings.G2P_CORPUS_PATH}")
+    elif args.command == "validate":
+        corpus = args.corpus or settings.G2P_CORPUS_PATH
+        report = validate(corpus, args.show)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        engine_rate = report.get("engine", {}).get("rate")
+        if engine_rate is None or engine_rate < args.min_rate:
+            validation_path(corpus).unlink(missing_ok=True)
+            print(f"[G2P] 검증 실패 (코퍼스 일치율 {engine_rate}, 기준 {args.min_rate}): 로컬 G2P를 쓰지 않습니다")
+            sys.exit(1)
+        print(f"[G2P] 검증 통과 -> {write_validation(corpus, report)} (G2P_MODE=local 이면 로컬 G2P 사용)")
+    elif args.command == "show":
+        print(json.dumps(g2p(args.text), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
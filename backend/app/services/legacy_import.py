@@ -0,0 +1,270 @@
+# backend/app/services/legacy_import.py
+"""
+예전 JSON 저장소(data/users.json, history.json, notices.json) -> DB 일괄 가져오기.
+
+파일을 json.load로 통째로 올리지 않고 app/legacy/json_stream.py로 한 항목씩 읽어
+batch개씩 한 트랜잭션으로 저장하므로, 수백 MB 파일도 메모리는 묶음 하나 크기만큼만 씁니다.
+  - users.json   -> User (+ progress는 app/services/user_progress.py 테이블, 학생 요약)
+    예전 앱은 사용자 변경(가입/승인/프로필)을 users.json.journal에 먼저 쌓고 1MB마다 스냅샷에 합치므로,
+    가져오기 전에 저장소 잠금을 잡고 저널을 users.json에 합친 뒤(JournaledStore.compacted) 다 읽을 때까지
+    잠금을 유지합니다. 그동안 예전 앱의 사용자 쓰기는 대기합니다.
+  - history.json -> QuizResult ({uid: [퀴즈 결과, ...]})
+  - notices.json -> Notice (+ read_by는 NoticeRead)
+
+여러 번 실행해도 안전합니다 (중단 후 재실행, 예전 앱이 파일에 더 쓴 뒤 다시 가져오기).
+  - 사용자: DB에 이미 있는 uid는 그대로 두고, 학습 상태 행이 하나도 없을 때만 progress를 채움
+  - 공지/퀴즈 기록: LegacyImportKey(source, 공지 UUID / "<uid>#<순번>")에 있는 항목은 건너뜀
+    (같은 트랜잭션에서 기록하므로 묶음 단위로 모두 들어가거나 모두 빠짐)
+
+실행 (backend 폴더에서):
+    python -m app.services.legacy_import [--data-dir ../data] [--only users,history,notices] [--batch 1000]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from app.core.storage import dialect_insert
+from app.legacy.journal_store import JournaledStore
+from app.legacy.json_stream import JsonStream
+from app.models import (
+    LegacyImportKey, Notice, NoticeRead, QuizResult, User,
+    UserLearnedWord, UserSetting, UserState, UserTopicStat, UserWrongNote,
+)
+from app.services import student_summary, user_progress
+
+SOURCES = ("users", "history", "notices")  # users를 먼저 (history/notices가 uid를 참조)
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _stream(path: Path, walk: Callable[[JsonStream], Iterator[Any]]) -> Iterator[Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        yield from walk(JsonStream(f))
+
+
+# ----------------------------------------------------------------------
+# users.json: {uid: {pw, name, role, ..., progress}}
+# ----------------------------------------------------------------------
+def _walk_users(stream: JsonStream) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for uid in stream.items():
+        u = stream.value()
+        if isinstance(u, dict):
+            yield uid, u
+
+
+def _has_progress(session: Session, uids: List[str]) -> set:
+    conn = session.connection()
+    found = set()
+    for model in (UserSetting, UserState, UserTopicStat, UserLearnedWord, UserWrongNote):
+        found.update(conn.execute(select(model.user_id).where(model.user_id.in_(uids)).distinct()).scalars())
+    return found
+
+
+def import_users(session: Session, batch: List[Tuple[str, Dict[str, Any]]]) -> int:
+    """묶음 하나 저장 (commit은 호출한 쪽에서). 새로 만든 사용자 수를 반환"""
+    conn = session.connection()
+    uids = [uid for uid, _ in batch]
+    existing = set(conn.execute(select(User.uid).where(User.uid.in_(uids))).scalars())
+    rows = [
+        {
+            "uid": uid,
+            "name": u.get("name") or "체험 사용자",
+            "pw": u.get("pw") or u.get("pw_hash") or "",
+            "role": u.get("role") or "student",
+            "email": u.get("email"),
+            "phone": u.get("phone"),
+            "country": u.get("country") or "KR",
+            "teacher_id": u.get("teacher_id"),
+            # 예전 저장소와 같은 기본값: 선생님만 승인 대기
+            "is_approved": u.get("is_approved", (u.get("role") or "student") != "teacher"),
+            "created_at": _parse_time(u.get("created_at")) or datetime.now(),
+            "progress": {},
+        }
+        for uid, u in batch if uid not in existing
+    ]
+    if rows:
+        conn.execute(insert(User), rows)
+
+    filled = _has_progress(session, uids)
+    for uid, u in batch:
+        if uid not in filled and u.get("progress"):
+            user_progress.import_progress(session, uid, u["progress"])
+    student_summary.refresh(conn, [row["uid"] for row in rows if row["role"] == "student"])
+    return len(rows)
+
+
+# ----------------------------------------------------------------------
+# 공지/퀴즈 기록: LegacyImportKey로 이미 가져온 항목 거르기
+# ----------------------------------------------------------------------
+def _new_keys(session: Session, source: str, keys: List[str]) -> set:
+    done = set(session.connection().execute(
+        select(LegacyImportKey.key).where(LegacyImportKey.source == source, LegacyImportKey.key.in_(keys))
+    ).scalars())
+    return set(keys) - done
+
+
+def _insert_with_keys(session: Session, source: str, model, keyed_rows: List[Tuple[str, Dict[str, Any]]]) -> List[int]:
+    """행을 넣고 (source, key) -> 새 id 기록. 새 id 목록을 반환"""
+    if not keyed_rows:
+        return []
+    conn = session.connection()
+    ids = conn.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=True),
+        [row for _, row in keyed_rows],
+    ).scalars().all()
+    conn.execute(insert(LegacyImportKey), [
+        {"source": source, "key": key, "target_id": new_id} for (key, _), new_id in zip(keyed_rows, ids)
+    ])
+    return ids
+
+
+# ----------------------------------------------------------------------
+# history.json: {uid: [{date, name, level, score, total, wrong_words}, ...]}
+# ----------------------------------------------------------------------
+def _walk_history(stream: JsonStream) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    # 사용자 한 명의 기록이 길어도 한 건씩 읽음
+    for uid in stream.items():
+        if stream.peek() != "[":
+            stream.value()
+            continue
+        for index in stream.elements():
+            entry = stream.value()
+            if isinstance(entry, dict):
+                yield f"{uid}#{index}", {"uid": uid, **entry}
+
+
+def import_history(session: Session, batch: List[Tuple[str, Dict[str, Any]]]) -> int:
+    new = _new_keys(session, "history", [key for key, _ in batch])
+    rows = [
+        (key, {
+            "user_id": e["uid"],
+            "name": str(e.get("name") or ""),
+            "level": str(e.get("level") or ""),
+            "score": int(e.get("score") or 0),
+            "total": int(e.get("total") or 0),
+            "wrong_words": [str(w) for w in (e.get("wrong_words") or [])],
+            "taken_at": _parse_time(e.get("date")) or datetime.now(),
+        })
+        for key, e in batch if key in new
+    ]
+    return len(_insert_with_keys(session, "history", QuizResult, rows))
+
+
+# ----------------------------------------------------------------------
+# notices.json: [{id(UUID), title, content, author, created_at, scheduled_at, read_by}, ...]
+# ----------------------------------------------------------------------
+def _walk_notices(stream: JsonStream) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for index in stream.elements():
+        n = stream.value()
+        if isinstance(n, dict):
+            yield str(n.get("id") or f"#{index}"), n
+
+
+def import_notices(session: Session, batch: List[Tuple[str, Dict[str, Any]]]) -> int:
+    new = _new_keys(session, "notices", [key for key, _ in batch])
+    todo = [(key, n) for key, n in dict(batch).items() if key in new]  # 파일 안 중복 UUID는 첫 항목 자리에 한 번만
+    ids = _insert_with_keys(session, "notices", Notice, [
+        (key, {
+            "title": str(n.get("title") or ""),
+            "content": str(n.get("content") or ""),
+            "author": str(n.get("author") or ""),
+            # 예전 공지는 작성한 선생님 반 전체 대상
+            "teacher_id": str(n.get("teacher_id") or n.get("author") or ""),
+            "created_at": _parse_time(n.get("created_at")) or datetime.now(),
+            "scheduled_at": _parse_time(n.get("scheduled_at")),
+        })
+        for key, n in todo
+    ])
+    reads = [
+        {"notice_id": notice_id, "user_id": str(uid), "read_at": None}
+        for (_, n), notice_id in zip(todo, ids)
+        for uid in dict.fromkeys(n.get("read_by") or [])
+    ]
+    if reads:
+        conn = session.connection()
+        conn.execute(dialect_insert(conn)(NoticeRead).on_conflict_do_nothing(), reads)
+    return len(ids)
+
+
+IMPORTERS: Dict[str, Tuple[str, Callable[[JsonStream], Iterator[Any]], Callable[[Session, List[Any]], int]]] = {
+    "users": ("users.json", _walk_users, import_users),
+    "history": ("history.json", _walk_history, import_history),
+    "notices": ("notices.json", _walk_notices, import_notices),
+}
+
+
+def run(engine: Engine, data_dir: Path, only: Iterable[str] = SOURCES, batch_size: int = 1000) -> Dict[str, Dict[str, int]]:
+    """소스별로 묶음마다 한 트랜잭션. {source: {"read": 읽은 항목 수, "imported": 새로 넣은 수}}"""
+    report = {}
+    for source in SOURCES:
+        if source not in only:
+            continue
+        filename, walk, importer = IMPORTERS[source]
+        path = Path(data_dir) / filename
+        if not path.exists():
+            print(f"[LegacyImport] {path} 없음, 건너뜀")
+            continue
+        started = time.time()
+        read = imported = 0
+        # users.json은 저널에만 있는 최근 변경까지 합친 스냅샷을 잠금 안에서 읽음
+        frozen = JournaledStore(path).compacted() if source == "users" else contextlib.nullcontext()
+        with frozen:
+            for batch in _batches(_stream(path, walk), batch_size):
+                with Session(engine) as session:
+                    imported += importer(session, batch)
+                    session.commit()
+                read += len(batch)
+        report[source] = {"read": read, "imported": imported}
+        print(f"[LegacyImport] {filename}: {read}건 읽음, {imported}건 추가 ({time.time() - started:.1f}s)")
+    return report
+
+
+def main() -> None:
+    from sqlmodel import SQLModel
+    import app.models  # noqa: F401  (테이블 등록)
+    from app.core.config import settings
+    from app.core.database import engine
+
+    parser = argparse.ArgumentParser(description="예전 JSON 저장소를 DB로 가져오기")
+    parser.add_argument("--data-dir", type=Path, default=settings.DATA_DIR)
+    parser.add_argument("--only", default=",".join(SOURCES), help="쉼표로 구분: " + ",".join(SOURCES))
+    parser.add_argument("--batch", type=int, default=1000, help="한 트랜잭션에 저장할 항목 수")
+    args = parser.parse_args()
+
+    only = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = set(only) - set(SOURCES)
+    if unknown:
+        parser.error(f"알 수 없는 소스: {', '.join(sorted(unknown))}")
+    SQLModel.metadata.create_all(engine)
+    run(engine, args.data_dir, only, max(1, args.batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+# backend/app/services/log_archive.py
+"""
+오래된 StudyLog 월별 보관 (압축 열 단위 파일 + manifest).
+
+StudyLog는 계속 늘어나기만 하므로 LOG_RETENTION_DAYS보다 오래된 '끝난 달'의 행을
+LOG_ARCHIVE_DIR/studylog-YYYY-MM.npz 로 옮기고 DB에서 지웁니다.
+  - 파일: numpy savez_compressed (pickle 없음). 열마다 배열 하나
+      id(int64), score(float64), created_at(int64, 1970-01-01부터 마이크로초),
+      user_id / word / feedback: 사전 인코딩 (<열>.values 고유 문자열 + <열>.codes int32)
+    id 순으로 정렬되어 있어 get_log()는 이진 탐색 한 번입니다.
+  - manifest.json: 달마다 파일 이름, 행 수, id/시각 범위, 크기, sha256 (원자적으로 교체)
+  - 집계/숙련도/복습 카드(rollups, mastery, review_scheduler)는 그대로 두며 계속 기준 데이터입니다.
+  - 과거 기록이 필요한 곳(집계 재계산, 녹음 재생의 로그 조회)은 iter_logs()/get_log()로
+    보관 파일과 DB를 함께 읽습니다.
+
+보관 순서: 파일 쓰기 -> manifest 갱신(pending) -> DB에서 묶음 단위 삭제 -> pending 해제.
+중간에 멈춰도 다음 실행이 이어서 지우고(같은 달을 다시 보관하면 id 기준으로 합침),
+그 사이 iter_logs()는 pending 달의 id를 DB 쪽에서 걸러 중복해서 읽지 않습니다.
+
+서버 lifespan에서 run_forever()로 LOG_ARCHIVE_INTERVAL마다 실행 (LOG_RETENTION_DAYS=0 이면 끔).
+CLI (backend 폴더에서):
+    python -m app.services.log_archive archive [--before 2025-01]
+    python -m app.services.log_archive list
+    python -m app.services.log_archive verify
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterator, List, Optional
+
+import numpy as np
+from sqlalchemy import delete, func
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models import StudyLog
+
+FORMAT = "studylog-npz-v1"
+MANIFEST = "manifest.json"
+STRING_COLUMNS = ("user_id", "word", "feedback")
+COLUMNS = ("id", "user_id", "word", "score", "feedback", "created_at")
+
+_EPOCH = datetime(1970, 1, 1)
+_lock = threading.Lock()  # 같은 프로세스 안에서 보관 작업은 한 번에 하나
+
+
+def _to_us(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_us(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# manifest / 파티션 파일
+# ----------------------------------------------------------------------
+def archive_dir() -> Path:
+    return Path(settings.LOG_ARCHIVE_DIR)
+
+
+def load_manifest(directory: Optional[Path] = None) -> Dict[str, Any]:
+    path = (directory or archive_dir()) / MANIFEST
+    if not path.exists():
+        return {"format": FORMAT, "partitions": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(directory: Path, manifest: Dict[str, Any]) -> None:
+    path = directory / MANIFEST
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _write_partition(path: Path, rows: Dict[str, list]) -> None:
+    """열 목록(id 순) -> 압축 파일 (임시 파일에 쓴 뒤 교체)"""
+    arrays: Dict[str, np.ndarray] = {
+        "id": np.asarray(rows["id"], dtype=np.int64),
+        "score": np.asarray(rows["score"], dtype=np.float64),
+        "created_at": np.asarray([_to_us(v) for v in rows["created_at"]], dtype=np.int64),
+    }
+    for name in STRING_COLUMNS:
+        values, codes = np.unique(np.asarray([v or "" for v in rows[name]], dtype=str), return_inverse=True)
+        arrays[f"{name}.values"] = values
+        arrays[f"{name}.codes"] = codes.astype(np.int32)
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_partition(path: Path) -> Dict[str, np.ndarray]:
+    """파티션 파일 -> {열: 배열} (문자열 열은 디코딩, created_at은 마이크로초 그대로)"""
+    with np.load(path, allow_pickle=False) as data:
+        cols = {name: data[name] for name in ("id", "score", "created_at")}
+        for name in STRING_COLUMNS:
+            cols[name] = data[f"{name}.values"][data[f"{name}.codes"]]
+    return cols
+
+
+def _row(cols: Dict[str, np.ndarray], i: int) -> Dict[str, Any]:
+    return {
+        "id": int(cols["id"][i]),
+        "user_id": str(cols["user_id"][i]),
+        "word": str(cols["word"][i]),
+        "score": float(cols["score"][i]),
+        "feedback": str(cols["feedback"][i]),
+        "created_at": _from_us(cols["created_at"][i]),
+    }
+
+
+# ----------------------------------------------------------------------
+# 보관
+# ----------------------------------------------------------------------
+def archive_month(engine: Engine, month: datetime, directory: Optional[Path] = None, chunk: int = 1000) -> int:
+    """month가 속한 달의 StudyLog를 파일로 옮기고 DB에서 지움. 옮긴 행 수를 반환"""
+    directory = directory or archive_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    start = _month_start(month)
+    end = _next_month(start)
+    key = start.strftime("%Y-%m")
+
+    with Session(engine) as session:
+        fresh = session.connection().execute(
+            select(*(getattr(StudyLog, c) for c in COLUMNS))
+            .where(StudyLog.created_at >= start, StudyLog.created_at < end)
+            .order_by(StudyLog.id)
+        ).all()
+    manifest = load_manifest(directory)
+    entry = manifest["partitions"].get(key)
+    if not fresh and not (entry and entry.get("pending")):
+        return 0
+
+    # 이미 보관한 달이면 기존 파일과 id 기준으로 합침 (중단 후 재실행, 보관 뒤 늦게 들어온 행)
+    merged: Dict[int, Dict[str, Any]] = {}
+    path = directory / f"studylog-{key}.npz"
+    if entry and path.exists():
+        cols = read_partition(path)
+        for i in range(len(cols["id"])):
+            merged[int(cols["id"][i])] = _row(cols, i)
+    for r in fresh:
+        merged[r.id] = dict(r._mapping)
+    ids = sorted(merged)
+    _write_partition(path, {c: [merged[i][c] for i in ids] for c in COLUMNS})
+
+    times = [merged[i]["created_at"] for i in ids]
+    manifest["partitions"][key] = {
+        "file": path.name,
+        "rows": len(ids),
+        "min_id": ids[0],
+        "max_id": ids[-1],
+        "min_at": min(times).isoformat(),
+        "max_at": max(times).isoformat(),
+        "bytes": path.stat().st_size,
+        "sha256": _sha256(path),
+        "archived_at": datetime.now().isoformat(timespec="seconds"),
+        "pending": True,
+    }
+    manifest["format"] = FORMAT
+    _save_manifest(directory, manifest)
+
+    # 파일/manifest가 확정된 뒤에만 DB에서 지움 (묶음마다 commit해 쓰기 잠금을 짧게)
+    for i in range(0, len(ids), chunk):
+        with Session(engine) as session:
+            session.connection().execute(delete(StudyLog).where(StudyLog.id.in_(ids[i:i + chunk])))
+            session.commit()
+    manifest["partitions"][key]["pending"] = False
+    _save_manifest(directory, manifest)
+    _read_cached.cache_clear()
+
+    metrics.inc("studylog_archived_rows_total", len(fresh))
+    return len(fresh)
+
+
+def archive(
+    engine: Engine, before: Optional[datetime] = None, directory: Optional[Path] = None,
+) -> Dict[str, int]:
+    """before(기본: 지금 - LOG_RETENTION_DAYS)가 속한 달 이전의 끝난 달을 모두 보관. {달: 옮긴 행 수}"""
+    directory = directory or archive_dir()
+    if before is None:
+        before = datetime.now() - timedelta(days=settings.LOG_RETENTION_DAYS)
+    cutoff = _month_start(before)
+
+    with _lock:
+        months = {
+            datetime.strptime(key, "%Y-%m")
+            for key, entry in load_manifest(directory)["partitions"].items() if entry.get("pending")
+        }
+        with Session(engine) as session:
+            oldest = session.connection().execute(
+                select(func.min(StudyLog.created_at)).where(StudyLog.created_at < cutoff)
+            ).scalar()
+        if oldest is not None:
+            month = _month_start(oldest)
+            while month < cutoff:
+                months.add(month)
+                month = _next_month(month)
+
+        report = {}
+        for month in sorted(months):
+            n = archive_month(engine, month, directory)
+            if n:
+                report[month.strftime("%Y-%m")] = n
+        return report
+
+
+# ----------------------------------------------------------------------
+# 조회 (보관 파일 + DB)
+# ----------------------------------------------------------------------
+class _PartitionCache:
+    """최근에 읽은 파티션 몇 개 (get_log가 같은 달을 반복해서 열지 않도록)"""
+
+    def __init__(self, size: int = 2):
+        self.size = size
+        self._items: Dict[tuple, Dict[str, np.ndarray]] = {}
+        self._mutex = threading.Lock()
+
+    def __call__(self, path: Path, sha256: str) -> Dict[str, np.ndarray]:
+        key = (str(path), sha256)
+        with self._mutex:
+            if key in self._items:
+                self._items[key] = self._items.pop(key)
+                return self._items[key]
+        cols = read_partition(path)
+        with self._mutex:
+            self._items[key] = cols
+            while len(self._items) > self.size:
+                self._items.pop(next(iter(self._items)))
+        return cols
+
+    def cache_clear(self) -> None:
+        with self._mutex:
+            self._items.clear()
+
+
+_read_cached = _PartitionCache()
+
+
+def _overlaps(entry: Dict[str, Any], start: Optional[datetime], end: Optional[datetime]) -> bool:
+    if start is not None and datetime.fromisoformat(entry["max_at"]) < start:
+        return False
+    if end is not None and datetime.fromisoformat(entry["min_at"]) >= end:
+        return False
+    return True
+
+
+def iter_logs(
+    session: Session,
+    user_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    chunk: int = 5000,
+    directory: Optional[Path] = None,
+    user_ids: Optional[Collection[str]] = None,
+    words: Optional[Collection[str]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    StudyLog 행 dict(id, user_id, word, score, feedback, created_at)를 chunk개씩 id 순으로.
+    보관 파일(기간이 겹치는 달만, 한 번에 한 달씩) 다음에 DB (yield_per 서버 측 커서).
+    start 이상 end 미만, user_id / user_ids / words가 있으면 그 사용자/단어만.
+    """
+    directory = directory or archive_dir()
+    user_ids = None if user_ids is None else list(user_ids)
+    words = None if words is None else list(words)
+    pending_ids: set = set()
+    for key, entry in sorted(load_manifest(directory)["partitions"].items()):
+        if not _overlaps(entry, start, end):
+            continue
+        cols = read_partition(directory / entry["file"])
+        mask = np.ones(len(cols["id"]), dtype=bool)
+        if user_id is not None:
+            mask &= cols["user_id"] == user_id
+        if user_ids is not None:
+            mask &= np.isin(cols["user_id"], np.asarray(user_ids, dtype=str))
+        if words is not None:
+            mask &= np.isin(cols["word"], np.asarray(words, dtype=str))
+        if start is not None:
+            mask &= cols["created_at"] >= _to_us(start)
+        if end is not None:
+            mask &= cols["created_at"] < _to_us(end)
+        if entry.get("pending"):
+            pending_ids.update(int(i) for i in cols["id"])
+        index = np.flatnonzero(mask)
+        for i in range(0, len(index), chunk):
+            yield [_row(cols, j) for j in index[i:i + chunk]]
+
+    query = select(*(getattr(StudyLog, c) for c in COLUMNS)).order_by(StudyLog.id)
+    if user_id is not None:
+        query = query.where(StudyLog.user_id == user_id)
+    if user_ids is not None:
+        query = query.where(StudyLog.user_id.in_(user_ids))
+    if words is not None:
+        query = query.where(StudyLog.word.in_(words))
+    if start is not None:
+        query = query.where(StudyLog.created_at >= start)
+    if end is not None:
+        query = query.where(StudyLog.created_at < end)
+    for part in session.connection().execution_options(yield_per=chunk).execute(query).partitions():
+        rows = [dict(row._mapping) for row in part if row.id not in pending_ids]
+        if rows:
+            yield rows
+
+
+def get_log(log_id: int, directory: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """보관된 StudyLog 한 행 (manifest의 id 범위로 파티션을 고른 뒤 이진 탐색). 없으면 None"""
+    directory = directory or archive_dir()
+    for entry in load_manifest(directory)["partitions"].values():
+        if entry["min_id"] <= log_id <= entry["max_id"]:
+            cols = _read_cached(directory / entry["file"], entry["sha256"])
+            i = int(np.searchsorted(cols["id"], log_id))
+            if i < len(cols["id"]) and cols["id"][i] == log_id:
+                return _row(cols, i)
+    return None
+
+
+def verify(directory: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """manifest와 파일(크기/sha256/행 수/id 범위)이 맞는지 확인"""
+    directory = directory or archive_dir()
+    results = []
+    for key, entry in sorted(load_manifest(directory)["partitions"].items()):
+        path = directory / entry["file"]
+        problems = []
+        if not path.exists():
+            problems.append("파일 없음")
+        else:
+            if path.stat().st_size != entry["bytes"] or _sha256(path) != entry["sha256"]:
+                problems.append("체크섬 불일치")
+            cols = read_partition(path)
+            ids = cols["id"]
+            if len(ids) != entry["rows"]:
+                problems.append(f"행 수 {len(ids)} != {entry['rows']}")
+            elif len(ids) and (int(ids[0]) != entry["min_id"] or int(ids[-1]) != entry["max_id"]):
+                problems.append("id 범위 불일치")
+            if len(ids) > 1 and not bool(np.all(ids[1:] > ids[:-1])):
+                problems.append("id 정렬 안 됨")
+        if entry.get("pending"):
+            problems.append("DB 삭제 미완료 (다음 archive 실행 때 이어서 처리)")
+        results.append({"month": key, "rows": entry["rows"], "ok": not problems, "problems": problems})
+    return results
+
+
+async def run_forever(interval: Optional[float] = None) -> None:
+    """서버 lifespan 백그라운드 태스크"""
+    from app.core.database import engine
+
+    interval = settings.LOG_ARCHIVE_INTERVAL if interval is None else interval
+    while True:
+        try:
+            report = await asyncio.to_thread(archive, engine)
+            if report:
+                print(f"[LogArchive] StudyLog 보관: {report}")
+        except Exception as e:
+            print(f"[LogArchive] 보관 실패: {e}")
+        await asyncio.sleep(interval)
+
+
+def main() -> None:
+    from app.core.database import engine
+
+    parser = argparse.ArgumentParser(description="StudyLog 월별 보관")
+    parser.add_argument("command", choices=["archive", "list", "verify"])
+    parser.add_argument("--before", default=None, help="archive: 이 달(YYYY-MM) 이전을 보관 (기본: LOG_RETENTION_DAYS)")
+    args = parser.parse_args()
+
+    if args.command == "archive":
+        if args.before is None and settings.LOG_RETENTION_DAYS <= 0:
+            parser.error("LOG_RETENTION_DAYS가 0입니다. --before YYYY-MM 을 지정하세요")
+        before = datetime.strptime(args.before, "%Y-%m") if args.before else None
+        started = time.time()
+        report = archive(engine, before)
+        total = sum(report.values())
+        print(f"[LogArchive] {len(report)}개월 {total}행 보관 ({time.time() - started:.1f}s)")
+    elif args.command == "list":
+        for key, entry in sorted(load_manifest()["partitions"].items()):
+            print(f"{key}  {entry['rows']:>9}행  {entry['bytes']:>11} bytes  id {entry['min_id']}~{entry['max_id']}"
+                  f"{'  (삭제 미완료)' if entry.get('pending') else ''}")
+    elif args.command == "verify":
+        failed = 0
+        for r in verify():
+            failed += not r["ok"]
+            print(f"{'OK  ' if r['ok'] else 'FAIL'} {r['month']} {r['rows']}행 {'; '.join(r['problems'])}")
+        raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
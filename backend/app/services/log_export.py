@@ -0,0 +1,275 @@
+# backend/app/services/log_export.py
+"""
+학습 로그(StudyLog) 내보내기 (GET /api/teacher/export/logs).
+
+선생님은 담당 학생, 관리자는 전체 학생의 로그를 CSV 또는 Parquet으로 스트리밍합니다.
+  - 읽기: log_archive.iter_logs() (월별 보관 파일 -> DB, DB는 yield_per 서버 측 커서)로 chunk행씩
+  - 쓰기: 묶음마다 바로 인코딩해서 내보내므로 (chunked 전송) 메모리는 행 수와 무관하게 묶음 하나 크기
+  - 필터: 기간(start 이상 end 미만), 레벨(단어장 시트의 단어), 학생
+  - 연결: 전용 export_engine(NullPool)에서 내보내기마다 하나. 읽기 풀을 쓰지 않으므로 긴 내보내기가 일반 조회를 막지 않고,
+    동시 내보내기는 EXPORT_MAX_CONCURRENT개까지 (넘으면 open_batches()가 AdmissionRejected 503)
+Parquet은 pyarrow가 설치된 경우에만 (묶음마다 row group 하나). 없으면 parquet_available()이 False.
+
+CLI (backend 폴더에서):
+    python -m app.services.log_export --out logs.csv [--teacher T] [--student S] [--level 초급1] [--start 2025-01-01] [--end 2025-02-01]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import os
+import threading
+import weakref
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from sqlmodel import Session, select
+
+from app.core.admission import AdmissionRejected
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models import User
+from app.services import log_archive
+
+FORMATS = ("csv", "parquet")
+COLUMNS = ("log_id", "user_id", "name", "word", "level", "score", "feedback", "created_at")
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+_level_cache: Dict[str, Any] = {"key": None, "levels": {}}
+_slots = threading.BoundedSemaphore(max(1, settings.EXPORT_MAX_CONCURRENT))
+
+
+# ----------------------------------------------------------------------
+# 단어장 레벨 (시트 이름 = 레벨)
+# ----------------------------------------------------------------------
+def _normalize(level: str) -> str:
+    return level.replace(" ", "")
+
+
+def level_words() -> Dict[str, List[str]]:
+    """{레벨(시트 이름): [단어, ...]}. 단어장 파일이 바뀌었을 때만 다시 읽음"""
+    path = settings.VOCAB_XLSX
+    try:
+        key = (str(path), os.stat(path).st_mtime_ns)
+    except OSError:
+        return {}
+    if _level_cache["key"] != key:
+        levels = {}
+        with pd.ExcelFile(path, engine="openpyxl") as xls:
+            for sheet in xls.sheet_names:
+                df = pd.read_excel(xls, sheet_name=sheet)
+                if "단어" in df.columns:
+                    levels[sheet] = [str(w).strip() for w in df["단어"].dropna()]
+        _level_cache.update(key=key, levels=levels)
+    return _level_cache["levels"]
+
+
+def words_for_level(level: str) -> Optional[List[str]]:
+    """레벨 이름(공백 무시) -> 단어 목록. 없는 레벨이면 None"""
+    for sheet, words in level_words().items():
+        if _normalize(sheet) == _normalize(level):
+            return words
+    return None
+
+
+def _word_levels() -> Dict[str, str]:
+    """단어 -> 처음 나오는 레벨"""
+    out: Dict[str, str] = {}
+    for sheet, words in level_words().items():
+        for word in words:
+            out.setdefault(word, sheet)
+    return out
+
+
+# ----------------------------------------------------------------------
+# 행 생성
+# ----------------------------------------------------------------------
+def iter_rows(
+    session: Session,
+    user_ids: Optional[List[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    words: Optional[List[str]] = None,
+    chunk: int = 5000,
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """COLUMNS 순서의 튜플 묶음. user_ids가 None이면 전체 사용자"""
+    word_levels = _word_levels()
+    names: Dict[str, str] = {}
+    for rows in log_archive.iter_logs(session, start=start, end=end, chunk=chunk, user_ids=user_ids, words=words):
+        missing = {r["user_id"] for r in rows} - names.keys()
+        if missing:
+            names.update(session.connection().execute(
+                select(User.uid, User.name).where(User.uid.in_(missing))
+            ).all())
+        yield [
+            (
+                r["id"], r["user_id"], names.get(r["user_id"], ""), r["word"], word_levels.get(r["word"], ""),
+                r["score"], r["feedback"] or "", r["created_at"],
+            )
+            for r in rows
+        ]
+
+
+def open_batches(
+    user_ids: Optional[List[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    words: Optional[List[str]] = None,
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    내보내기 슬롯을 잡고 전용 연결(export_engine)로 iter_rows 하는 이터레이터.
+    슬롯이 없으면 바로 AdmissionRejected(503). 슬롯은 다 읽거나, 중간에 끊기거나, 한 번도 읽지 않고 버려질 때 반납
+    """
+    from app.core.database import export_engine
+
+    if not _slots.acquire(blocking=False):
+        metrics.inc("log_export_rejected_total")
+        raise AdmissionRejected(
+            "EXPORT_BUSY", "지금은 내보내기가 많아요. 잠시 후 다시 시도해 주세요.", status_code=503, retry_after=10.0,
+        )
+    released = threading.Event()
+
+    def release() -> None:
+        if not released.is_set():
+            released.set()
+            _slots.release()
+
+    def batches() -> Iterator[List[Tuple[Any, ...]]]:
+        try:
+            with Session(export_engine) as session:
+                yield from iter_rows(session, user_ids, start, end, words)
+        finally:
+            release()
+
+    it = batches()
+    weakref.finalize(it, release)
+    return it
+
+
+def stream_csv(batches: Iterator[List[Tuple[Any, ...]]]) -> Iterator[bytes]:
+    # 엑셀에서 한글이 깨지지 않도록 BOM
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(COLUMNS)
+    yield b"\xef\xbb\xbf" + buf.getvalue().encode("utf-8")
+    total = 0
+    for rows in batches:
+        buf.seek(0)
+        buf.truncate(0)
+        writer.writerows(
+            (*row[:-1], row[-1].isoformat(sep=" ", timespec="seconds") if row[-1] else "") for row in rows
+        )
+        total += len(rows)
+        yield buf.getvalue().encode("utf-8")
+    metrics.inc("log_export_rows_total", total, format="csv")
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _Sink(io.RawIOBase):
+    """ParquetWriter 출력을 모아 두었다가 drain()으로 넘기는 쓰기 전용 파일 (위치는 누적)"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def stream_parquet(batches: Iterator[List[Tuple[Any, ...]]]) -> Iterator[bytes]:
+    """묶음마다 row group 하나를 써서 바로 내보냄 (pyarrow 필요)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("log_id", pa.int64()), ("user_id", pa.string()), ("name", pa.string()), ("word", pa.string()),
+        ("level", pa.string()), ("score", pa.float64()), ("feedback", pa.string()), ("created_at", pa.timestamp("us")),
+    ])
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    total = 0
+    try:
+        for rows in batches:
+            columns = list(zip(*rows)) if rows else [[] for _ in COLUMNS]
+            writer.write_table(pa.Table.from_arrays([pa.array(c, type=f.type) for c, f in zip(columns, schema)], schema=schema))
+            total += len(rows)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+    metrics.inc("log_export_rows_total", total, format="parquet")
+
+
+def stream(fmt: str, batches: Iterator[List[Tuple[Any, ...]]]) -> Iterator[bytes]:
+    return stream_parquet(batches) if fmt == "parquet" else stream_csv(batches)
+
+
+def student_ids(session: Session, teacher_id: str) -> List[str]:
+    return list(session.connection().execute(
+        select(User.uid).where(User.teacher_id == teacher_id, User.role == "student")
+    ).scalars())
+
+
+def main() -> None:
+    from app.core.database import read_engine
+
+    parser = argparse.ArgumentParser(description="학습 로그 내보내기")
+    parser.add_argument("--out", required=True, help=".csv 또는 .parquet")
+    parser.add_argument("--teacher", default=None, help="이 선생님의 담당 학생만")
+    parser.add_argument("--student", default=None)
+    parser.add_argument("--level", default=None)
+    parser.add_argument("--start", default=None, help="YYYY-MM-DD (포함)")
+    parser.add_argument("--end", default=None, help="YYYY-MM-DD (제외)")
+    args = parser.parse_args()
+
+    fmt = "parquet" if args.out.endswith(".parquet") else "csv"
+    if fmt == "parquet" and not parquet_available():
+        parser.error("Parquet 내보내기에는 pyarrow가 필요합니다 (pip install pyarrow)")
+    words = None
+    if args.level:
+        words = words_for_level(args.level)
+        if words is None:
+            parser.error(f"알 수 없는 레벨: {args.level}")
+    with Session(read_engine) as session:
+        user_ids = student_ids(session, args.teacher) if args.teacher else None
+        if args.student:
+            user_ids = [args.student] if user_ids is None or args.student in user_ids else []
+        batches = iter_rows(
+            session, user_ids,
+            datetime.fromisoformat(args.start) if args.start else None,
+            datetime.fromisoformat(args.end) if args.end else None,
+            words,
+        )
+        with open(args.out, "wb") as f:
+            for data in stream(fmt, batches):
+                f.write(data)
+    print(f"[LogExport] {args.out} 저장 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+# backend/app/services/log_writer.py
+"""
+StudyLog 쓰기 지연(write-behind) 버퍼.
+
+평가마다 INSERT + COMMIT(= SQLite fsync 1회)을 하면 반 전체가 동시에 말하기 연습을 할 때
+DB 파일 하나에 줄을 서게 됩니다. 평가 API는 submit()으로 행을 버퍼에 넣기만 하고,
+전용 스레드가 LOG_BATCH_SIZE개가 모이거나 LOG_FLUSH_INTERVAL초가 지나면 한 트랜잭션으로 일괄 저장합니다.
+
+- 자기 기록 읽기 보장: 같은 사용자의 StudyLog를 읽는 API는 먼저 ensure_flushed(user_id)를 호출
+  (그 사용자의 미저장 행이 있을 때만 즉시 저장을 요청하고 끝날 때까지 대기)
+  전체 사용자를 읽는 작업(로그 내보내기)은 ensure_flushed() -> 호출 시점까지 들어온 행이 모두 저장될 때까지 대기
+- log_id가 필요한 후속 작업(녹음 보관, 곡선, 음소 점수)은 with_log_id()로 저장 후 실행
+- 일괄 저장이 LOG_FLUSH_MAX_ATTEMPTS번 연속 실패하면 배치를 반씩 나눠 저장하고,
+  한 행만으로도 저장되지 않는 행만 LOG_SPILL_PATH(JSONL)에 남깁니다 (나쁜 행 하나가 버퍼 전체를 막지 않도록)
+- 종료: lifespan에서 stop() -> 남은 행을 모두 저장. 그래도 실패한 행은 LOG_SPILL_PATH에 남기고
+  다음 시작 때 start()가 다시 저장합니다 (그때도 저장되지 않는 행은 파일에 그대로 남음).
+- LOG_WRITE_BEHIND=0 이거나 스레드가 없을 때(스크립트 등)는 submit()이 바로 저장합니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import metrics
+from app.models import StudyLog
+from app.services import mastery, review_scheduler, rollups
+
+
+class PendingLog:
+    """버퍼에 들어간 StudyLog 한 행. 저장되면 id가 채워집니다."""
+
+    __slots__ = ("row", "id", "seq", "_done")
+
+    def __init__(self, row: Dict[str, Any]):
+        self.row = row
+        self.id: Optional[int] = None
+        self.seq = 0  # 버퍼에 들어간 순번 (저장은 이 순서로 끝남)
+        self._done = threading.Event()
+
+    @property
+    def user_id(self) -> str:
+        return self.row["user_id"]
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        self._done.wait(timeout)
+        return self.id
+
+
+def _row_from(log: StudyLog) -> Dict[str, Any]:
+    return {
+        "user_id": log.user_id,
+        "word": log.word,
+        "score": float(log.score),
+        "feedback": log.feedback,
+        "created_at": log.created_at or datetime.now(),
+    }
+
+
+class StudyLogWriter:
+    def __init__(self, batch_size: int, interval: float, spill_path: Path):
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.spill_path = Path(spill_path)
+        self._cond = threading.Condition()
+        self._buffer: List[PendingLog] = []
+        self._unflushed: Counter = Counter()  # user_id -> 버퍼 + 저장 중인 행 수
+        self._submitted = 0  # 마지막으로 버퍼에 넣은 행의 seq
+        self._completed = 0  # 저장(또는 보관)이 끝난 가장 큰 seq
+        self._flush_now = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+    def _insert(self, batch: List[PendingLog]) -> None:
+        """한 트랜잭션으로 일괄 INSERT + 통계 집계/단어 숙련도/복습 카드 갱신 후 id 채우기"""
+        stmt = insert(StudyLog).returning(StudyLog.id, sort_by_parameter_order=True)
+        with Session(engine) as session:
+            ids = session.exec(stmt, params=[p.row for p in batch]).scalars().all()
+            rollups.apply(session, (p.row for p in batch))
+            mastery.apply(session, (p.row for p in batch))
+            review_scheduler.apply(session, (p.row for p in batch))
+            session.commit()
+        for pending, log_id in zip(batch, ids):
+            pending.id = log_id
+
+    def _complete(self, batch: List[PendingLog]) -> None:
+        with self._cond:
+            for pending in batch:
+                self._completed = max(self._completed, pending.seq)
+                self._unflushed[pending.user_id] -= 1
+                if self._unflushed[pending.user_id] <= 0:
+                    del self._unflushed[pending.user_id]
+            self._cond.notify_all()
+        for pending in batch:
+            pending._done.set()
+
+    def _spill(self, batch: List[PendingLog]) -> None:
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for pending in batch:
+                f.write(json.dumps({**pending.row, "created_at": pending.row["created_at"].isoformat()},
+                                   ensure_ascii=False) + "\n")
+        metrics.inc("studylog_spilled_total", len(batch))
+        print(f"[LogWriter] 저장 실패한 {len(batch)}행을 {self.spill_path}에 보관")
+
+    def _flush(self, batch: List[PendingLog], final: bool = False) -> bool:
+        started = time.perf_counter()
+        try:
+            self._insert(batch)
+        except Exception as e:
+            metrics.inc("studylog_flush_failed_total")
+            print(f"[LogWriter] 일괄 저장 실패 ({len(batch)}행): {e}")
+            if not final:
+                return False
+            self._spill(batch)
+        else:
+            metrics.inc("studylog_flush_total")
+            metrics.inc("studylog_rows_flushed_total", len(batch))
+            metrics.inc("studylog_flush_seconds_total", time.perf_counter() - started)
+        self._complete(batch)
+        return True
+
+    def _insert_split(self, batch: List[PendingLog], whole: bool = True) -> List[PendingLog]:
+        """반씩 나눠 저장하고 한 행만으로도 저장되지 않는 행 목록을 반환 (whole=False면 통째 시도는 건너뜀)"""
+        if whole or len(batch) == 1:
+            try:
+                self._insert(batch)
+                metrics.inc("studylog_rows_flushed_total", len(batch))
+                return []
+            except Exception as e:
+                if len(batch) == 1:
+                    print(f"[LogWriter] 저장할 수 없는 행 ({batch[0].user_id}, {batch[0].row.get('word')!r}): {e}")
+                    return batch
+        mid = len(batch) // 2
+        return self._insert_split(batch[:mid]) + self._insert_split(batch[mid:])
+
+    def _salvage(self, batch: List[PendingLog]) -> None:
+        """재시도를 다 쓴 배치: 나눠 저장하고 실패한 행만 보관 파일로"""
+        metrics.inc("studylog_batch_split_total")
+        failed = self._insert_split(batch, whole=False)
+        if failed:
+            self._spill(failed)
+        self._complete(batch)
+
+    def _run(self) -> None:
+        failures = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopping or self._flush_now or len(self._buffer) >= self.batch_size,
+                    timeout=self.interval,
+                )
+                batch, self._buffer = self._buffer, []
+                self._flush_now = False
+                stopping = self._stopping
+            if batch and not self._flush(batch, final=stopping):
+                failures += 1
+                if failures >= settings.LOG_FLUSH_MAX_ATTEMPTS:
+                    self._salvage(batch)
+                    failures = 0
+                    continue
+                # 실패한 행은 버퍼 앞에 되돌리고 잠시 후 재시도
+                with self._cond:
+                    self._buffer[:0] = batch
+                time.sleep(min(5.0, 0.2 * 2 ** failures))
+                continue
+            failures = 0
+            if stopping:
+                with self._cond:
+                    if not self._buffer:
+                        return
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        try:
+            self.replay_spill()
+        except Exception as e:
+            # 보관 파일은 그대로 두고 (다음 시작 때 다시 시도) 쓰기 스레드는 띄움
+            metrics.inc("studylog_replay_failed_total")
+            print(f"[LogWriter] 보관된 행 다시 저장 실패: {e}")
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="studylog-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """남은 행을 모두 저장하고 스레드 종료"""
+        if not self.running:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+        with self._cond:
+            leftover, self._buffer = self._buffer, []
+        if leftover:
+            self._spill(leftover)
+            self._complete(leftover)
+
+    def submit(self, log: StudyLog) -> PendingLog:
+        pending = PendingLog(_row_from(log))
+        if not settings.LOG_WRITE_BEHIND or not self.running:
+            if not self._flush([pending]):
+                raise RuntimeError("StudyLog 저장 실패")
+            return pending
+        with self._cond:
+            self._submitted += 1
+            pending.seq = self._submitted
+            self._buffer.append(pending)
+            self._unflushed[pending.user_id] += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+        return pending
+
+    def ensure_flushed(self, user_id: Optional[str] = None, timeout: float = 10.0) -> bool:
+        """
+        user_id의 미저장 행이 모두 저장될 때까지 대기 (없으면 바로 반환).
+        user_id가 None이면 지금까지 들어온 모든 사용자의 행 (이후에 들어오는 행은 기다리지 않음)
+        """
+        deadline = time.monotonic() + timeout
+
+        def pending() -> bool:
+            if user_id is None:
+                return self._completed < target
+            return bool(self._unflushed.get(user_id))
+
+        with self._cond:
+            target = self._submitted
+            if not pending():
+                return True
+            self._flush_now = True
+            self._cond.notify_all()
+            while pending():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    async def ensure_flushed_async(self, user_id: Optional[str] = None, timeout: float = 10.0) -> bool:
+        if user_id is not None and not self._unflushed.get(user_id):
+            return True
+        return await asyncio.to_thread(self.ensure_flushed, user_id, timeout)
+
+    def with_log_id(self, pending: PendingLog, fn: Callable[..., Any], *args: Any) -> None:
+        """BackgroundTasks용: 행이 저장되면 fn(log_id, *args) 실행"""
+        log_id = pending.wait(timeout=max(30.0, self.interval * 10))
+        if log_id is None:
+            print(f"[LogWriter] log_id 없음 (저장 지연/실패), {getattr(fn, '__name__', fn)} 건너뜀")
+            return
+        fn(log_id, *args)
+
+    def replay_spill(self) -> int:
+        """이전 종료 때 저장하지 못한 행을 다시 저장. 이번에도 저장되지 않는 행만 파일에 남김"""
+        if not self.spill_path.exists():
+            return 0
+        batch = []
+        for line in self.spill_path.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                row = json.loads(line)
+                row["created_at"] = datetime.fromisoformat(row["created_at"])
+                batch.append(PendingLog(row))
+        failed = self._insert_split(batch) if batch else []
+        self.spill_path.unlink()
+        if failed:
+            self._spill(failed)
+        print(f"[LogWriter] 보관된 {len(batch) - len(failed)}/{len(batch)}행 저장 완료")
+        return len(batch) - len(failed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "running": self.running,
+                "buffered": len(self._buffer),
+                "unflushed_users": len(self._unflushed),
+            }
+
+
+log_writer = StudyLogWriter(
+    batch_size=settings.LOG_BATCH_SIZE,
+    interval=settings.LOG_FLUSH_INTERVAL,
+    spill_path=settings.LOG_SPILL_PATH,
+)
+metrics.register_gauge("studylog_writer", log_writer.stats)
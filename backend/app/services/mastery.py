@@ -0,0 +1,133 @@
+# backend/app/services/mastery.py
+"""
+사용자별 단어 숙련도 (GET /study/review-words).
+
+WordMastery(user_id, word): 시도 수, 마지막 점수, 최고 점수, 지수 가중 평균(EWMA), 마지막 학습 시각.
+log_writer가 StudyLog를 저장하는 같은 트랜잭션에서 apply()로 갱신하므로 복습 단어 선택은
+(user_id, ewma) 인덱스의 top-K 조회 한 번이며 과거 StudyLog는 읽지 않습니다.
+
+EWMA: ewma <- (1 - ALPHA) * ewma + ALPHA * score (첫 시도는 그 점수)
+  -> 예전에 틀렸어도 최근에 연속으로 잘 맞히면 복습 목록에서 빠집니다.
+
+전체 재계산 (backend 폴더에서):
+    python -m app.services.mastery rebuild [--user USER_ID]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, case, delete
+from sqlmodel import Session, select
+
+from app.core.storage import dialect_insert
+from app.models import WordMastery
+from app.services import log_archive
+
+ALPHA = 0.3
+
+
+def _fold(scores: List[float]) -> Tuple[float, float, float]:
+    """
+    한 묶음 안의 같은 (user, word) 점수들을 순서대로 접어서
+    (새 행일 때 ewma, 기존 행 ewma에 곱할 감쇠, 더할 값) 반환
+    """
+    seeded = scores[0]
+    for s in scores[1:]:
+        seeded = (1 - ALPHA) * seeded + ALPHA * s
+    decay, offset = 1.0, 0.0
+    for s in scores:
+        decay *= 1 - ALPHA
+        offset = (1 - ALPHA) * offset + ALPHA * s
+    return seeded, decay, offset
+
+
+def apply(session: Session, rows: Iterable[Dict[str, Any]]) -> int:
+    """StudyLog 행 묶음(시간 순)을 숙련도에 반영. 호출한 쪽에서 commit"""
+    grouped: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for row in rows:
+        grouped.setdefault((row["user_id"], row["word"]), []).append(row)
+    if not grouped:
+        return 0
+
+    params = []
+    for (user_id, word), items in grouped.items():
+        scores = [float(r["score"]) for r in items]
+        seeded, decay, offset = _fold(scores)
+        params.append({
+            "user_id": user_id,
+            "word": word,
+            "attempts": len(items),
+            "last_score": scores[-1],
+            "best_score": max(scores),
+            "ewma": seeded,
+            "last_at": max(r["created_at"] for r in items),
+            "decay": decay,
+            "offset": offset,
+        })
+
+    # 같은 키가 한 묶음에 두 번 나오지 않도록 미리 접었으므로 PostgreSQL 다중 VALUES에서도 안전
+    conn = session.connection()
+    stmt = dialect_insert(conn)(WordMastery)
+    excluded = stmt.excluded
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "word"],
+            set_={
+                "attempts": WordMastery.attempts + excluded.attempts,
+                "last_score": case((excluded.last_at >= WordMastery.last_at, excluded.last_score),
+                                   else_=WordMastery.last_score),
+                "best_score": case((excluded.best_score > WordMastery.best_score, excluded.best_score),
+                                   else_=WordMastery.best_score),
+                "ewma": WordMastery.ewma * bindparam("decay") + bindparam("offset"),
+                "last_at": case((excluded.last_at > WordMastery.last_at, excluded.last_at),
+                                else_=WordMastery.last_at),
+            },
+        ),
+        params,
+    )
+    return len(params)
+
+
+def rebuild(session: Session, user_id: Optional[str] = None, chunk: int = 5000) -> int:
+    """숙련도 테이블을 비우고 StudyLog(보관분 포함, id 순)로 다시 계산. 처리한 로그 수를 반환"""
+    stmt = delete(WordMastery)
+    if user_id is not None:
+        stmt = stmt.where(WordMastery.user_id == user_id)
+    session.connection().execute(stmt)
+
+    total = 0
+    for rows in log_archive.iter_logs(session, user_id, chunk=chunk):
+        apply(session, rows)
+        total += len(rows)
+    return total
+
+
+def weakest(session: Session, user_id: str, limit: int = 10) -> List[WordMastery]:
+    """숙련도(EWMA) 낮은 단어 top-K"""
+    return session.exec(
+        select(WordMastery)
+        .where(WordMastery.user_id == user_id)
+        .order_by(WordMastery.ewma.asc(), WordMastery.word.asc())
+        .limit(limit)
+    ).all()
+
+
+def main() -> None:
+    from app.core.database import engine
+
+    parser = argparse.ArgumentParser(description="단어 숙련도 테이블 관리")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--user", default=None, help="이 사용자만 다시 계산")
+    args = parser.parse_args()
+    if args.command == "rebuild":
+        started = time.time()
+        with Session(engine) as session:
+            n = rebuild(session, args.user)
+            session.commit()
+        print(f"[Mastery] StudyLog {n}행으로 숙련도 재계산 완료 ({time.time() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+# backend/app/services/notice_feed.py
+"""
+선생님별 공지 피드 캐시 + 예약 발송 스케줄러 + 실시간 알림(SSE).
+
+1) 피드 캐시: 학생 공지 목록(GET /api/notice/list)은 선생님별로 "지금 공개된 공지" 목록을 캐시
+   - 항목은 다음 예약 공지의 scheduled_at이 되면 스스로 만료 (예약 공지가 늦게 보이지 않음)
+   - 새 공지 / 예약 발송 시 invalidate, 다른 워커의 변경은 아래 동기화(또는 NOTICE_FEED_TTL) 후 반영
+2) 스케줄러(run_forever, 서버 lifespan 태스크): 예약 공지를 scheduled_at 순 힙에 두고 그 시각에 발송
+   - 발송 = 캐시 무효화 + 구독 중인 학생들에게 알림
+   - NOTICE_SYNC_INTERVAL초마다 id > 마지막으로 본 id 인 공지만 한 번 조회해서
+     다른 워커가 만든 공지도 예약/알림 (학생마다 폴링하는 대신 워커당 쿼리 1번)
+3) 알림 채널: GET /api/notice/stream (Server-Sent Events). 담당 선생님별 구독자 큐에 공지를 넣음
+   - 느린 구독자는 큐(_QUEUE_SIZE)가 차면 알림을 버림 (재접속 시 목록을 다시 받으면 됨)
+   - 구독자 수 상한 NOTICE_STREAM_MAX_SUBSCRIBERS
+
+공지 작성(teacher.send_notice)은 스레드 풀에서 실행되므로 구독자/스케줄러는 call_soon_threadsafe로 깨웁니다.
+
+CLI (backend 폴더에서):
+    python -m app.services.notice_feed pending   # 아직 발송 전인 예약 공지
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlmodel import Session, or_, select
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models import Notice
+
+_QUEUE_SIZE = 32
+_PUSH_MAX_AGE = timedelta(minutes=5)  # 이보다 오래전에 공개된 공지(예전 데이터 가져오기 등)는 알리지 않음
+_MAX_SLEEP = 60.0                     # 시계가 바뀌어도 예약 시각을 다시 확인하도록
+
+
+def _to_dict(notice: Notice) -> Dict[str, Any]:
+    return notice.model_dump()
+
+
+class NoticeFeed:
+    def __init__(self, ttl: float, max_subscribers: int):
+        self.ttl = ttl
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        # teacher_id -> (만료 monotonic, 다음 예약 시각, 공지 목록)
+        self._feeds: Dict[str, Tuple[float, Optional[datetime], List[Dict[str, Any]]]] = {}
+        self._scheduled: List[Tuple[datetime, int, Dict[str, Any]]] = []  # (scheduled_at, id, 공지) 힙
+        self._scheduled_ids: Set[int] = set()
+        self._pushed: "OrderedDict[int, None]" = OrderedDict()  # 최근 알린 공지 id (중복 알림 방지)
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._watermark = 0  # 동기화로 확인한 가장 큰 Notice.id
+        self._stats = {"hits": 0, "misses": 0, "published": 0, "pushed": 0, "dropped": 0}
+
+    # ------------------------------------------------------------------
+    # 피드 캐시
+    # ------------------------------------------------------------------
+    def _load(self, session: Session, teacher_id: str, now: datetime) -> Tuple[Optional[datetime], List[Dict[str, Any]]]:
+        notices = session.exec(
+            select(Notice)
+            .where(Notice.teacher_id == teacher_id)
+            .where(or_(Notice.scheduled_at == None, Notice.scheduled_at <= now))  # noqa: E711
+            .order_by(Notice.created_at.desc())
+        ).all()
+        next_at = session.exec(
+            select(func.min(Notice.scheduled_at)).where(Notice.teacher_id == teacher_id, Notice.scheduled_at > now)
+        ).one()
+        return next_at, [_to_dict(n) for n in notices]
+
+    def feed(self, session: Session, teacher_id: str) -> List[Dict[str, Any]]:
+        """담당 선생님의 공개된 공지 (최신순)"""
+        now = datetime.now()
+        with self._lock:
+            entry = self._feeds.get(teacher_id)
+            if entry and entry[0] > time.monotonic() and (entry[1] is None or now < entry[1]):
+                self._stats["hits"] += 1
+                return entry[2]
+            self._stats["misses"] += 1
+        next_at, items = self._load(session, teacher_id, now)
+        if self.ttl > 0:
+            with self._lock:
+                self._feeds[teacher_id] = (time.monotonic() + self.ttl, next_at, items)
+        return items
+
+    def invalidate(self, teacher_id: str) -> None:
+        with self._lock:
+            self._feeds.pop(teacher_id, None)
+
+    # ------------------------------------------------------------------
+    # 발송
+    # ------------------------------------------------------------------
+    def created(self, notice: Notice) -> None:
+        """공지 commit 후 호출 (어느 스레드에서든). 예약이면 스케줄러에, 아니면 바로 발송"""
+        item = _to_dict(notice)
+        if notice.scheduled_at and notice.scheduled_at > datetime.now():
+            self._schedule(item)
+            self.invalidate(notice.teacher_id)  # 캐시 항목의 "다음 예약 시각"을 다시 계산
+        else:
+            self._publish(item)
+
+    def _schedule(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            if item["id"] in self._scheduled_ids:
+                return
+            self._scheduled_ids.add(item["id"])
+            heapq.heappush(self._scheduled, (item["scheduled_at"], item["id"], item))
+        self._call_in_loop(self._wake)
+
+    def _publish(self, item: Dict[str, Any]) -> None:
+        self.invalidate(item["teacher_id"])
+        with self._lock:
+            if item["id"] in self._pushed:
+                return
+            self._pushed[item["id"]] = None
+            self._stats["published"] += 1
+            while len(self._pushed) > 1000:
+                self._pushed.popitem(last=False)
+        published_at = item.get("scheduled_at") or item.get("created_at")
+        if published_at and published_at < datetime.now() - _PUSH_MAX_AGE:
+            return
+        self._call_in_loop(self._fanout, item)
+
+    def _call_in_loop(self, fn, *args) -> None:
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(fn, *args)
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _fanout(self, item: Dict[str, Any]) -> None:
+        """이벤트 루프 스레드에서만 실행"""
+        for queue in list(self._subscribers.get(item["teacher_id"], ())):
+            try:
+                queue.put_nowait(item)
+                self._stats["pushed"] += 1
+            except asyncio.QueueFull:
+                self._stats["dropped"] += 1
+        metrics.inc("notice_published_total")
+
+    def _due(self, now: datetime) -> Tuple[List[Dict[str, Any]], Optional[datetime]]:
+        due = []
+        with self._lock:
+            while self._scheduled and self._scheduled[0][0] <= now:
+                _, notice_id, item = heapq.heappop(self._scheduled)
+                self._scheduled_ids.discard(notice_id)
+                due.append(item)
+            next_at = self._scheduled[0][0] if self._scheduled else None
+        return due, next_at
+
+    # ------------------------------------------------------------------
+    # 구독 (SSE, 이벤트 루프 스레드에서만)
+    # ------------------------------------------------------------------
+    def subscribe(self, teacher_id: str) -> Optional[asyncio.Queue]:
+        """구독자 수 상한을 넘으면 None"""
+        if self.subscriber_count() >= self.max_subscribers:
+            return None
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        self._subscribers.setdefault(teacher_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, teacher_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(teacher_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[teacher_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(q) for q in list(self._subscribers.values()))
+
+    # ------------------------------------------------------------------
+    # 동기화 + 스케줄러
+    # ------------------------------------------------------------------
+    def sync(self, session: Session, initial: bool = False) -> int:
+        """마지막으로 본 id 이후의 공지를 예약/발송. initial이면 지난 공지는 알리지 않고 예약만 불러옴"""
+        now = datetime.now()
+        notices = session.exec(select(Notice).where(Notice.id > self._watermark).order_by(Notice.id)).all()
+        for notice in notices:
+            item = _to_dict(notice)
+            if notice.scheduled_at and notice.scheduled_at > now:
+                self._schedule(item)
+                self.invalidate(notice.teacher_id)
+            elif not initial:
+                self._publish(item)
+            self._watermark = max(self._watermark, notice.id)
+        return len(notices)
+
+    def _sync_once(self, initial: bool = False) -> int:
+        from app.core.database import engine
+
+        with Session(engine) as session:
+            return self.sync(session, initial)
+
+    async def run_forever(self, interval: Optional[float] = None) -> None:
+        """서버 lifespan 백그라운드 태스크: 예약 시각에 발송 + NOTICE_SYNC_INTERVAL초마다 동기화"""
+        interval = settings.NOTICE_SYNC_INTERVAL if interval is None else interval
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        try:
+            await asyncio.to_thread(self._sync_once, True)
+        except Exception as e:
+            print(f"[NoticeFeed] 예약 공지 불러오기 실패: {e}")
+        next_sync = time.monotonic() + interval
+        while True:
+            due, next_at = self._due(datetime.now())
+            for item in due:
+                self._publish(item)
+            if interval > 0 and time.monotonic() >= next_sync:
+                try:
+                    await asyncio.to_thread(self._sync_once)
+                except Exception as e:
+                    print(f"[NoticeFeed] 동기화 실패: {e}")
+                next_sync = time.monotonic() + interval
+                continue
+            timeout = _MAX_SLEEP
+            if next_at is not None:
+                timeout = min(timeout, max(0.0, (next_at - datetime.now()).total_seconds()))
+            if interval > 0:
+                timeout = min(timeout, max(0.0, next_sync - time.monotonic()))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def pending(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [item for _, _, item in sorted(self._scheduled)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            cached, scheduled = len(self._feeds), len(self._scheduled)
+        total = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "hit_rate": round(stats["hits"] / total, 4) if total else 0.0,
+            "cached_teachers": cached,
+            "scheduled": scheduled,
+            "subscribers": self.subscriber_count(),
+        }
+
+
+notice_feed = NoticeFeed(settings.NOTICE_FEED_TTL, settings.NOTICE_STREAM_MAX_SUBSCRIBERS)
+metrics.register_gauge("notice_feed", notice_feed.stats)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="공지 피드/예약 발송")
+    parser.add_argument("command", choices=["pending"])
+    parser.parse_args()
+
+    notice_feed._sync_once(initial=True)
+    for item in notice_feed.pending():
+        print(f"{item['scheduled_at']:%Y-%m-%d %H:%M}  #{item['id']}  [{item['teacher_id']}] {item['title']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+# backend/app/services/passwords.py
+"""
+비밀번호 해싱/검증 서비스.
+
+저장 형식 (User.pw):
+  - "scrypt$n$r$p$salt$hash" : 현재 기본 (hashlib.scrypt, 메모리 하드, salt 16바이트)
+  - "pbkdf2$반복$salt$hash"   : 예전 JSON 저장소에서 가져온 해시 (app/legacy/utils_compat.py)
+  - 64자리 hex               : 예전 SHA-256 (salt 없음)
+  - 그 외                    : 평문 (초기 계정 "1111" 등)
+로그인에 성공했는데 현재 파라미터(PASSWORD_SCRYPT_N/R/P)가 아니면 새로 해싱해 저장합니다 (needs_rehash).
+
+KDF 한 번이 수십 ms라서 이벤트 루프에서 돌리지 않고 전용 풀(PASSWORD_HASH_POOL=thread|process,
+PASSWORD_HASH_WORKERS개)에서 실행합니다. hashlib.scrypt/pbkdf2_hmac은 GIL을 놓으므로 스레드 풀로도 코어 수만큼 병렬입니다.
+
+로그인 폭주는 해싱 전에 싸게 거절 (AdmissionRejected):
+  - 아이디별 / 접속 주소별 토큰 버킷 (LOGIN_USER_RATE/BURST, LOGIN_CLIENT_RATE/BURST) -> 429, 로그인 성공 시 아이디 토큰은 돌려줌
+  - 실행 중 + 대기 중 해싱이 PASSWORD_HASH_MAX_PENDING 이상이면 큐에 쌓지 않고 바로 503
+파라미터 조정은 backend/bench_login.py (N별 해싱 시간, 풀 크기별 로그인 처리량/루프 지연).
+
+CLI (backend 폴더에서):
+    python -m app.services.passwords hash 1111
+    python -m app.services.passwords verify '<저장된 값>' 1111
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import re
+import secrets
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.admission import AdmissionRejected, BucketRegistry
+from app.core.config import settings
+from app.core.metrics import metrics
+
+_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+
+# ----------------------------------------------------------------------
+# 해싱/검증 (풀 안에서 실행되므로 모듈 함수, 인자는 모두 pickle 가능)
+# ----------------------------------------------------------------------
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # maxmem: scrypt가 쓰는 128*r*n 바이트 + 여유
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * r * n + (1 << 20))
+
+
+def hash_password(password: str, n: Optional[int] = None, r: Optional[int] = None, p: Optional[int] = None) -> str:
+    n = n or settings.PASSWORD_SCRYPT_N
+    r = r or settings.PASSWORD_SCRYPT_R
+    p = p or settings.PASSWORD_SCRYPT_P
+    salt = secrets.token_bytes(16)
+    return f"scrypt${n}${r}${p}${salt.hex()}${_scrypt(password or '', salt, n, r, p).hex()}"
+
+
+def needs_rehash(stored: str) -> bool:
+    """현재 형식/파라미터가 아니면 True"""
+    if not stored.startswith("scrypt$"):
+        return True
+    try:
+        _, n, r, p, _ = stored.split("$", 4)
+        return (int(n), int(r), int(p)) != (settings.PASSWORD_SCRYPT_N, settings.PASSWORD_SCRYPT_R, settings.PASSWORD_SCRYPT_P)
+    except ValueError:
+        return True
+
+
+def verify_password(stored: Optional[str], password: str) -> Tuple[bool, bool]:
+    """
+    저장된 값과 입력 비밀번호 비교.
+
+    Returns:
+        (일치 여부, 다시 해싱해서 저장해야 하는지)
+    """
+    if not stored:
+        return False, False
+    password = password or ""
+    if stored.startswith("scrypt$"):
+        try:
+            _, n, r, p, salt_hex, hash_hex = stored.split("$", 5)
+            dk = _scrypt(password, bytes.fromhex(salt_hex), int(n), int(r), int(p))
+        except ValueError:
+            return False, False
+        ok = hmac.compare_digest(dk.hex(), hash_hex)
+    elif stored.startswith("pbkdf2$"):
+        from app.legacy.utils_compat import verify_password as verify_legacy_password
+
+        ok, _ = verify_legacy_password(stored, password)
+    elif _SHA256_HEX.fullmatch(stored):
+        ok = hmac.compare_digest(stored, hashlib.sha256(password.encode("utf-8")).hexdigest())
+    else:
+        ok = hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8"))
+    return ok, ok and needs_rehash(stored)
+
+
+# ----------------------------------------------------------------------
+# 서비스 (풀 + 동시 실행 상한 + 로그인 토큰 버킷)
+# ----------------------------------------------------------------------
+class PasswordService:
+    def __init__(
+        self,
+        pool: str,
+        workers: int,
+        max_pending: int,
+        user_rate: float,
+        user_burst: float,
+        client_rate: float,
+        client_burst: float,
+    ):
+        self.pool_kind = pool
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.users = BucketRegistry(user_rate, user_burst)
+        self.clients = BucketRegistry(client_rate, client_burst)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+
+    def _pool(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.pool_kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password")
+            return self._executor
+
+    async def _run(self, kind: str, fn, *args) -> Any:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                metrics.inc("password_rejected_total", code="PASSWORD_BUSY")
+                raise AdmissionRejected(
+                    "PASSWORD_BUSY",
+                    "지금은 로그인 요청이 많아요. 잠시 후 다시 시도해 주세요.",
+                    status_code=503,
+                    retry_after=1.0,
+                )
+            self.pending += 1
+        try:
+            future = self._pool().submit(fn, *args)
+        except BaseException:
+            self._done(None)
+            raise
+        # 요청이 취소돼도 풀 작업은 끝까지 돌므로 작업이 끝날 때 차감
+        future.add_done_callback(self._done)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            metrics.inc("password_hash_total", kind=kind)
+            metrics.inc("password_hash_seconds_total", loop.time() - started, kind=kind)
+
+    def _done(self, _future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run("hash", hash_password, password)
+
+    async def verify_async(self, stored: Optional[str], password: str) -> Tuple[bool, bool]:
+        return await self._run("verify", verify_password, stored, password)
+
+    def check_login(self, uid: str, client: Optional[str] = None) -> None:
+        """해싱 전에 호출. 아이디/접속 주소별 한도를 넘으면 AdmissionRejected(429)"""
+        wait = self.users.take(f"login:user:{uid}")
+        if wait > 0:
+            metrics.inc("password_rejected_total", code="LOGIN_RATE_LIMIT")
+            raise AdmissionRejected(
+                "LOGIN_RATE_LIMIT", "로그인 시도가 너무 많아요. 잠시 후 다시 시도해 주세요.", retry_after=wait,
+            )
+        if client:
+            wait = self.clients.take(f"login:client:{client}")
+            if wait > 0:
+                self.users.refund(f"login:user:{uid}")
+                metrics.inc("password_rejected_total", code="LOGIN_RATE_LIMIT_CLIENT")
+                raise AdmissionRejected(
+                    "LOGIN_RATE_LIMIT_CLIENT", "이 기기에서 로그인 시도가 너무 많아요. 잠시 후 다시 시도해 주세요.", retry_after=wait,
+                )
+
+    def login_succeeded(self, uid: str) -> None:
+        # 정상 로그인은 아이디 한도를 쓰지 않음 (틀린 시도만 누적)
+        self.users.refund(f"login:user:{uid}")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool": self.pool_kind,
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "scrypt_n": settings.PASSWORD_SCRYPT_N,
+            "tracked_users": len(self.users),
+            "tracked_clients": len(self.clients),
+        }
+
+
+passwords = PasswordService(
+    pool=settings.PASSWORD_HASH_POOL,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    user_rate=settings.LOGIN_USER_RATE,
+    user_burst=settings.LOGIN_USER_BURST,
+    client_rate=settings.LOGIN_CLIENT_RATE,
+    client_burst=settings.LOGIN_CLIENT_BURST,
+)
+metrics.register_gauge("passwords", passwords.stats)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="비밀번호 해싱/검증")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_hash = sub.add_parser("hash", help="현재 파라미터로 해싱")
+    p_hash.add_argument("password")
+    p_verify = sub.add_parser("verify", help="저장된 값과 비교")
+    p_verify.add_argument("stored")
+    p_verify.add_argument("password")
+    args = parser.parse_args()
+
+    if args.command == "hash":
+        print(hash_password(args.password))
+    else:
+        ok, rehash = verify_password(args.stored, args.password)
+        print(f"일치: {ok}, 재해싱 필요: {rehash}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# backend/app/services/recording_archive.py
+"""
+평가한 녹음의 내용 주소(content-addressed) 아카이브.
+
+- 변환된 16k mono WAV의 SHA-256을 키로 사용 → 같은 녹음은 한 번만 저장
+- 저장 시 FLAC(무손실, 기본) 또는 Opus(ogg)로 압축
+- 저장 경로는 해시 앞 2+2자리로 샤딩: ab/cd/abcd....flac
+- 저장소는 StorageBackend 인터페이스로 교체 가능 (기본: 로컬 파일시스템)
+- StudyLogRecording 테이블로 StudyLog 행과 연결 (재생/재채점용)
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import subprocess
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Protocol, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import metrics
+from app.models import Recording, StudyLogRecording
+
+# 코덱 -> (확장자, MIME, ffmpeg 인코딩 옵션)
+CODECS: Dict[str, Tuple[str, str, list]] = {
+    "flac": (".flac", "audio/flac", ["-c:a", "flac", "-compression_level", "8", "-f", "flac"]),
+    "opus": (".ogg", "audio/ogg", ["-c:a", "libopus", "-b:a", "24k", "-f", "ogg"]),
+}
+
+READ_CHUNK = 64 * 1024
+
+
+# ----------------------------------------------------------------------
+# 저장소 백엔드
+# ----------------------------------------------------------------------
+class StorageBackend(Protocol):
+    def put(self, key: str, data: bytes) -> None: ...
+    def exists(self, key: str) -> bool: ...
+    def size(self, key: str) -> int: ...
+    def read(self, key: str) -> bytes: ...
+    def iter_range(self, key: str, start: int, end: int) -> Iterator[bytes]: ...
+    def delete(self, key: str) -> None: ...
+
+
+class LocalFSBackend:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp_", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def size(self, key: str) -> int:
+        return self._path(key).stat().st_size
+
+    def read(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def iter_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        """[start, end] (양끝 포함) 구간을 청크로 읽기"""
+        with open(self._path(key), "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(READ_CHUNK, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+
+BACKENDS: Dict[str, Callable[[], StorageBackend]] = {
+    "local": lambda: LocalFSBackend(settings.RECORDING_DIR),
+}
+
+
+def register_backend(name: str, factory: Callable[[], StorageBackend]) -> None:
+    """외부 저장소(S3 등) 백엔드 등록. RECORDING_BACKEND 환경변수로 선택합니다."""
+    BACKENDS[name] = factory
+
+
+# ----------------------------------------------------------------------
+# 압축/복원 (ffmpeg)
+# ----------------------------------------------------------------------
+def compress_wav(wav_bytes: bytes, codec: str) -> bytes:
+    ext, _mime, opts = CODECS[codec]
+    out_path = Path(settings.UPLOAD_WORK_DIR) / f"arc_{uuid.uuid4().hex}{ext}"
+    cmd = ["ffmpeg", "-y", "-loglevel", "error", "-f", "wav", "-i", "pipe:0", *opts, str(out_path)]
+    try:
+        subprocess.run(cmd, input=wav_bytes, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        return out_path.read_bytes()
+    finally:
+        if out_path.exists():
+            out_path.unlink()
+
+
+def decompress_to_wav(data: bytes, out_path: Path) -> Path:
+    """아카이브 데이터를 엔진 입력 규격(16k mono pcm_s16le WAV)으로 복원"""
+    cmd = [
+        "ffmpeg", "-y", "-loglevel", "error", "-i", "pipe:0",
+        "-ar", "16000", "-ac", "1", "-acodec", "pcm_s16le", "-f", "wav", str(out_path),
+    ]
+    subprocess.run(cmd, input=data, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return out_path
+
+
+def _wav_duration(wav_bytes: bytes) -> float:
+    # 16k mono 16bit 기준 (convert_to_wav 출력 규격), 헤더 44바이트
+    return max(0, len(wav_bytes) - 44) / (16000 * 2)
+
+
+# ----------------------------------------------------------------------
+# 아카이브
+# ----------------------------------------------------------------------
+class RecordingArchive:
+    def __init__(self, backend: StorageBackend, codec: str = "flac"):
+        if codec not in CODECS:
+            raise ValueError(f"지원하지 않는 코덱: {codec}")
+        self.backend = backend
+        self.codec = codec
+
+    @staticmethod
+    def object_key(sha256: str, codec: str) -> str:
+        return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{CODECS[codec][0]}"
+
+    @staticmethod
+    def media_type(codec: str) -> str:
+        return CODECS[codec][1]
+
+    def store(self, session: Session, wav_bytes: bytes) -> Recording:
+        """녹음을 저장(이미 있으면 재사용)하고 Recording 행을 반환. commit은 호출자가 수행"""
+        sha = hashlib.sha256(wav_bytes).hexdigest()
+        rec = session.get(Recording, sha)
+        if rec and self.backend.exists(self.object_key(sha, rec.codec)):
+            metrics.inc("recording_archive_dedup_total")
+            return rec
+
+        data = compress_wav(wav_bytes, self.codec)
+        self.backend.put(self.object_key(sha, self.codec), data)
+        # 행이 없으면 새로 만들고, 행만 남고 객체가 유실된 경우에는 기존 행을 갱신
+        if rec is None:
+            rec = Recording(sha256=sha)
+        rec.codec = self.codec
+        rec.size = len(data)
+        rec.wav_size = len(wav_bytes)
+        rec.duration = _wav_duration(wav_bytes)
+        session.add(rec)
+        metrics.inc("recording_archive_stored_total")
+        metrics.inc("recording_archive_bytes_total", len(data))
+        return rec
+
+    def archive_for_log(self, session: Session, log_id: int, wav_bytes: bytes, text: str) -> Recording:
+        rec = self.store(session, wav_bytes)
+        sha = rec.sha256
+        if session.get(StudyLogRecording, log_id) is None:
+            session.add(StudyLogRecording(log_id=log_id, recording_sha256=sha, text=text))
+        try:
+            session.commit()
+        except IntegrityError:
+            # 같은 녹음을 다른 요청이 먼저 저장한 경우: 객체는 이미 있으므로 연결만 다시 시도
+            session.rollback()
+            if session.get(StudyLogRecording, log_id) is None:
+                session.add(StudyLogRecording(log_id=log_id, recording_sha256=sha, text=text))
+                session.commit()
+            rec = session.get(Recording, sha)
+        return rec
+
+    def lookup(self, session: Session, log_id: int) -> Optional[Tuple[StudyLogRecording, Recording]]:
+        link = session.get(StudyLogRecording, log_id)
+        if not link:
+            return None
+        rec = session.get(Recording, link.recording_sha256)
+        if not rec:
+            return None
+        return link, rec
+
+    def load_bytes(self, rec: Recording) -> bytes:
+        return self.backend.read(self.object_key(rec.sha256, rec.codec))
+
+
+_archive: Optional[RecordingArchive] = None
+
+
+def get_archive() -> RecordingArchive:
+    global _archive
+    if _archive is None:
+        factory = BACKENDS.get(settings.RECORDING_BACKEND)
+        if factory is None:
+            raise RuntimeError(f"알 수 없는 녹음 저장소 백엔드: {settings.RECORDING_BACKEND}")
+        _archive = RecordingArchive(factory(), settings.RECORDING_CODEC)
+    return _archive
+
+
+def archive_recording_task(log_id: int, wav_bytes: bytes, text: str) -> None:
+    """평가 응답 후 BackgroundTasks로 실행 (압축은 요청 경로 밖에서)"""
+    try:
+        with Session(engine) as session:
+            get_archive().archive_for_log(session, log_id, wav_bytes, text)
+    except Exception as e:
+        metrics.inc("recording_archive_failed_total")
+        print(f"[Archive] 녹음 보관 실패 (log_id={log_id}): {e}")
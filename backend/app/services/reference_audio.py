@@ -0,0 +1,64 @@
+# backend/app/services/reference_audio.py
+"""
+원어민 참조 음성(assets/audio) 조회.
+
+data/index/level*.json 의 items[].resources 를 기준으로
+단어 텍스트 -> (단어 음성, 예문 음성) 상대 경로를 매핑합니다.
+상대 경로는 settings.ASSETS_DIR 기준입니다. (예: "audio/voca/level1/Level1_1.wav")
+"""
+from __future__ import annotations
+
+import json
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from app.core.config import settings
+
+
+def _nfc(text: str) -> str:
+    return unicodedata.normalize("NFC", str(text or "")).strip()
+
+
+@lru_cache(maxsize=1)
+def reference_map() -> Dict[str, Dict[str, str]]:
+    """{단어: {"voca": 상대경로, "example": 상대경로}} (처음 나온 레벨 기준)"""
+    out: Dict[str, Dict[str, str]] = {}
+    for json_path in sorted(Path(settings.INDEX_DIR).glob("level*.json")):
+        try:
+            with json_path.open("r", encoding="utf-8") as f:
+                items = (json.load(f) or {}).get("items", [])
+        except Exception as e:
+            print(f"[Reference] 인덱스 로드 실패 {json_path.name}: {e}")
+            continue
+        for item in items:
+            word = _nfc(item.get("text", ""))
+            res = item.get("resources", {}) or {}
+            if not word or word in out:
+                continue
+            out[word] = {
+                "voca": (res.get("audio_voca") or {}).get("file", ""),
+                "example": (res.get("audio_ex") or {}).get("file", ""),
+            }
+    return out
+
+
+def reference_for(word: str, text: str) -> Optional[str]:
+    """평가 요청(word, text)에 해당하는 참조 음성 상대 경로. text가 단어 자체면 단어 음성, 아니면 예문 음성"""
+    entry = reference_map().get(_nfc(word))
+    if not entry:
+        return None
+    if _nfc(text).replace(" ", "") == _nfc(word).replace(" ", ""):
+        return entry["voca"] or None
+    return entry["example"] or None
+
+
+def iter_reference_clips() -> Iterator[str]:
+    """인덱스에 등록되어 있고 실제 파일이 존재하는 모든 참조 음성 상대 경로"""
+    seen = set()
+    for entry in reference_map().values():
+        for rel in (entry["voca"], entry["example"]):
+            if rel and rel not in seen and (Path(settings.ASSETS_DIR) / rel).exists():
+                seen.add(rel)
+                yield rel
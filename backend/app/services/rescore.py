@@ -0,0 +1,286 @@
+# backend/app/services/rescore.py
+"""
+보관된 녹음 일괄 재채점.
+
+엔진/모델이 바뀌면 과거 StudyLog.score와 새 점수를 직접 비교할 수 없으므로,
+아카이브(StudyLogRecording)를 log_id 순서로 배치 단위로 훑으며 다시 채점하고
+결과를 StudyLogRescore(log_id, engine_version, score)에 기존 점수와 나란히 저장합니다.
+
+- 엔진 호출은 Priority.BACKGROUND 슬롯으로만 실행 (대화형 평가가 항상 우선)
+  단, 이 슬롯은 같은 프로세스 안에서만 유효합니다. CLI는 서버와 다른 프로세스이므로 엔진 호출 전마다
+  서버 /metrics(admission)를 보고 대화형 평가가 실행/대기 중이면 끝날 때까지 기다립니다 (LiveTrafficGuard).
+  서버 워커가 여러 개면 --server-url로 받은 한 워커의 지표만 보입니다.
+- 같은 문장은 speechpro_client의 모델 캐시로 G2P/MODEL 호출을 생략
+- 배치마다 체크포인트(JSON)를 기록 → 중단 후 같은 명령으로 이어서 실행
+  실패한 log_id는 체크포인트의 failed_ids에 남기고, 다음 실행 때 먼저 다시 채점 (성공하면 목록에서 빠짐)
+- 이미 같은 버전으로 채점된 로그는 건너뜀 (재실행해도 중복 저장 없음)
+
+실행:
+    python -m app.services.rescore --engine-version v2 --batch-size 50 --concurrency 2
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+from sqlmodel import Session, select
+
+from app.core.admission import AdmissionRejected, Priority
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import metrics
+from app.models import StudyLogRecording, StudyLogRescore
+from app.services.recording_archive import decompress_to_wav, get_archive
+from app.speechpro_client import ENGINE_VERSION, evaluate_pronunciation
+
+SLOT_RETRIES = 5
+
+
+def _load_checkpoint(path: Path, engine_version: str) -> Dict[str, Any]:
+    if path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("engine_version") == engine_version:
+            data.setdefault("failed_ids", [])  # 예전 체크포인트 호환
+            return data
+    return {"engine_version": engine_version, "last_log_id": 0, "rescored": 0, "skipped": 0, "failed": 0,
+            "failed_ids": []}
+
+
+def _save_checkpoint(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=str(path.parent))
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+class LiveTrafficGuard:
+    """서버의 대화형 엔진 호출(실행 + 대기)이 0이 될 때까지 기다림. 서버에 연결할 수 없으면 기다리지 않음"""
+
+    def __init__(self, server_url: str, poll: float):
+        self.url = server_url.rstrip("/") + "/metrics"
+        self.poll = max(0.1, poll)
+        self._lock = threading.Lock()
+        self._warned = False
+        self.waited = 0.0
+
+    def interactive_load(self) -> Optional[int]:
+        try:
+            r = requests.get(self.url, timeout=2)
+            r.raise_for_status()
+            gate = r.json()["admission"]
+            return (gate["active"] - gate["active_background"]) + (gate["waiting"] - gate["waiting_background"])
+        except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+            with self._lock:
+                if not self._warned:
+                    self._warned = True
+                    print(f"[Rescore] 서버 지표를 읽을 수 없어 대화형 평가 부하를 확인하지 않습니다 ({self.url}: {e})")
+            return None
+
+    def wait(self) -> None:
+        started = time.monotonic()
+        next_log = started + 60
+        while True:
+            load = self.interactive_load()
+            if not load:
+                break
+            if time.monotonic() >= next_log:
+                print(f"[Rescore] 대화형 평가 {load}건 진행 중, 대기 중 ({time.monotonic() - started:.0f}s)")
+                next_log += 60
+            time.sleep(self.poll)
+        waited = time.monotonic() - started
+        if waited >= self.poll:
+            with self._lock:
+                self.waited += waited
+            metrics.inc("rescore_yield_seconds_total", waited)
+
+
+def _rescore_one(log_id: int, text: str, guard: Optional[LiveTrafficGuard] = None) -> Optional[float]:
+    """녹음 1건 재채점. 실패하면 None"""
+    archive = get_archive()
+    with Session(engine) as session:
+        found = archive.lookup(session, log_id)
+    if not found:
+        return None
+    _link, rec = found
+
+    wav_path = Path(settings.UPLOAD_WORK_DIR) / f"rescore_{uuid.uuid4().hex}.wav"
+    try:
+        decompress_to_wav(archive.load_bytes(rec), wav_path)
+        for attempt in range(SLOT_RETRIES):
+            if guard is not None:
+                guard.wait()
+            try:
+                score, result = evaluate_pronunciation(text, wav_path, priority=Priority.BACKGROUND)
+                break
+            except AdmissionRejected:
+                # 대화형 평가가 몰리는 동안에는 물러나서 기다림
+                time.sleep(2 ** attempt)
+        else:
+            return None
+        if isinstance(result, dict) and result.get("error"):
+            print(f"[Rescore] log_id={log_id} 실패: {result['error']}")
+            return None
+        return float(score)
+    except Exception as e:
+        print(f"[Rescore] log_id={log_id} 처리 중 오류: {e}")
+        return None
+    finally:
+        if wav_path.exists():
+            wav_path.unlink()
+
+
+def _rescore_links(
+    pool: ThreadPoolExecutor,
+    engine_version: str,
+    links: List[StudyLogRecording],
+    guard: Optional[LiveTrafficGuard] = None,
+) -> Dict[str, Any]:
+    """이미 같은 버전으로 채점된 로그는 건너뛰고 나머지를 채점/저장. {"todo", "ok", "failed_ids"}"""
+    ids = [l.log_id for l in links]
+    with Session(engine) as session:
+        done = set(
+            session.exec(
+                select(StudyLogRescore.log_id).where(
+                    StudyLogRescore.engine_version == engine_version,
+                    StudyLogRescore.log_id.in_(ids),
+                )
+            ).all()
+        )
+    todo = [(l.log_id, l.text) for l in links if l.log_id not in done]
+
+    scores = list(pool.map(lambda t: _rescore_one(*t, guard=guard), todo))
+    ok = [(log_id, sc) for (log_id, _), sc in zip(todo, scores) if sc is not None]
+    if ok:
+        with Session(engine) as session:
+            for log_id, sc in ok:
+                session.add(StudyLogRescore(log_id=log_id, engine_version=engine_version, score=sc))
+            session.commit()
+        metrics.inc("rescore_total", len(ok), engine_version=engine_version)
+    return {
+        "todo": len(todo),
+        "ok": len(ok),
+        "failed_ids": [log_id for (log_id, _), sc in zip(todo, scores) if sc is None],
+    }
+
+
+def _retry_failed(
+    pool: ThreadPoolExecutor,
+    state: Dict[str, Any],
+    batch_size: int,
+    checkpoint_path: Path,
+    guard: Optional[LiveTrafficGuard] = None,
+) -> None:
+    """
+    지난 실행에서 실패한 log_id 재채점. 다시 실패한 로그는 목록에 남음.
+    (계속 실패하는 녹음 몇 건 때문에 새 로그 채점이 막히지 않도록 여기서는 중단하지 않음)
+    """
+    pending = list(state["failed_ids"])
+    if not pending:
+        return
+    print(f"[Rescore] 지난번 실패 {len(pending)}건 다시 채점")
+    for i in range(0, len(pending), batch_size):
+        part = pending[i:i + batch_size]
+        with Session(engine) as session:
+            links = session.exec(
+                select(StudyLogRecording).where(StudyLogRecording.log_id.in_(part)).order_by(StudyLogRecording.log_id)
+            ).all()
+        result = _rescore_links(pool, state["engine_version"], links, guard)
+        # 녹음이 없어졌거나 이미 채점된 로그는 목록에서 뺌
+        retried, still = set(part), set(result["failed_ids"])
+        state["failed_ids"] = [log_id for log_id in state["failed_ids"] if log_id not in retried or log_id in still]
+        state["rescored"] += result["ok"]
+        state["failed"] = len(state["failed_ids"])
+        _save_checkpoint(checkpoint_path, state)
+    print(f"[Rescore] 재시도 후 남은 실패 {state['failed']}건")
+
+
+def run_rescore(
+    engine_version: str = ENGINE_VERSION,
+    batch_size: int = 50,
+    concurrency: int = 2,
+    checkpoint_path: Optional[Path] = None,
+    limit: Optional[int] = None,
+    server_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """server_url: 서버 밖(CLI)에서 돌 때 대화형 평가 부하를 확인할 서버 주소 (None/빈 값이면 확인 안 함)"""
+    guard = LiveTrafficGuard(server_url, settings.RESCORE_IDLE_POLL) if server_url else None
+    checkpoint_path = checkpoint_path or (settings.DATA_DIR / f"rescore_{engine_version}.json")
+    state = _load_checkpoint(checkpoint_path, engine_version)
+    print(f"[Rescore] 시작: version={engine_version}, last_log_id={state['last_log_id']}")
+
+    processed = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        _retry_failed(pool, state, batch_size, checkpoint_path, guard)
+        while limit is None or processed < limit:
+            size = batch_size if limit is None else min(batch_size, limit - processed)
+            with Session(engine) as session:
+                links: List[StudyLogRecording] = session.exec(
+                    select(StudyLogRecording)
+                    .where(StudyLogRecording.log_id > state["last_log_id"])
+                    .order_by(StudyLogRecording.log_id)
+                    .limit(size)
+                ).all()
+            if not links:
+                break
+
+            result = _rescore_links(pool, engine_version, links, guard)
+            if result["todo"] and not result["ok"]:
+                # 배치 전체 실패 = 엔진 장애로 보고 체크포인트를 넘기지 않고 중단
+                print("[Rescore] 배치 전체가 실패하여 중단합니다. 엔진 상태를 확인한 뒤 다시 실행하세요.")
+                break
+
+            # 일부 실패는 failed_ids에 남겨 다음 실행 때 다시 채점 (last_log_id는 배치 끝으로 넘김)
+            state["last_log_id"] = links[-1].log_id
+            state["rescored"] += result["ok"]
+            state["skipped"] += len(links) - result["todo"]
+            state["failed_ids"].extend(result["failed_ids"])
+            state["failed"] = len(state["failed_ids"])
+            _save_checkpoint(checkpoint_path, state)
+            processed += len(links)
+            print(f"[Rescore] ~log_id {state['last_log_id']}: 누적 {state['rescored']}건 (실패 {state['failed']})")
+
+    return state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="보관된 녹음 일괄 재채점")
+    parser.add_argument("--engine-version", default=ENGINE_VERSION)
+    parser.add_argument("--batch-size", type=int, default=50)
+    # 실제 동시 엔진 호출 수는 EVAL_BACKGROUND_MAX로도 제한됩니다.
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--server-url", default=settings.RESCORE_SERVER_URL,
+                        help="대화형 평가가 진행 중이면 기다릴 서버 주소 (/metrics 확인, 빈 값이면 확인 안 함)")
+    args = parser.parse_args()
+
+    # 같은 서버에서 돌릴 때 실시간 평가보다 CPU를 덜 쓰도록 낮은 우선순위로 실행
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+    state = run_rescore(
+        engine_version=args.engine_version,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint,
+        limit=args.limit,
+        server_url=args.server_url,
+    )
+    print(f"[Rescore] 완료: {state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# backend/app/services/review_scheduler.py
+"""
+단어 복습 간격 반복 스케줄러 (GET /study/review-set).
+
+(user_id, word)마다 ReviewCard 한 장을 두고, 발음 평가(StudyLog 저장)나 퀴즈 답을 받을 때마다
+SM-2 방식으로 다음 복습 간격과 복습 예정 시각(due_at)을 다시 계산합니다.
+오늘 복습할 카드는 (user_id, due_at) 인덱스 범위 조회 한 번으로 가져옵니다.
+
+채점 -> SM-2 품질(0~5): 발음 점수는 quality_from_score(), 퀴즈는 정답 QUIZ_CORRECT / 오답 QUIZ_WRONG.
+  - 품질 3 이상(통과): 연속 통과 1회차 1일, 2회차 6일, 이후 직전 간격 x ease (최대 MAX_INTERVAL_DAYS)
+  - 품질 3 미만(실패): 연속 통과를 0으로 되돌리고 LAPSE_MINUTES분 뒤 다시 복습
+  - ease는 SM-2 공식으로 조정 (최소 MIN_EASE)
+  - 복습 예정 전에 같은 결과를 반복한 경우(통과 중인 카드를 다시 통과, 실패한 카드를 다시 실패)는
+    한 학습 중 여러 번 연습한 것이므로 간격/ease를 바꾸지 않습니다.
+
+갱신 시점: log_writer가 StudyLog를 저장하는 같은 트랜잭션(apply), 퀴즈 답 제출(record).
+전체 재계산 (backend 폴더에서, 퀴즈 답은 기록이 남지 않아 StudyLog만 반영):
+    python -m app.services.review_scheduler rebuild [--user USER_ID]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, tuple_
+from sqlmodel import Session, select
+
+from app.core.storage import dialect_insert
+from app.models import ReviewCard
+from app.services import log_archive
+
+MIN_EASE = 1.3
+DEFAULT_EASE = 2.5
+LAPSE_MINUTES = 10
+MAX_INTERVAL_DAYS = 365
+QUIZ_CORRECT = 4
+QUIZ_WRONG = 1
+
+_STATE = ("reps", "lapses", "ease", "interval_days", "due_at", "last_reviewed_at")
+
+Review = Tuple[str, str, int, datetime]  # (user_id, word, 품질, 시각)
+
+
+def quality_from_score(score: float) -> int:
+    """발음 점수(0~100) -> SM-2 품질. 70점(복습 필요 기준) 이상이 통과"""
+    for q, cutoff in ((5, 90), (4, 80), (3, 70), (2, 50), (1, 30)):
+        if score >= cutoff:
+            return q
+    return 0
+
+
+def _new_card(at: datetime) -> Dict[str, Any]:
+    return {"reps": 0, "lapses": 0, "ease": DEFAULT_EASE, "interval_days": 0.0, "due_at": at, "last_reviewed_at": at}
+
+
+def step(card: Optional[Dict[str, Any]], quality: int, at: datetime) -> Dict[str, Any]:
+    """카드 상태(None이면 새 카드)에 복습 한 번을 반영한 새 상태"""
+    passed = quality >= 3
+    if card is None:
+        card = _new_card(at)
+    else:
+        card = dict(card)
+        early = at < card["due_at"]
+        if early and passed == (card["reps"] > 0):
+            card["last_reviewed_at"] = at
+            if not passed:
+                card["due_at"] = at + timedelta(minutes=LAPSE_MINUTES)
+            return card
+
+    card["ease"] = max(MIN_EASE, card["ease"] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if passed:
+        card["reps"] += 1
+        if card["reps"] == 1:
+            interval = 1.0
+        elif card["reps"] == 2:
+            interval = 6.0
+        else:
+            interval = round(card["interval_days"] * card["ease"], 1)
+        card["interval_days"] = min(float(MAX_INTERVAL_DAYS), interval)
+        card["due_at"] = at + timedelta(days=card["interval_days"])
+    else:
+        if card["reps"] > 0:
+            card["lapses"] += 1
+        card["reps"] = 0
+        card["interval_days"] = 0.0
+        card["due_at"] = at + timedelta(minutes=LAPSE_MINUTES)
+    card["last_reviewed_at"] = at
+    return card
+
+
+def _load(session: Session, keys: List[Tuple[str, str]], chunk: int = 400) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """기존 카드 상태. PostgreSQL에서는 퀴즈 답과 동시에 갱신되지 않도록 행 잠금"""
+    conn = session.connection()
+    cards = {}
+    for i in range(0, len(keys), chunk):
+        stmt = (
+            select(ReviewCard)
+            .where(tuple_(ReviewCard.user_id, ReviewCard.word).in_(keys[i:i + chunk]))
+            .with_for_update()
+        )
+        for row in conn.execute(stmt).mappings():
+            cards[(row["user_id"], row["word"])] = {c: row[c] for c in _STATE}
+    return cards
+
+
+def review(session: Session, reviews: Iterable[Review]) -> int:
+    """복습 결과(시간 순) 묶음을 카드에 반영. 호출한 쪽에서 commit"""
+    grouped: Dict[Tuple[str, str], List[Tuple[int, datetime]]] = {}
+    for user_id, word, quality, at in reviews:
+        grouped.setdefault((user_id, word), []).append((quality, at))
+    if not grouped:
+        return 0
+
+    cards = _load(session, list(grouped))
+    params = []
+    for key, items in grouped.items():
+        card = cards.get(key)
+        for quality, at in items:
+            card = step(card, quality, at)
+        params.append({"user_id": key[0], "word": key[1], **card})
+
+    conn = session.connection()
+    stmt = dialect_insert(conn)(ReviewCard)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "word"],
+            set_={c: getattr(stmt.excluded, c) for c in _STATE},
+        ),
+        params,
+    )
+    return len(params)
+
+
+def apply(session: Session, rows: Iterable[Dict[str, Any]]) -> int:
+    """StudyLog 행(user_id, word, score, created_at) 묶음을 카드에 반영 (log_writer)"""
+    return review(session, (
+        (row["user_id"], row["word"], quality_from_score(float(row["score"])), row["created_at"]) for row in rows
+    ))
+
+
+def record(session: Session, user_id: str, word: str, quality: int, at: Optional[datetime] = None) -> Dict[str, Any]:
+    """퀴즈 답 등 StudyLog 없이 들어오는 복습 한 번 (commit은 호출한 쪽에서). 갱신된 카드 상태 반환"""
+    at = at or datetime.now()
+    review(session, [(user_id, word, quality, at)])
+    return _load(session, [(user_id, word)])[(user_id, word)]
+
+
+def rebuild(session: Session, user_id: Optional[str] = None, chunk: int = 5000) -> int:
+    """카드를 비우고 StudyLog(보관분 포함, id 순)로 다시 계산. 처리한 로그 수를 반환"""
+    stmt = delete(ReviewCard)
+    if user_id is not None:
+        stmt = stmt.where(ReviewCard.user_id == user_id)
+    session.connection().execute(stmt)
+
+    total = 0
+    for rows in log_archive.iter_logs(session, user_id, chunk=chunk):
+        apply(session, rows)
+        total += len(rows)
+    return total
+
+
+# ----------------------------------------------------------------------
+# 조회
+# ----------------------------------------------------------------------
+def end_of_day(now: datetime) -> datetime:
+    """오늘 복습 대상 기준: 내일 0시 전에 예정된 카드"""
+    return datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+
+
+def due_cards(session: Session, user_id: str, until: datetime, limit: int) -> List[ReviewCard]:
+    """until 전에 복습 예정인 카드, 오래 밀린 순"""
+    return session.exec(
+        select(ReviewCard)
+        .where(ReviewCard.user_id == user_id, ReviewCard.due_at < until)
+        .order_by(ReviewCard.due_at.asc(), ReviewCard.word.asc())
+        .limit(limit)
+    ).all()
+
+
+def due_count(session: Session, user_id: str, until: datetime) -> int:
+    return session.exec(
+        select(func.count()).where(ReviewCard.user_id == user_id, ReviewCard.due_at < until)
+    ).one()
+
+
+def main() -> None:
+    from app.core.database import engine
+
+    parser = argparse.ArgumentParser(description="단어 복습 카드 관리")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--user", default=None, help="이 사용자만 다시 계산")
+    args = parser.parse_args()
+    if args.command == "rebuild":
+        started = time.time()
+        with Session(engine) as session:
+            n = rebuild(session, args.user)
+            session.commit()
+        print(f"[ReviewScheduler] StudyLog {n}행으로 복습 카드 재계산 완료 ({time.time() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# backend/app/services/rollups.py
+"""
+학습 통계 집계 테이블 (GET /study/stats).
+
+StudyLog 전체를 읽어 파이썬에서 계산하던 통계를 아래 집계 테이블에서 바로 읽습니다.
+  - StudyDailyStat : (user_id, day) 시도 수, 점수 합, 점수 구간(high/mid/low), 서로 다른 단어 수
+  - StudyDailyWord : (user_id, day, word) + 마지막 학습 시각, 최근 7일 서로 다른 단어 수 계산용
+  - StudyUserTotal : user_id 누적 시도 수/점수 합/점수 구간
+log_writer가 StudyLog를 저장하는 같은 트랜잭션에서 apply()로 증분 갱신하므로,
+/study/stats 는 누적 1행 + 최근 366일 이하의 일별 행 + 최근 7일 단어 행만 읽습니다 (기록 길이와 무관).
+
+집계가 어긋났거나 기존 DB를 처음 채울 때 (backend 폴더에서):
+    python -m app.services.rollups rebuild [--user USER_ID]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, case, delete, func, update
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.storage import dialect_insert
+from app.models import StudyDailyStat, StudyDailyWord, StudyUserTotal
+from app.services import log_archive, student_summary
+
+HIGH_SCORE = 90  # 이상: 완전 암기
+MID_SCORE = 70   # 이상: 복습 필요, 미만: 다시 학습
+STREAK_WINDOW_DAYS = 366
+
+_COUNTERS = ("attempts", "score_sum", "high", "mid", "low")
+
+
+def bucket(score: float) -> str:
+    if score >= HIGH_SCORE:
+        return "high"
+    if score >= MID_SCORE:
+        return "mid"
+    return "low"
+
+
+def _upsert_add(insert, model, keys: Tuple[str, ...]):
+    stmt = insert(model)
+    return stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={c: getattr(model, c) + getattr(stmt.excluded, c) for c in _COUNTERS},
+    )
+
+
+def apply(session: Session, rows: Iterable[Dict[str, Any]]) -> int:
+    """StudyLog 행(user_id, word, score, created_at) 묶음을 집계 테이블에 더함. 호출한 쪽에서 commit"""
+    daily: Dict[Tuple[str, date], Dict[str, float]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    totals: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    words: Dict[Tuple[str, date, str], datetime] = {}
+    n = 0
+    for row in rows:
+        day = row["created_at"].date()
+        score = float(row["score"])
+        for acc in (daily[(row["user_id"], day)], totals[row["user_id"]]):
+            acc["attempts"] += 1
+            acc["score_sum"] += score
+            acc[bucket(score)] += 1
+        key = (row["user_id"], day, row["word"])
+        words[key] = max(words.get(key, row["created_at"]), row["created_at"])
+        n += 1
+    if not n:
+        return 0
+
+    # ORM 일괄 갱신 규칙을 피하려고 Core 연결에서 executemany로 실행
+    conn = session.connection()
+    insert = dialect_insert(conn)
+    word_stmt = insert(StudyDailyWord)
+    conn.execute(
+        word_stmt.on_conflict_do_update(
+            index_elements=["user_id", "day", "word"],
+            set_={"last_at": case(
+                (word_stmt.excluded.last_at > StudyDailyWord.last_at, word_stmt.excluded.last_at),
+                else_=StudyDailyWord.last_at,
+            )},
+        ),
+        [{"user_id": u, "day": d, "word": w, "last_at": at} for (u, d, w), at in words.items()],
+    )
+    conn.execute(
+        _upsert_add(insert, StudyDailyStat, ("user_id", "day")),
+        [{"user_id": u, "day": d, "words": 0, **acc} for (u, d), acc in daily.items()],
+    )
+    conn.execute(
+        _upsert_add(insert, StudyUserTotal, ("user_id",)),
+        [{"user_id": u, **acc} for u, acc in totals.items()],
+    )
+    word_count = (
+        select(func.count())
+        .where(StudyDailyWord.user_id == bindparam("u"), StudyDailyWord.day == bindparam("d"))
+        .scalar_subquery()
+    )
+    conn.execute(
+        update(StudyDailyStat)
+        .where(StudyDailyStat.user_id == bindparam("u"), StudyDailyStat.day == bindparam("d"))
+        .values(words=word_count),
+        [{"u": u, "d": d} for u, d in daily],
+    )
+    # 선생님 대시보드 평균 점수
+    student_summary.refresh(conn, totals.keys())
+    return n
+
+
+def rebuild(session: Session, user_id: Optional[str] = None, chunk: int = 5000) -> int:
+    """집계 테이블을 비우고 StudyLog 전체(또는 한 사용자, 보관분 포함)로 다시 계산. 처리한 로그 수를 반환"""
+    for model in (StudyDailyWord, StudyDailyStat, StudyUserTotal):
+        stmt = delete(model)
+        if user_id is not None:
+            stmt = stmt.where(model.user_id == user_id)
+        session.connection().execute(stmt)
+
+    total = 0
+    for rows in log_archive.iter_logs(session, user_id, chunk=chunk):
+        total += apply(session, rows)
+    return total
+
+
+# ----------------------------------------------------------------------
+# 조회
+# ----------------------------------------------------------------------
+def _streak(days_desc: List[date], today: date) -> int:
+    """가장 최근 학습일이 오늘/어제이면 그날부터 끊기지 않은 연속 학습일 수"""
+    if not days_desc or (today - days_desc[0]).days > 1:
+        return 0
+    streak = 1
+    for newer, older in zip(days_desc, days_desc[1:]):
+        if (newer - older).days != 1:
+            break
+        streak += 1
+    return streak
+
+
+async def student_stats(db: AsyncSession, user_id: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    누적 집계 + 일별 집계로 통계 계산.
+    streak는 최근 STREAK_WINDOW_DAYS일 안에서만 셉니다.
+    """
+    now = now or datetime.now()
+    today = now.date()
+    week_ago = now - timedelta(days=7)
+    start_of_week = today - timedelta(days=today.weekday())
+
+    total = await db.get(StudyUserTotal, user_id)
+    days = (await db.exec(
+        select(StudyDailyStat.day, StudyDailyStat.attempts)
+        .where(StudyDailyStat.user_id == user_id, StudyDailyStat.day >= today - timedelta(days=STREAK_WINDOW_DAYS))
+        .order_by(StudyDailyStat.day.desc())
+    )).all()
+    weekly_learned = (await db.exec(
+        select(func.count(func.distinct(StudyDailyWord.word)))
+        .where(
+            StudyDailyWord.user_id == user_id,
+            StudyDailyWord.day >= week_ago.date(),
+            StudyDailyWord.last_at >= week_ago,
+        )
+    )).one()
+
+    weekly_counts = [0] * 7  # 0:월 ~ 6:일
+    for day, attempts in days:
+        if start_of_week <= day <= start_of_week + timedelta(days=6):
+            weekly_counts[day.weekday()] += attempts
+
+    return {
+        "attempts": total.attempts if total else 0,
+        "avg_score": (total.score_sum / total.attempts) if total and total.attempts else 0.0,
+        "buckets": {"high": total.high, "mid": total.mid, "low": total.low} if total else {"high": 0, "mid": 0, "low": 0},
+        "streak": _streak([d for d, _ in days], today),
+        "weekly_learned": int(weekly_learned or 0),
+        "weekly_counts": weekly_counts,
+    }
+
+
+def main() -> None:
+    from app.core.database import engine
+
+    parser = argparse.ArgumentParser(description="학습 통계 집계 테이블 관리")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--user", default=None, help="이 사용자만 다시 계산")
+    args = parser.parse_args()
+    if args.command == "rebuild":
+        started = time.time()
+        with Session(engine) as session:
+            n = rebuild(session, args.user)
+            session.commit()
+        print(f"[Rollup] StudyLog {n}행으로 집계 재계산 완료 ({time.time() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
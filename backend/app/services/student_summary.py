@@ -0,0 +1,181 @@
+# backend/app/services/student_summary.py
+"""
+선생님 대시보드용 학생 요약 (GET /api/teacher/students).
+
+학생마다 StudyProgress / avg(StudyLog.score)를 따로 조회하던 방식(2N+1 쿼리) 대신
+StudentSummary 한 테이블에 (담당 선생님, 이름, 진도, 평균 점수)를 유지하고
+(teacher_id, 정렬 컬럼, user_id) 인덱스로 키셋 페이지네이션합니다. 한 페이지 조회는 반 크기와 무관하게
+인덱스 범위 스캔 1회입니다.
+
+갱신 시점 (모두 원본 변경과 같은 트랜잭션):
+  - 학생 생성/프로필 변경/삭제 (auth, user, study.get_words, 기본 계정)
+  - 진도 변경 (study.complete)
+  - StudyLog 저장 (rollups.apply -> StudyUserTotal 기준 평균 점수)
+전체 재계산: python -m app.services.student_summary rebuild
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, insert, or_
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import StudentSummary, StudyProgress, StudyUserTotal, User
+
+SORT_COLUMNS = {
+    "score": StudentSummary.avg_score,
+    "progress": StudentSummary.progress_rate,
+    "name": StudentSummary.name,
+}
+
+
+def progress_rate(current_page: int) -> float:
+    return min(1.0, ((current_page - 1) * 10) / 100)
+
+
+def refresh(conn: Connection, user_ids: Optional[Iterable[str]] = None, chunk: int = 500) -> int:
+    """user_ids(None이면 전체 학생)의 요약 행을 원본 테이블에서 다시 계산. 학생이 아니거나 없는 사용자는 행 삭제"""
+    if user_ids is None:
+        conn.execute(delete(StudentSummary))
+        ids = None
+    else:
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return 0
+
+    # 사용자별 가장 최근 진도 (GET /study/current-progress 와 같은 기준)
+    latest = (
+        select(StudyProgress.level, StudyProgress.current_page)
+        .where(StudyProgress.user_id == User.uid)
+        .order_by(StudyProgress.updated_at.desc(), StudyProgress.id.desc())
+        .limit(1)
+    )
+    stmt = (
+        select(
+            User.uid, User.teacher_id, User.name, User.country,
+            latest.with_only_columns(StudyProgress.level).scalar_subquery(),
+            latest.with_only_columns(StudyProgress.current_page).scalar_subquery(),
+            StudyUserTotal.attempts, StudyUserTotal.score_sum,
+        )
+        .outerjoin(StudyUserTotal, StudyUserTotal.user_id == User.uid)
+        .where(User.role == "student")
+    )
+
+    n = 0
+    now = datetime.now()
+    for part in ([None] if ids is None else [ids[i:i + chunk] for i in range(0, len(ids), chunk)]):
+        part_stmt = stmt if part is None else stmt.where(User.uid.in_(part))
+        if part is not None:
+            conn.execute(delete(StudentSummary).where(StudentSummary.user_id.in_(part)))
+        rows = [
+            {
+                "user_id": uid,
+                "teacher_id": teacher_id,
+                "name": name or "",
+                "country": country or "KR",
+                "level": level or "미시작",
+                "current_page": page or 1,
+                "progress_rate": progress_rate(page or 1),
+                "attempts": attempts or 0,
+                "avg_score": round(score_sum / attempts, 1) if attempts else 0.0,
+                "updated_at": now,
+            }
+            for uid, teacher_id, name, country, level, page, attempts, score_sum in conn.execute(part_stmt)
+        ]
+        if rows:
+            conn.execute(insert(StudentSummary), rows)
+        n += len(rows)
+    return n
+
+
+async def refresh_async(session: AsyncSession, user_ids: Iterable[str]) -> None:
+    """AsyncSession의 현재 트랜잭션 안에서 refresh (commit은 호출한 쪽에서)"""
+    ids = list(user_ids)
+    await session.flush()
+    await session.run_sync(lambda s: refresh(s.connection(), ids))
+
+
+# ----------------------------------------------------------------------
+# 키셋 페이지네이션
+# ----------------------------------------------------------------------
+def encode_cursor(value: Any, user_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, user_id], ensure_ascii=False).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    value, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return value, user_id
+
+
+def aggregate(session: Session, teacher_id: Optional[str]) -> Tuple[int, float]:
+    """(학생 수, 평균 진도율 0~1). 대시보드 상단 통계용이라 불러온 페이지가 아니라 담당 학생 전체 기준"""
+    stmt = select(func.count(), func.avg(StudentSummary.progress_rate))
+    if teacher_id is not None:
+        stmt = stmt.where(StudentSummary.teacher_id == teacher_id)
+    total, avg_progress = session.exec(stmt).one()
+    return total, round(avg_progress or 0.0, 4)
+
+
+def list_page(
+    session: Session,
+    teacher_id: Optional[str],
+    sort: str = "name",
+    order: str = "asc",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+) -> Tuple[List[StudentSummary], Optional[str]]:
+    """
+    (행 목록, 다음 커서). teacher_id가 None이면 전체 학생(관리자), q가 있으면 이름에 q가 들어간 학생만.
+    정렬 키가 같은 학생은 user_id 순으로 이어지므로 페이지 사이에 누락/중복이 없습니다.
+    """
+    col = SORT_COLUMNS[sort]
+    desc = order == "desc"
+    stmt = select(StudentSummary)
+    if teacher_id is not None:
+        stmt = stmt.where(StudentSummary.teacher_id == teacher_id)
+    if q:
+        stmt = stmt.where(StudentSummary.name.contains(q, autoescape=True))
+    if cursor:
+        value, last_uid = decode_cursor(cursor)
+        if desc:
+            stmt = stmt.where(or_(col < value, and_(col == value, StudentSummary.user_id < last_uid)))
+        else:
+            stmt = stmt.where(or_(col > value, and_(col == value, StudentSummary.user_id > last_uid)))
+    stmt = stmt.order_by(
+        col.desc() if desc else col.asc(),
+        StudentSummary.user_id.desc() if desc else StudentSummary.user_id.asc(),
+    ).limit(limit + 1)
+
+    rows = session.exec(stmt).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, col.key), last.user_id)
+    return rows, next_cursor
+
+
+def main() -> None:
+    from app.core.database import engine
+
+    parser = argparse.ArgumentParser(description="선생님 대시보드 학생 요약 관리")
+    parser.add_argument("command", choices=["rebuild"])
+    args = parser.parse_args()
+    if args.command == "rebuild":
+        started = time.time()
+        with Session(engine) as session:
+            n = refresh(session.connection())
+            session.commit()
+        print(f"[StudentSummary] 학생 {n}명 요약 재계산 완료 ({time.time() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
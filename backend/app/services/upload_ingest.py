@@ -0,0 +1,164 @@
+# backend/app/services/upload_ingest.py
+"""
+녹음 업로드 수집(ingestion) 단계.
+
+- 업로드를 청크 단위로 읽으며 최대 크기(UPLOAD_MAX_BYTES)를 넘으면 즉시 중단
+- 처음 몇 바이트(magic bytes)로 컨테이너 형식을 판별, 오디오가 아니면 즉시 거절
+- 데이터는 SpooledTemporaryFile에 보관: UPLOAD_SPOOL_BYTES 이하면 메모리, 넘으면 디스크
+- 디스크 파일이 필요할 때(ffmpeg 변환)만 save_to()로 uuid 파일명으로 내려씀
+  (클라이언트가 보낸 file.filename은 경로에 절대 사용하지 않음)
+- spool/저장 파일은 UPLOAD_WORK_DIR (정적 파일로 공개되지 않는 폴더)에만 둠
+"""
+from __future__ import annotations
+
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Union
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 16
+
+# 형식 이름 -> 저장 시 사용할 확장자
+AUDIO_FORMATS: Dict[str, str] = {
+    "wav": ".wav",
+    "webm": ".webm",
+    "ogg": ".ogg",
+    "mp4": ".m4a",
+    "mp3": ".mp3",
+    "flac": ".flac",
+}
+
+
+class UploadRejected(Exception):
+    def __init__(self, code: str, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"success": False, "code": self.code, "error": self.message}
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """magic bytes로 컨테이너 형식 판별. 모르면 None"""
+    if len(head) >= 12 and head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"\x1a\x45\xdf\xa3":  # EBML (webm/matroska)
+        return "webm"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if len(head) >= 8 and head[4:8] == b"ftyp":  # mp4/m4a (Safari 녹음)
+        return "mp4"
+    if head[:3] == b"ID3" or (len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0):
+        return "mp3"
+    return None
+
+
+class IngestedUpload:
+    """검증을 통과한 업로드. with 블록이나 close()로 정리합니다."""
+
+    def __init__(self, spool: "tempfile.SpooledTemporaryFile[bytes]", size: int, fmt: str):
+        self._spool = spool
+        self.size = size
+        self.format = fmt
+
+    @property
+    def extension(self) -> str:
+        return AUDIO_FORMATS.get(self.format, ".bin")
+
+    @property
+    def in_memory(self) -> bool:
+        return not getattr(self._spool, "_rolled", False)
+
+    def read_bytes(self) -> bytes:
+        self._spool.seek(0)
+        return self._spool.read()
+
+    def save_to(self, directory: Union[str, Path], prefix: str = "up_") -> Path:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{prefix}{uuid.uuid4().hex}{self.extension}"
+        self._spool.seek(0)
+        with open(path, "wb") as f:
+            shutil.copyfileobj(self._spool, f, CHUNK_SIZE)
+        return path
+
+    def close(self) -> None:
+        try:
+            self._spool.close()
+        except Exception:
+            pass
+
+    def __enter__(self) -> "IngestedUpload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _reject(code: str, message: str, status_code: int) -> UploadRejected:
+    metrics.inc("upload_rejected_total", code=code)
+    return UploadRejected(code, message, status_code)
+
+
+async def ingest_upload(
+    upload: UploadFile,
+    max_bytes: Optional[int] = None,
+    spool_bytes: Optional[int] = None,
+    allowed: FrozenSet[str] = frozenset(AUDIO_FORMATS),
+) -> IngestedUpload:
+    max_bytes = settings.UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    spool_bytes = settings.UPLOAD_SPOOL_BYTES if spool_bytes is None else spool_bytes
+
+    too_large = f"녹음 파일이 너무 큽니다. (최대 {max_bytes // (1024 * 1024)}MB)"
+
+    # 크기를 미리 알 수 있으면 읽기 전에 거절
+    if upload.size is not None and upload.size > max_bytes:
+        raise _reject("UPLOAD_TOO_LARGE", too_large, 413)
+
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_bytes, dir=str(settings.UPLOAD_WORK_DIR))
+    total = 0
+    head = b""
+    fmt: Optional[str] = None
+    try:
+        while True:
+            chunk = await upload.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > max_bytes:
+                raise _reject("UPLOAD_TOO_LARGE", too_large, 413)
+
+            if fmt is None and len(head) < SNIFF_BYTES:
+                head += chunk[: SNIFF_BYTES - len(head)]
+                if len(head) >= SNIFF_BYTES:
+                    fmt = sniff_format(head)
+                    if fmt is None or fmt not in allowed:
+                        raise _reject("UNSUPPORTED_FORMAT", "지원하지 않는 오디오 형식입니다.", 415)
+
+            spool.write(chunk)
+
+        if total == 0:
+            raise _reject("EMPTY_UPLOAD", "녹음 데이터가 비어 있습니다.", 400)
+        if fmt is None:
+            fmt = sniff_format(head)
+            if fmt is None or fmt not in allowed:
+                raise _reject("UNSUPPORTED_FORMAT", "지원하지 않는 오디오 형식입니다.", 415)
+    except BaseException:
+        spool.close()
+        raise
+
+    metrics.inc("upload_accepted_total", format=fmt)
+    metrics.inc("upload_bytes_total", total)
+    return IngestedUpload(spool, total, fmt)
@@ -0,0 +1,130 @@
+# backend/app/services/upload_janitor.py
+"""
+임시 업로드 작업 폴더(UPLOAD_WORK_DIR) 정리기.
+
+- TTL(UPLOAD_TTL_SECONDS)보다 오래된 파일 삭제
+- 폴더 총 용량이 UPLOAD_DIR_QUOTA_BYTES를 넘으면 오래된 파일부터 삭제
+  (단, 처리 중일 수 있는 최근 파일(UPLOAD_MIN_AGE_SECONDS 이내)은 건드리지 않음)
+- 예전 버전이 /files로 공개되는 TEMP_UPLOAD_DIR에 남긴 작업 파일(LEGACY_PUBLIC_PREFIXES)도
+  TTL이 지나면 삭제 (그 폴더의 다른 파일은 건드리지 않음)
+- 서버 lifespan에서 run_forever()를 백그라운드 태스크로 실행합니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+def _list_files(directory: Path) -> List[Tuple[float, int, str]]:
+    out: List[Tuple[float, int, str]] = []
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, path))
+    return out
+
+
+# 작업 폴더가 UPLOAD_WORK_DIR로 옮겨지기 전에 TEMP_UPLOAD_DIR에 쓰던 파일 이름
+# (업로드 원본/변환본 up_*, 보관 압축 arc_*, 재채점 rescore_*, 업로드 spool tmp*, 녹음 rec_*)
+LEGACY_PUBLIC_PREFIXES = ("up_", "arc_", "rescore_", "tmp", "rec_")
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+def sweep(
+    directory: Union[str, Path],
+    ttl_seconds: Optional[float] = None,
+    quota_bytes: Optional[int] = None,
+    min_age_seconds: Optional[float] = None,
+) -> Dict[str, int]:
+    directory = Path(directory)
+    ttl_seconds = settings.UPLOAD_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    quota_bytes = settings.UPLOAD_DIR_QUOTA_BYTES if quota_bytes is None else quota_bytes
+    min_age_seconds = settings.UPLOAD_MIN_AGE_SECONDS if min_age_seconds is None else min_age_seconds
+
+    result = {"expired": 0, "evicted": 0, "freed_bytes": 0, "remaining_bytes": 0}
+    if not directory.exists():
+        return result
+
+    now = time.time()
+    kept: List[Tuple[float, int, str]] = []
+    for mtime, size, path in _list_files(directory):
+        if now - mtime > ttl_seconds:
+            if _remove(path):
+                result["expired"] += 1
+                result["freed_bytes"] += size
+                continue
+        kept.append((mtime, size, path))
+
+    total = sum(size for _, size, _ in kept)
+    if total > quota_bytes:
+        for mtime, size, path in sorted(kept):
+            if total <= quota_bytes:
+                break
+            if now - mtime < min_age_seconds:
+                break
+            if _remove(path):
+                total -= size
+                result["evicted"] += 1
+                result["freed_bytes"] += size
+
+    result["remaining_bytes"] = total
+    metrics.inc("upload_janitor_removed_total", result["expired"], reason="ttl")
+    metrics.inc("upload_janitor_removed_total", result["evicted"], reason="quota")
+    metrics.set("upload_dir_bytes", total)
+    return result
+
+
+def sweep_legacy_public(directory: Union[str, Path, None] = None, ttl_seconds: Optional[float] = None) -> int:
+    """공개 폴더 최상위에서 LEGACY_PUBLIC_PREFIXES로 시작하고 TTL이 지난 파일 삭제. 삭제 개수 반환"""
+    directory = Path(settings.TEMP_UPLOAD_DIR if directory is None else directory)
+    ttl_seconds = settings.UPLOAD_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    if not directory.exists():
+        return 0
+
+    now = time.time()
+    removed = 0
+    for entry in os.scandir(directory):
+        if not entry.name.startswith(LEGACY_PUBLIC_PREFIXES):
+            continue
+        try:
+            if not entry.is_file(follow_symlinks=False) or now - entry.stat().st_mtime <= ttl_seconds:
+                continue
+        except OSError:
+            continue
+        if _remove(entry.path):
+            removed += 1
+    metrics.inc("upload_janitor_removed_total", removed, reason="legacy_public")
+    return removed
+
+
+async def run_forever(directory: Union[str, Path, None] = None, interval: Optional[float] = None) -> None:
+    directory = settings.UPLOAD_WORK_DIR if directory is None else directory
+    interval = settings.UPLOAD_JANITOR_INTERVAL if interval is None else interval
+    while True:
+        try:
+            result = await asyncio.to_thread(sweep, directory)
+            if result["expired"] or result["evicted"]:
+                print(f"[Janitor] 임시 파일 정리: {result}")
+            legacy = await asyncio.to_thread(sweep_legacy_public)
+            if legacy:
+                print(f"[Janitor] 공개 폴더({settings.TEMP_UPLOAD_DIR})에 남은 예전 작업 파일 {legacy}개 삭제")
+        except Exception as e:
+            print(f"[Janitor] 정리 실패: {e}")
+        await asyncio.sleep(interval)
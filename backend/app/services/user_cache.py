@@ -0,0 +1,278 @@
+# backend/app/services/user_cache.py
+"""
+사용자(User) 조회 캐시.
+
+거의 모든 요청이 session.get(User, uid)로 이름/역할/담당 선생님을 다시 읽으므로,
+비밀번호와 progress를 뺀 사용자 정보(CachedUser)를 TTL(USER_CACHE_TTL초) 동안 캐시합니다.
+  - 쓰기(프로필, 비밀번호, 승인, 담당 선생님 변경, 탈퇴)는 commit 후 invalidate(uid)
+  - 없는 사용자는 캐시하지 않음 (get_words 등에서 바로 만들어질 수 있음)
+  - 적중률: GET /metrics 의 "user_cache"
+
+저장소 (USER_CACHE_URL):
+  - ""                 : 프로세스 메모리 LRU (USER_CACHE_SIZE개, 워커 1개일 때)
+  - "file:///경로"     : 같은 서버의 워커들이 함께 쓰는 파일 캐시 (공유 캐시 서버가 없을 때 대용)
+  - "redis://host/db"  : Redis (redis 패키지 필요, 여러 서버)
+메모리 LRU를 워커 여러 개에서 쓰면 다른 워커의 변경은 최대 TTL만큼 늦게 보입니다.
+권한이 걸린 재확인(낡은 세션 토큰 재발급 등)은 캐시 대신 DB를 직접 읽으세요.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models import User
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """User의 읽기 전용 사본 (pw, progress 제외). 속성 이름은 User와 같음"""
+    uid: str
+    name: str
+    role: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    country: Optional[str] = None
+    teacher_id: Optional[str] = None
+    is_approved: bool = True
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(
+            uid=user.uid, name=user.name, role=user.role, email=user.email, phone=user.phone,
+            country=user.country, teacher_id=user.teacher_id, is_approved=user.is_approved,
+            created_at=user.created_at,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat() if self.created_at else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedUser":
+        data = dict(data)
+        data["created_at"] = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
+        return cls(**data)
+
+
+# ----------------------------------------------------------------------
+# 저장소
+# ----------------------------------------------------------------------
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._items)
+
+
+class FileBackend:
+    """항목마다 JSON 파일 하나 (임시 파일 -> 교체). 같은 서버의 여러 워커가 공유"""
+    name = "file"
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                item = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if item["expires"] <= time.time():
+            self.delete(key)
+            return None
+        return item["value"]
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"expires": time.time() + ttl, "value": value}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def size(self) -> Optional[int]:
+        return sum(1 for _ in self.directory.glob("*.json"))
+
+
+class RedisBackend:
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis  # 선택 의존성
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self._prefix = "justvoca:user:"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self._client.get(self._prefix + key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        self._client.set(self._prefix + key, json.dumps(value, ensure_ascii=False), ex=max(1, int(ttl)))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(self._prefix + "*"):
+            self._client.delete(key)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+def make_backend(url: str):
+    if not url:
+        return MemoryBackend(settings.USER_CACHE_SIZE)
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        return FileBackend(Path(parsed.path))
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    raise ValueError(f"지원하지 않는 USER_CACHE_URL: {url}")
+
+
+# ----------------------------------------------------------------------
+# 캐시
+# ----------------------------------------------------------------------
+class UserCache:
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _lookup(self, uid: str) -> Optional[CachedUser]:
+        if self.ttl <= 0:
+            return None
+        try:
+            data = self.backend.get(uid)
+        except Exception as e:  # 캐시 서버 장애는 DB 조회로 대체
+            self._count("errors")
+            print(f"[UserCache] 조회 실패: {e}")
+            return None
+        if data is None:
+            return None
+        self._count("hits")
+        return CachedUser.from_dict(data)
+
+    def _store(self, user: Optional[User]) -> Optional[CachedUser]:
+        self._count("misses")
+        if user is None:
+            return None
+        cached = CachedUser.from_user(user)
+        if self.ttl > 0:
+            try:
+                self.backend.set(user.uid, cached.to_dict(), self.ttl)
+            except Exception as e:
+                self._count("errors")
+                print(f"[UserCache] 저장 실패: {e}")
+        return cached
+
+    def get(self, session: Session, uid: Optional[str]) -> Optional[CachedUser]:
+        if not uid:
+            return None
+        return self._lookup(uid) or self._store(session.get(User, uid))
+
+    async def get_async(self, session: AsyncSession, uid: Optional[str]) -> Optional[CachedUser]:
+        if not uid:
+            return None
+        return self._lookup(uid) or self._store(await session.get(User, uid))
+
+    def invalidate(self, *uids: Optional[str]) -> None:
+        """사용자 정보를 바꾼 쓰기의 commit 뒤에 호출"""
+        for uid in uids:
+            if not uid:
+                continue
+            self._count("invalidations")
+            try:
+                self.backend.delete(uid)
+            except Exception as e:
+                self._count("errors")
+                print(f"[UserCache] 무효화 실패: {e}")
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        total = stats["hits"] + stats["misses"]
+        return {
+            "backend": self.backend.name,
+            "size": self.backend.size() if self.backend.name == "memory" else None,
+            "max_size": settings.USER_CACHE_SIZE if self.backend.name == "memory" else None,
+            "ttl": self.ttl,
+            **stats,
+            "hit_rate": round(stats["hits"] / total, 4) if total else 0.0,
+        }
+
+
+user_cache = UserCache(make_backend(settings.USER_CACHE_URL), settings.USER_CACHE_TTL)
+metrics.register_gauge("user_cache", user_cache.stats)
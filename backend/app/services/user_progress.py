@@ -0,0 +1,223 @@
+# backend/app/services/user_progress.py
+"""
+사용자 설정/학습 상태 (예전 User.progress JSON).
+
+User.progress 하나에 settings / topics / last_session / today_flags 를 모두 넣으면 설정 한 항목을 바꿀 때도
+전체 dict를 복사해 다시 써야 했습니다. 지금은 항목 단위 테이블에 나눠 저장하고 바뀐 행만 upsert 합니다.
+  - settings[key]                      -> UserSetting (user_id, key)
+  - progress[key] (settings/topics 외) -> UserState (user_id, key)
+  - topics[t]["stats"][key]            -> UserTopicStat (user_id, topic, key)
+  - topics[t]["learned"][word]         -> UserLearnedWord (user_id, topic, word)
+  - topics[t]["wrong_notes"]           -> UserWrongNote (추가만)
+compose()는 예전과 같은 모양의 dict를 다시 만들어 주는 호환 조회입니다 (GET /user/{id}/progress).
+
+함수는 동기 Session 기준이고 호출한 쪽에서 commit 합니다. AsyncSession에서는 app.core.database.run_async(session, fn, ...).
+기존 User.progress 이전: 마이그레이션 007 또는 (backend 폴더에서)
+    python -m app.services.user_progress import-blobs
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, insert, update
+from sqlmodel import Session, select
+
+from app.core.storage import dialect_insert
+from app.models import User, UserLearnedWord, UserSetting, UserState, UserTopicStat, UserWrongNote
+
+DEFAULT_SETTINGS: Dict[str, Any] = {"goal": 10, "review_wrong": True}
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"  # 예전 JSON의 last_seen / ts 형식
+
+_TABLES = (UserSetting, UserState, UserTopicStat, UserLearnedWord, UserWrongNote)
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime) or value is None:
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _format_time(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime(TIME_FORMAT) if value else None
+
+
+def _upsert(session: Session, model, keys: tuple, rows: list) -> None:
+    if not rows:
+        return
+    conn = session.connection()
+    stmt = dialect_insert(conn)(model)
+    values = [c for c in rows[0] if c not in keys]
+    conn.execute(
+        stmt.on_conflict_do_update(index_elements=list(keys), set_={c: getattr(stmt.excluded, c) for c in values}),
+        rows,
+    )
+
+
+# ----------------------------------------------------------------------
+# 설정 / 상태
+# ----------------------------------------------------------------------
+def get_settings(session: Session, user_id: str) -> Dict[str, Any]:
+    """저장된 설정 + 기본값"""
+    rows = session.connection().execute(
+        select(UserSetting.key, UserSetting.value).where(UserSetting.user_id == user_id)
+    ).all()
+    return {**DEFAULT_SETTINGS, **{key: value for key, value in rows}}
+
+
+def set_settings(session: Session, user_id: str, values: Dict[str, Any]) -> None:
+    """바뀐 설정 항목만 upsert"""
+    _upsert(session, UserSetting, ("user_id", "key"),
+            [{"user_id": user_id, "key": k, "value": v} for k, v in values.items()])
+
+
+def set_state(session: Session, user_id: str, key: str, value: Any) -> None:
+    _upsert(session, UserState, ("user_id", "key"), [{"user_id": user_id, "key": key, "value": value}])
+
+
+# ----------------------------------------------------------------------
+# 주제별 학습 상태
+# ----------------------------------------------------------------------
+def set_topic_stat(session: Session, user_id: str, topic: str, key: str, value: Any) -> None:
+    _upsert(session, UserTopicStat, ("user_id", "topic", "key"),
+            [{"user_id": user_id, "topic": topic, "key": key, "value": value}])
+
+
+def record_learned(
+    session: Session, user_id: str, topic: str, word: str,
+    score: Optional[float], mean: str = "", at: Optional[datetime] = None,
+) -> None:
+    _upsert(session, UserLearnedWord, ("user_id", "topic", "word"), [{
+        "user_id": user_id, "topic": topic, "word": word,
+        "mean": mean, "last_score": score, "last_seen": at or datetime.now(),
+    }])
+
+
+def add_wrong_note(
+    session: Session, user_id: str, topic: str, q: str, a: str = "", user_answer: str = "",
+    at: Optional[datetime] = None,
+) -> None:
+    session.connection().execute(insert(UserWrongNote), [{
+        "user_id": user_id, "topic": topic, "q": q, "a": a, "user_answer": user_answer, "ts": at or datetime.now(),
+    }])
+
+
+# ----------------------------------------------------------------------
+# 예전 JSON 형식과 변환
+# ----------------------------------------------------------------------
+def delete_user(session: Session, user_id: str) -> None:
+    conn = session.connection()
+    for model in _TABLES:
+        conn.execute(delete(model).where(model.user_id == user_id))
+
+
+def import_progress(session: Session, user_id: str, progress: Optional[Dict[str, Any]]) -> int:
+    """예전 progress dict를 항목 테이블로 옮김 (이 사용자의 기존 행은 대체). 저장한 행 수를 반환"""
+    delete_user(session, user_id)
+    progress = progress or {}
+    settings_rows, state_rows, stat_rows, learned_rows, note_rows = [], [], [], [], []
+    for key, value in progress.items():
+        if key == "settings":
+            settings_rows += [{"user_id": user_id, "key": k, "value": v} for k, v in (value or {}).items()]
+        elif key != "topics":
+            state_rows.append({"user_id": user_id, "key": key, "value": value})
+    for topic, data in (progress.get("topics") or {}).items():
+        data = data or {}
+        stat_rows += [{"user_id": user_id, "topic": topic, "key": k, "value": v}
+                      for k, v in (data.get("stats") or {}).items()]
+        learned_rows += [
+            {
+                "user_id": user_id, "topic": topic, "word": word,
+                "mean": str(item.get("mean") or ""),
+                "last_score": item.get("last_score"),
+                "last_seen": _parse_time(item.get("last_seen")),
+            }
+            for word, item in (data.get("learned") or {}).items() if isinstance(item, dict)
+        ]
+        note_rows += [
+            {
+                "user_id": user_id, "topic": topic,
+                "q": str(note.get("q") or ""), "a": str(note.get("a") or ""),
+                "user_answer": str(note.get("user") or ""), "ts": _parse_time(note.get("ts")),
+            }
+            for note in (data.get("wrong_notes") or []) if isinstance(note, dict)
+        ]
+
+    conn = session.connection()
+    for model, rows in ((UserSetting, settings_rows), (UserState, state_rows), (UserTopicStat, stat_rows),
+                        (UserLearnedWord, learned_rows), (UserWrongNote, note_rows)):
+        if rows:
+            conn.execute(insert(model), rows)
+    return sum(map(len, (settings_rows, state_rows, stat_rows, learned_rows, note_rows)))
+
+
+def compose(session: Session, user_id: str) -> Dict[str, Any]:
+    """예전 User.progress 와 같은 모양: {"settings", "topics": {t: {"learned", "stats", "wrong_notes"}}, ...상태}"""
+    conn = session.connection()
+    progress: Dict[str, Any] = {"settings": get_settings(session, user_id), "topics": {}}
+    topics = progress["topics"]
+
+    def topic(name: str) -> Dict[str, Any]:
+        return topics.setdefault(name, {"learned": {}, "stats": {}, "wrong_notes": []})
+
+    for key, value in conn.execute(select(UserState.key, UserState.value).where(UserState.user_id == user_id)):
+        progress[key] = value
+    for row in conn.execute(select(UserLearnedWord).where(UserLearnedWord.user_id == user_id)).mappings():
+        topic(row["topic"])["learned"][row["word"]] = {
+            "mean": row["mean"], "last_score": row["last_score"], "last_seen": _format_time(row["last_seen"]),
+        }
+    for t, key, value in conn.execute(
+        select(UserTopicStat.topic, UserTopicStat.key, UserTopicStat.value).where(UserTopicStat.user_id == user_id)
+    ):
+        topic(t)["stats"][key] = value
+    for row in conn.execute(
+        select(UserWrongNote).where(UserWrongNote.user_id == user_id).order_by(UserWrongNote.topic, UserWrongNote.id)
+    ).mappings():
+        topic(row["topic"])["wrong_notes"].append(
+            {"q": row["q"], "a": row["a"], "user": row["user_answer"], "ts": _format_time(row["ts"])}
+        )
+    return progress
+
+
+def import_blobs(session: Session, chunk: int = 500) -> int:
+    """User.progress 가 남아 있는 사용자를 모두 옮기고 컬럼은 비움. 옮긴 사용자 수를 반환"""
+    conn = session.connection()
+    users = [
+        (uid, progress)
+        for uid, progress in conn.execute(select(User.uid, User.progress))
+        if progress
+    ]
+    for uid, progress in users:
+        import_progress(session, uid, progress)
+    for i in range(0, len(users), chunk):
+        conn.execute(update(User).where(User.uid.in_([uid for uid, _ in users[i:i + chunk]])).values(progress={}))
+    return len(users)
+
+
+def main() -> None:
+    from app.core.database import engine
+
+    parser = argparse.ArgumentParser(description="사용자 설정/학습 상태 관리")
+    parser.add_argument("command", choices=["import-blobs", "show"])
+    parser.add_argument("--user", default=None, help="show: 조회할 사용자")
+    args = parser.parse_args()
+    with Session(engine) as session:
+        if args.command == "import-blobs":
+            started = time.time()
+            n = import_blobs(session)
+            session.commit()
+            print(f"[UserProgress] 사용자 {n}명의 progress JSON 이전 완료 ({time.time() - started:.1f}s)")
+        elif args.command == "show":
+            if not args.user:
+                parser.error("--user 필요")
+            print(json.dumps(compose(session, args.user), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ import base64
 import json
 import os
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Tuple
@@ -14,10 +16,17 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from app.core.admission import Priority, admission
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services import g2p
+
 # ----------------------------------------------------------------------
 # 엔진 주소
 # ----------------------------------------------------------------------
 ENGINE_URL = os.getenv("SPEECHPRO_ENGINE_URL", "http://112.220.79.222:33005/speechpro")
+# 엔진/모델 버전 태그 (재채점 결과 구분, 모델 캐시 키에 사용)
+ENGINE_VERSION = os.getenv("SPEECHPRO_ENGINE_VERSION", "v1")
 
 
 # ----------------------------------------------------------------------
@@ -76,6 +85,137 @@ def wav_duration_seconds(path: str) -> float:
 
 
 
+# ----------------------------------------------------------------------
+# 모델(G2P + MODEL) 캐시
+# ----------------------------------------------------------------------
+# 같은 문장의 G2P/MODEL 결과(fst)는 엔진 버전이 같으면 항상 같으므로 문장 단위로 캐시합니다.
+MODEL_CACHE_SIZE = int(os.getenv("SPEECHPRO_MODEL_CACHE_SIZE", "2048"))
+_MODEL_CACHE: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+_MODEL_CACHE_LOCK = threading.Lock()
+_MODEL_CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+def _remote_gtp(s: requests.Session, req_id: str, clean_text: str, headers: Dict[str, str]) -> Dict[str, Any]:
+    r_gtp = s.post(
+        f"{ENGINE_URL}/gtp",
+        json={"id": req_id, "text": clean_text},
+        timeout=(5, 30),
+        headers=headers,
+    )
+    r_gtp.raise_for_status()
+    gtp = r_gtp.json()
+
+    if _engine_error_code(gtp) != 0:
+        return {"success": False, "error": f"GTP 실패: {gtp}"}
+
+    syll_ltrs = _get_any(gtp, "syll ltrs", "syll_ltrs")
+    syll_phns = _get_any(gtp, "syll phns", "syll_phns")
+    if not syll_ltrs or not syll_phns:
+        return {"success": False, "error": f"GTP 응답에 syll 정보가 없습니다: {gtp}"}
+    return {"success": True, "syll_ltrs": syll_ltrs, "syll_phns": syll_phns}
+
+
+def _local_gtp(clean_text: str) -> Dict[str, Any]:
+    syll_ltrs, syll_phns = g2p.engine_fields(clean_text)
+    if not syll_ltrs or not syll_phns:
+        return {"success": False, "error": "로컬 G2P: 한글 음절이 없습니다."}
+    return {"success": True, "syll_ltrs": syll_ltrs, "syll_phns": syll_phns}
+
+
+def _build_model(s: requests.Session, req_id: str, clean_text: str, headers: Dict[str, str]) -> Dict[str, Any]:
+    """GTP(로컬 또는 엔진) -> MODEL 호출로 문장의 채점 모델(fst)을 만듭니다."""
+    # 1) GTP: 기본은 엔진 /gtp. G2P_MODE=local 이고 코퍼스 검증을 통과했으면 로컬 G2P (엔진 왕복 생략),
+    #    로컬 결과가 없거나 MODEL이 거부하면 엔진 /gtp로 재시도
+    use_local = settings.G2P_MODE == "local" and g2p.local_ready()
+    if settings.G2P_MODE == "local" and not use_local:
+        metrics.inc("g2p_local_unvalidated_total")
+    gtp = _local_gtp(clean_text) if use_local else _remote_gtp(s, req_id, clean_text, headers)
+    if use_local and not gtp.get("success"):
+        use_local = False
+        gtp = _remote_gtp(s, req_id, clean_text, headers)
+    if not gtp.get("success"):
+        return gtp
+
+    # 2) MODEL
+    model = _post_model(s, req_id, clean_text, gtp["syll_ltrs"], gtp["syll_phns"], headers)
+    if use_local and _engine_error_code(model) != 0:
+        metrics.inc("g2p_local_rejected_total")
+        print(f"[SpeechPro] 로컬 G2P 결과를 MODEL이 거부하여 /gtp로 재시도: {clean_text!r}")
+        gtp = _remote_gtp(s, req_id, clean_text, headers)
+        if not gtp.get("success"):
+            return gtp
+        model = _post_model(s, req_id, clean_text, gtp["syll_ltrs"], gtp["syll_phns"], headers)
+    metrics.inc("g2p_total", source="local" if use_local else "remote")
+
+    if _engine_error_code(model) != 0:
+        return {"success": False, "error": f"MODEL 실패: {model}"}
+
+    fst = _get_any(model, "fst")
+    if not fst:
+        return {"success": False, "error": f"MODEL 응답에 fst가 없습니다: {model}"}
+
+    return {
+        "success": True,
+        "syll_ltrs": _get_any(model, "syll ltrs", "syll_ltrs") or gtp["syll_ltrs"],
+        "syll_phns": _get_any(model, "syll phns", "syll_phns") or gtp["syll_phns"],
+        "fst": fst,
+    }
+
+
+def _post_model(
+    s: requests.Session, req_id: str, clean_text: str, syll_ltrs: Any, syll_phns: Any, headers: Dict[str, str]
+) -> Dict[str, Any]:
+    r_model = s.post(
+        f"{ENGINE_URL}/model",
+        json={
+            "id": req_id,
+            "text": clean_text,
+            "syll ltrs": syll_ltrs,
+            "syll phns": syll_phns,
+        },
+        timeout=(5, 30),
+        headers=headers,
+    )
+    r_model.raise_for_status()
+    return r_model.json()
+
+
+def get_model(s: requests.Session, req_id: str, clean_text: str, headers: Dict[str, str]) -> Dict[str, Any]:
+    """문장 모델 조회 (캐시 우선). 실패 결과는 캐시하지 않습니다."""
+    key = (ENGINE_URL, ENGINE_VERSION, clean_text)
+    with _MODEL_CACHE_LOCK:
+        cached = _MODEL_CACHE.get(key)
+        if cached is not None:
+            _MODEL_CACHE.move_to_end(key)
+            _MODEL_CACHE_STATS["hits"] += 1
+            return cached
+        _MODEL_CACHE_STATS["misses"] += 1
+
+    model = _build_model(s, req_id, clean_text, headers)
+    if model.get("success"):
+        with _MODEL_CACHE_LOCK:
+            _MODEL_CACHE[key] = model
+            while len(_MODEL_CACHE) > MODEL_CACHE_SIZE:
+                _MODEL_CACHE.popitem(last=False)
+    return model
+
+
+def model_cache_stats() -> Dict[str, Any]:
+    with _MODEL_CACHE_LOCK:
+        hits, misses = _MODEL_CACHE_STATS["hits"], _MODEL_CACHE_STATS["misses"]
+        total = hits + misses
+        return {
+            "size": len(_MODEL_CACHE),
+            "max_size": MODEL_CACHE_SIZE,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+
+metrics.register_gauge("model_cache", model_cache_stats)
+
+
 # ----------------------------------------------------------------------
 # SpeechPro 호출
 # ----------------------------------------------------------------------
@@ -93,48 +233,13 @@ def call_speechpro_evaluation_scorejson(text: str, wav_path: str) -> Dict[str, A
     s = _make_session()
     r_score = None
     try:
-        # 1) GTP
-        r_gtp = s.post(
-            f"{ENGINE_URL}/gtp",
-            json={"id": req_id, "text": clean_text},
-            timeout=(5, 30),
-            headers=headers,
-        )
-        r_gtp.raise_for_status()
-        gtp = r_gtp.json()
-
-        if _engine_error_code(gtp) != 0:
-            return {"success": False, "error": f"GTP 실패: {gtp}"}
-
-        syll_ltrs = _get_any(gtp, "syll ltrs", "syll_ltrs")
-        syll_phns = _get_any(gtp, "syll phns", "syll_phns")
-        if not syll_ltrs or not syll_phns:
-            return {"success": False, "error": f"GTP 응답에 syll 정보가 없습니다: {gtp}"}
-
-        # 2) MODEL
-        r_model = s.post(
-            f"{ENGINE_URL}/model",
-            json={
-                "id": req_id,
-                "text": clean_text,
-                "syll ltrs": syll_ltrs,
-                "syll phns": syll_phns,
-            },
-            timeout=(5, 30),
-            headers=headers,
-        )
-        r_model.raise_for_status()
-        model = r_model.json()
-
-        if _engine_error_code(model) != 0:
-            return {"success": False, "error": f"MODEL 실패: {model}"}
-
-        fst = _get_any(model, "fst")
-        if not fst:
-            return {"success": False, "error": f"MODEL 응답에 fst가 없습니다: {model}"}
-
-        model_syll_ltrs = _get_any(model, "syll ltrs", "syll_ltrs") or syll_ltrs
-        model_syll_phns = _get_any(model, "syll phns", "syll_phns") or syll_phns
+        # 1~2) G2P -> MODEL (문장 단위 캐시)
+        model = get_model(s, req_id, clean_text, headers)
+        if not model.get("success"):
+            return model
+        fst = model["fst"]
+        model_syll_ltrs = model["syll_ltrs"]
+        model_syll_phns = model["syll_phns"]
 
         # 3) SCOREJSON
         with open(wav_path, "rb") as f:
@@ -199,6 +304,7 @@ def call_speechpro_evaluation_scorejson(text: str, wav_path: str) -> Dict[str, A
             return {
                 "success": False,
                 "error": f"SCOREJSON 실패: HTTP {r_score.status_code} - {body}",
+                "engine_unavailable": r_score.status_code >= 500,
             }
 
 
@@ -236,6 +342,7 @@ def call_speechpro_evaluation_scorejson(text: str, wav_path: str) -> Dict[str, A
         return {
             "success": False,
             "error": f"엔진 통신 장애: {str(e)} (scorejson_status={score_status}, scorejson_body_len={score_len})",
+            "engine_unavailable": True,
         }
     finally:
         try:
@@ -247,17 +354,29 @@ def call_speechpro_evaluation_scorejson(text: str, wav_path: str) -> Dict[str, A
 # ----------------------------------------------------------------------
 # [수정됨] 점수 추출 로직 개선 함수
 # ----------------------------------------------------------------------
-def evaluate_pronunciation(text: str, wav_path: Path) -> Tuple[float, Dict[str, Any]]:
+def evaluate_pronunciation(
+    text: str, wav_path: Path, priority: Priority = Priority.INTERACTIVE
+) -> Tuple[float, Dict[str, Any]]:
+    """
+    동기 함수입니다. 엔진 슬롯 대기가 있으므로 async 핸들러에서는 run_in_threadpool로 호출하세요.
+    슬롯을 얻지 못하면 AdmissionRejected가 그대로 전파됩니다.
+    """
     dur = wav_duration_seconds(str(wav_path))
     if dur < 1.0:  # ✅ 기준: 0.8초 (원하면 1.0초로)
         return 0.0, {
             "error": f"녹음이 너무 짧아 분석할 수 없습니다. 1초 이상 말해 주세요. (현재 {dur:.2f}초)"
         }
 
-    result = call_speechpro_evaluation_scorejson(text=text, wav_path=str(wav_path))
+    # 전역 동시 실행 제한 (대화형 평가가 배치 작업보다 우선)
+    with admission.engine_slot(priority):
+        result = call_speechpro_evaluation_scorejson(text=text, wav_path=str(wav_path))
 
     if not result.get("success"):
-        return 0.0, {"error": result.get("error", "엔진 호출 실패")}
+        return 0.0, {
+            "error": result.get("error", "엔진 호출 실패"),
+            # 통신 장애/5xx 여부 (호출 측에서 로컬 대체 채점 여부 판단)
+            "engine_unavailable": bool(result.get("engine_unavailable")),
+        }
 
     raw = result.get("score_result", {}) or {}
 
@@ -0,0 +1,88 @@
+# backend/bench_async_db.py
+"""
+동기 Session vs 비동기 세션(get_async_session) 동시성 벤치마크.
+
+async def 핸들러 안에서 느린 쿼리(재귀 CTE, 약 0.3~0.5초)를 여러 개 보내는 동안
+DB를 쓰지 않는 /ping 요청의 지연을 측정합니다.
+  - sync : 쿼리가 이벤트 루프 스레드에서 실행되어 /ping 이 느린 쿼리가 끝날 때까지 멈춤
+  - async: aiosqlite 스레드에서 실행되어 /ping 은 수 ms 안에 응답
+
+실행 (backend 폴더에서):
+    python bench_async_db.py --slow 8 --pings 40
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import dispose_async_engine, get_async_session, get_session
+
+SLOW_SQL = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < :n) SELECT sum(x) FROM c"
+)
+
+app = FastAPI()
+
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+
+@app.get("/slow-sync")
+async def slow_sync(n: int, session: Session = Depends(get_session)):
+    return {"sum": session.exec(SLOW_SQL, params={"n": n}).scalar()}
+
+
+@app.get("/slow-async")
+async def slow_async(n: int, session: AsyncSession = Depends(get_async_session)):
+    return {"sum": (await session.exec(SLOW_SQL, params={"n": n})).scalar()}
+
+
+async def run(mode: str, slow: int, pings: int, n: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/ping")
+
+        async def timed_ping(due: float) -> float:
+            # 예정 시각 기준으로 측정: 루프가 막혀 있던 시간도 지연에 포함
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.get("/ping")
+            return (time.perf_counter() - due) * 1000
+
+        started = time.perf_counter()
+        slow_tasks = [asyncio.create_task(client.get(f"/slow-{mode}", params={"n": n})) for _ in range(slow)]
+        latencies = await asyncio.gather(*(timed_ping(started + 0.02 * i) for i in range(pings)))
+        await asyncio.gather(*slow_tasks)
+        total = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "ping_p50_ms": round(statistics.median(latencies), 1),
+        "ping_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "ping_max_ms": round(latencies[-1], 1),
+        "total_s": round(total, 2),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="동기/비동기 DB 세션 동시성 벤치마크")
+    parser.add_argument("--slow", type=int, default=8, help="동시에 보낼 느린 쿼리 수")
+    parser.add_argument("--pings", type=int, default=40)
+    parser.add_argument("--n", type=int, default=1_000_000, help="재귀 CTE 반복 횟수 (쿼리 시간 조절)")
+    args = parser.parse_args()
+
+    for mode in ("sync", "async"):
+        print(await run(mode, args.slow, args.pings, args.n))
+    await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
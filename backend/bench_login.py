@@ -0,0 +1,126 @@
+# backend/bench_login.py
+"""
+로그인 비밀번호 검증 벤치마크 (app/services/passwords.py 파라미터 조정용).
+
+1) scrypt N별 해싱 1회 시간: PASSWORD_SCRYPT_N 고르기 (한 번에 수십 ms 정도가 목표)
+2) 로그인 처리량: 동시 로그인 --logins건을 보내는 동안 DB를 쓰지 않는 /ping 지연 측정
+  - inline      : 이벤트 루프에서 바로 검증 -> 검증 시간만큼 /ping 이 멈춤
+  - pool(w=N)   : PasswordService 풀에서 검증 -> /ping 은 수 ms, 처리량은 워커 수(코어 수)까지 증가
+  rejected는 PASSWORD_HASH_MAX_PENDING(--max-pending)을 넘어 바로 503으로 거절된 수
+
+실행 (backend 폴더에서):
+    python bench_login.py --n-values 13,14,15 --logins 64 --workers 1,2,4
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.core.admission import AdmissionRejected
+from app.core.config import settings
+from app.services.passwords import PasswordService, hash_password, verify_password
+
+PASSWORD = "correct horse battery staple"
+
+
+def time_hash(n: int, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        hash_password(PASSWORD, n=n)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def time_hash_sha256(repeat: int = 1000) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        hashlib.sha256(PASSWORD.encode()).hexdigest()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def make_app(stored: str, service: PasswordService) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/login-inline")
+    async def login_inline():
+        ok, _ = verify_password(stored, PASSWORD)
+        return {"ok": ok}
+
+    @app.post("/login-pool")
+    async def login_pool():
+        try:
+            ok, _ = await service.verify_async(stored, PASSWORD)
+        except AdmissionRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.code)
+        return {"ok": ok}
+
+    return app
+
+
+async def run(label: str, path: str, app: FastAPI, logins: int, pings: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/ping")
+
+        async def timed_ping(due: float) -> float:
+            # 예정 시각 기준으로 측정: 루프가 막혀 있던 시간도 지연에 포함
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.get("/ping")
+            return (time.perf_counter() - due) * 1000
+
+        started = time.perf_counter()
+        login_tasks = [asyncio.create_task(client.post(path)) for _ in range(logins)]
+        latencies = await asyncio.gather(*(timed_ping(started + 0.02 * i) for i in range(pings)))
+        responses = await asyncio.gather(*login_tasks)
+        total = time.perf_counter() - started
+
+    latencies.sort()
+    accepted = sum(1 for r in responses if r.status_code == 200)
+    return {
+        "mode": label,
+        "logins_per_s": round(accepted / total, 1),
+        "rejected": len(responses) - accepted,
+        "ping_p50_ms": round(statistics.median(latencies), 1),
+        "ping_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "total_s": round(total, 2),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="로그인 비밀번호 검증 벤치마크")
+    parser.add_argument("--n-values", default="13,14,15", help="scrypt N의 log2 값 (쉼표로 구분)")
+    parser.add_argument("--logins", type=int, default=64, help="동시에 보낼 로그인 수")
+    parser.add_argument("--pings", type=int, default=40)
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 2}", help="풀 크기 (쉼표로 구분)")
+    parser.add_argument("--pool", default="thread", choices=("thread", "process"))
+    parser.add_argument("--max-pending", type=int, default=settings.PASSWORD_HASH_MAX_PENDING)
+    args = parser.parse_args()
+
+    print(f"[Hash] CPU {os.cpu_count()}개, r={settings.PASSWORD_SCRYPT_R}, p={settings.PASSWORD_SCRYPT_P}")
+    print(f"  sha256 (예전): {time_hash_sha256():.3f} ms")
+    for log2 in (int(v) for v in args.n_values.split(",") if v.strip()):
+        print(f"  scrypt N=2**{log2}: {time_hash(2 ** log2):.1f} ms")
+
+    stored = hash_password(PASSWORD)
+    print(f"[Login] N={settings.PASSWORD_SCRYPT_N}, 동시 로그인 {args.logins}건")
+    print(await run("inline", "/login-inline", make_app(stored, PasswordService(args.pool, 1, args.max_pending, 0, 0, 0, 0)), args.logins, args.pings))
+    for workers in (int(w) for w in args.workers.split(",") if w.strip()):
+        service = PasswordService(args.pool, workers, args.max_pending, 0, 0, 0, 0)
+        try:
+            print(await run(f"pool(w={workers})", "/login-pool", make_app(stored, service), args.logins, args.pings))
+        finally:
+            service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
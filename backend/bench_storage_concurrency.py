@@ -0,0 +1,280 @@
+# backend/bench_storage_concurrency.py
+"""
+SQLite 읽기/쓰기 동시성 확인 스크립트 (app/core/storage.py).
+
+임시 DB에 StudyLog를 채운 뒤, 읽기 스레드들이 긴 집계 쿼리를 계속 돌리는 동안
+쓰기 스레드들이 평가 결과처럼 한 행씩 INSERT + COMMIT 하며 지연과 실패를 잽니다.
+  - legacy: 기존 설정 (rollback journal, 단일 엔진) -> COMMIT이 읽기가 끝날 때까지 대기, 일부는 'database is locked'
+  - tuned : storage.create_engines (WAL, 쓰기/읽기 엔진 분리) -> 읽기와 무관하게 수 ms 안에 COMMIT
+
+실행 (backend 폴더에서):
+    python bench_storage_concurrency.py --rows 100000 --readers 4 --writers 4 --seconds 5
+tuned 결과의 쓰기 p95가 읽기 쿼리 1회 시간보다 작고 실패가 0이면 통과(종료 코드 0)입니다.
+
+async-hold: 비동기 엔진(storage.async_engine_kwargs)에서 세션 --holders개가 쿼리 후 연결을 잡은 채
+--hold초 기다리는 동안 (평가 중 ffmpeg/엔진 호출, 로그인 중 해싱처럼) 다른 세션의 짧은 조회가
+기다리지 않고 끝나야 통과입니다 (조회 p95 < hold/2, 풀 대기 시간 초과 0).
+
+routes: 실제 API(app.main)로 엑셀을 읽는 조회 라우트(/study/words, /study/review-words, /study/review-set)를
+--route-calls개 동시에 보내는 동안, 앱의 쓰기 엔진으로 log_writer 저장과 같은 INSERT + COMMIT을 반복해
+지연을 잽니다. 조회 라우트가 쓰기 연결을 잡지 않아야 하므로 쓰기 최대 지연 < 라우트 1회 시간/2, 실패 0이면 통과.
+(DATABASE_URL이 없으면 임시 DB를 씁니다)
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 라우트 측정은 app.core.database 엔진을 그대로 쓰므로 import 전에 임시 DB 지정
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp(prefix='jv_routes_')) / 'routes.db'}")
+
+from sqlalchemy import insert, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import storage
+from app.core.database import to_async_url
+from app.models import StudyLog
+
+READ_SQL = text(
+    "SELECT user_id, count(*), avg(score), max(length(feedback) + length(word)) "
+    "FROM studylog GROUP BY user_id ORDER BY avg(score * 1.0 / (id % 7 + 1)) DESC"
+)
+
+
+def seed(engine, rows: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    now = datetime.now()
+    batch = [
+        {"user_id": f"u{i % 500}", "word": f"단어{i % 2000}", "score": float(i % 100),
+         "feedback": "발음이 좋아요" * 3, "created_at": now}
+        for i in range(rows)
+    ]
+    with Session(engine) as session:
+        for i in range(0, rows, 20_000):
+            session.exec(insert(StudyLog), params=batch[i:i + 20_000])
+        session.commit()
+
+
+def run(mode: str, rows: int, readers: int, writers: int, seconds: float) -> dict:
+    path = Path(tempfile.mkdtemp(prefix="jv_storage_")) / "bench.db"
+    url = f"sqlite:///{path}"
+    if mode == "legacy":
+        write_engine = read_engine = create_engine(url, connect_args={"check_same_thread": False})
+    else:
+        write_engine, read_engine = storage.create_engines(url)
+    seed(write_engine, rows)
+
+    stop = threading.Event()
+    read_times, write_times, failures = [], [], []
+    lock = threading.Lock()
+
+    def reader():
+        while not stop.is_set():
+            started = time.perf_counter()
+            with Session(read_engine) as session:
+                session.exec(READ_SQL).all()
+            with lock:
+                read_times.append(time.perf_counter() - started)
+
+    def writer(n: int):
+        i = 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with Session(write_engine) as session:
+                    session.add(StudyLog(user_id=f"w{n}", word=f"단어{i}", score=80.0, feedback="ok"))
+                    session.commit()
+                with lock:
+                    write_times.append(time.perf_counter() - started)
+            except OperationalError as e:
+                with lock:
+                    failures.append(str(e.orig))
+            i += 1
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    write_engine.dispose()
+    read_engine.dispose()
+
+    write_ms = sorted(t * 1000 for t in write_times) or [0.0]
+    return {
+        "mode": mode,
+        "read_p50_ms": round(statistics.median(read_times) * 1000, 1) if read_times else None,
+        "writes": len(write_times),
+        "write_p50_ms": round(statistics.median(write_ms), 1),
+        "write_p95_ms": round(write_ms[max(0, int(len(write_ms) * 0.95) - 1)], 1),
+        "write_max_ms": round(write_ms[-1], 1),
+        "locked_errors": len(failures),
+    }
+
+
+async def _async_hold(url: str, holders: int, hold: float, queries: int) -> dict:
+    async_url = to_async_url(url)
+    # 연결을 못 받으면 hold보다 조금 더 기다린 뒤 실패로 집계
+    engine = create_async_engine(async_url, **{**storage.async_engine_kwargs(async_url), "pool_timeout": hold * 1.5})
+    storage.install_sqlite_pragmas(engine.sync_engine)
+    errors: list = []
+
+    async def holder(n: int) -> None:
+        try:
+            async with AsyncSession(engine) as session:
+                (await session.exec(select(StudyLog.id).limit(1))).first()
+                await asyncio.sleep(hold)
+                session.add(StudyLog(user_id=f"h{n}", word="단어", score=80.0, feedback="ok"))
+                await session.commit()
+        except (PoolTimeoutError, OperationalError) as e:
+            errors.append(type(e).__name__)
+
+    async def query() -> float:
+        started = time.perf_counter()
+        try:
+            async with AsyncSession(engine) as session:
+                (await session.exec(select(StudyLog.id).limit(1))).first()
+        except (PoolTimeoutError, OperationalError) as e:
+            errors.append(type(e).__name__)
+        return (time.perf_counter() - started) * 1000
+
+    tasks = [asyncio.create_task(holder(n)) for n in range(holders)]
+    await asyncio.sleep(0.1)  # holder들이 연결을 잡은 뒤
+    latencies = sorted(await asyncio.gather(*(query() for _ in range(queries))))
+    await asyncio.gather(*tasks)
+    await engine.dispose()
+    return {
+        "mode": "async-hold",
+        "holders": holders,
+        "hold_ms": round(hold * 1000),
+        "query_p95_ms": round(latencies[max(0, int(len(latencies) * 0.95) - 1)], 1),
+        "errors": len(errors),
+    }
+
+
+def run_async_hold(holders: int, hold: float, queries: int) -> dict:
+    path = Path(tempfile.mkdtemp(prefix="jv_storage_")) / "bench.db"
+    url = f"sqlite:///{path}"
+    write_engine, read_engine = storage.create_engines(url)
+    seed(write_engine, 1000)
+    write_engine.dispose()
+    read_engine.dispose()
+    return asyncio.run(_async_hold(url, holders, hold, queries))
+
+
+async def _routes(calls: int) -> dict:
+    import httpx
+
+    from app.core.database import create_db_and_tables, engine
+    from app.main import app, create_default_users
+    from app.services import log_export
+    from app.services.log_writer import log_writer
+
+    create_db_and_tables()
+    create_default_users()
+    # 복습 라우트가 엑셀을 읽도록 student의 평가 기록(숙련도/복습 카드) 준비 (쓰기 스레드 없이 바로 저장)
+    for word in (log_export.level_words().get("초급1") or [])[:10]:
+        log_writer.submit(StudyLog(user_id="student", word=word, score=40.0, feedback=""))
+    paths = [
+        "/study/words?level=초급1&user_id=bench_new_{n}",  # 처음 보는 사용자 -> 짧은 쓰기 후 엑셀
+        "/study/words?level=초급1&user_id=student",
+        "/study/review-words?user_id=student",
+        "/study/review-set?user_id=student",
+    ]
+    stop = threading.Event()
+    write_ms: list = []
+    errors: list = []
+
+    def writer() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with Session(engine) as session:
+                    session.add(StudyLog(user_id="bench_writer", word="단어", score=80.0, feedback="ok"))
+                    session.commit()
+                write_ms.append((time.perf_counter() - started) * 1000)
+            except (PoolTimeoutError, OperationalError) as e:
+                errors.append(type(e).__name__)
+            time.sleep(0.02)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        await client.get(paths[1])  # 엑셀/JSON 첫 로드
+
+        async def call(n: int) -> float:
+            started = time.perf_counter()
+            r = await client.get(paths[n % len(paths)].format(n=n))
+            if r.status_code != 200:
+                errors.append(f"HTTP {r.status_code}")
+            return (time.perf_counter() - started) * 1000
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        route_ms = sorted(await asyncio.gather(*(call(n) for n in range(calls))))
+        stop.set()
+        thread.join()
+
+    write_ms.sort()
+    return {
+        "mode": "routes",
+        "calls": calls,
+        "route_min_ms": round(route_ms[0], 1),
+        "route_max_ms": round(route_ms[-1], 1),
+        "writes": len(write_ms),
+        "write_p95_ms": round(write_ms[max(0, int(len(write_ms) * 0.95) - 1)], 1) if write_ms else None,
+        "write_max_ms": round(write_ms[-1], 1) if write_ms else None,
+        "errors": len(errors),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite 읽기 중 쓰기 지연 비교")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--holders", type=int, default=4, help="async-hold: 연결을 잡고 기다리는 세션 수")
+    parser.add_argument("--hold", type=float, default=1.0, help="async-hold: 기다리는 시간(초)")
+    parser.add_argument("--route-calls", type=int, default=8, help="routes: 동시에 보낼 조회 라우트 요청 수")
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ("legacy", "tuned"):
+        results[mode] = run(mode, args.rows, args.readers, args.writers, args.seconds)
+        print(results[mode])
+
+    tuned = results["tuned"]
+    ok = tuned["locked_errors"] == 0 and tuned["writes"] > 0 and (
+        tuned["read_p50_ms"] is None or tuned["write_p95_ms"] < tuned["read_p50_ms"]
+    )
+    print("PASS: 읽기 중에도 쓰기가 대기하지 않음" if ok else "FAIL: 쓰기가 읽기 뒤에서 대기함")
+
+    held = run_async_hold(args.holders, args.hold, queries=20)
+    print(held)
+    held_ok = held["errors"] == 0 and held["query_p95_ms"] < held["hold_ms"] / 2
+    print("PASS: 세션이 연결을 잡고 기다려도 다른 요청은 대기하지 않음" if held_ok
+          else "FAIL: 다른 요청이 비동기 연결을 기다림")
+
+    routes = asyncio.run(_routes(args.route_calls))
+    print(routes)
+    routes_ok = routes["errors"] == 0 and routes["writes"] > 0 and routes["write_max_ms"] < routes["route_min_ms"] / 2
+    print("PASS: 조회 라우트가 엑셀을 읽는 동안에도 쓰기가 대기하지 않음" if routes_ok
+          else "FAIL: 쓰기가 조회 라우트 뒤에서 대기함")
+    sys.exit(0 if ok and held_ok and routes_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# backend/tests/test_migrations.py
+"""
+마이그레이션 검사: 빈 DB / 예전 인덱스 구성의 DB에 마이그레이션을 적용하면
+주요 조회 쿼리(HOT_QUERIES)가 모두 인덱스를 타고, 003~006 채우기가 기존 기록을 반영하는지.
+
+backend 폴더에서:
+    python -m pytest -q
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401  (테이블 등록)
+from app.core import migrations
+
+# 마이그레이션 001/002 이전의 인덱스 구성
+OLD_INDEXES = [
+    "DROP INDEX ix_studylog_user_created",
+    "DROP INDEX ix_studylog_user_score",
+    "DROP INDEX ix_studylog_created",
+    "DROP INDEX ux_studyprogress_user_level",
+    "DROP INDEX ix_studyprogress_user_updated",
+    "CREATE INDEX ix_studylog_user_id ON studylog (user_id)",
+    "CREATE INDEX ix_studyprogress_user_id ON studyprogress (user_id)",
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _assert_indexed(engine):
+    failed = [f"{r['query']}: {r['plan']}" for r in migrations.explain(engine) if not r["ok"]]
+    assert not failed, "\n".join(failed)
+
+
+def test_fresh_db_hot_queries_use_indexes(engine):
+    applied = migrations.upgrade(engine)
+    assert applied == [version for version, _, _ in migrations.MIGRATIONS]
+    assert migrations.upgrade(engine) == []
+    _assert_indexed(engine)
+
+
+def test_old_schema_hot_queries_use_indexes(engine):
+    at = datetime(2024, 3, 1, 9, 0)
+    with engine.begin() as conn:
+        for stmt in OLD_INDEXES:
+            conn.execute(text(stmt))
+        # 001/002 이전에 쌓일 수 있던 같은 (user_id, level) 중복 진도
+        conn.execute(
+            text("INSERT INTO studyprogress (user_id, level, current_page, updated_at) VALUES (:u, :l, :p, :at)"),
+            [{"u": "s1", "l": "초급1", "p": 2, "at": at}, {"u": "s1", "l": "초급1", "p": 5, "at": at}],
+        )
+
+    migrations.upgrade(engine)
+    _assert_indexed(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT current_page FROM studyprogress WHERE user_id = 's1'")).all() == [(5,)]
+        names = {r[0] for r in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    assert "ix_studylog_user_id" not in names and "ix_studyprogress_user_id" not in names
+
+
+def test_backfills_existing_logs(engine):
+    at = datetime(2024, 3, 1, 9, 0)
+    logs = [
+        ("s1", "사과", 95.0, at),
+        ("s1", "사과", 60.0, at + timedelta(minutes=5)),
+        ("s1", "바나나", 75.0, at + timedelta(days=1)),
+        ("s2", "사과", 40.0, at),
+    ]
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO user (uid, name, pw, role, is_approved, created_at, progress) "
+                 "VALUES (:u, :u, '', :r, 1, :at, '{}')"),
+            [{"u": "s1", "r": "student", "at": at}, {"u": "s2", "r": "student", "at": at},
+             {"u": "t1", "r": "teacher", "at": at}],
+        )
+        conn.execute(
+            text("INSERT INTO studylog (user_id, word, score, feedback, created_at) VALUES (:u, :w, :s, '', :at)"),
+            [{"u": u, "w": w, "s": s, "at": t} for u, w, s, t in logs],
+        )
+
+    migrations.upgrade(engine)
+    with engine.connect() as conn:
+        q = lambda sql: conn.execute(text(sql)).all()  # noqa: E731
+        assert q("SELECT user_id, attempts, score_sum, high, mid, low FROM studyusertotal ORDER BY user_id") == [
+            ("s1", 3, 230.0, 1, 1, 1), ("s2", 1, 40.0, 0, 0, 1),
+        ]
+        assert q("SELECT day, attempts, words FROM studydailystat WHERE user_id = 's1' ORDER BY day") == [
+            ("2024-03-01", 2, 1), ("2024-03-02", 1, 1),
+        ]
+        assert q("SELECT user_id, attempts, avg_score, level FROM studentsummary ORDER BY user_id") == [
+            ("s1", 3, 76.7, "미시작"), ("s2", 1, 40.0, "미시작"),
+        ]
+        assert q("SELECT attempts, last_score, best_score, ewma FROM wordmastery "
+                 "WHERE user_id = 's1' AND word = '사과'") == [(2, 60.0, 95.0, pytest.approx(84.5))]
+        # 95점 통과(1일 뒤) 후 5분 만에 60점 실패 -> 연속 통과 초기화, 10분 뒤 다시 복습
+        assert q("SELECT reps, lapses, interval_days FROM reviewcard WHERE user_id = 's1' AND word = '사과'") == [
+            (0, 1, 0.0),
+        ]
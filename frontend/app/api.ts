@@ -66,6 +66,7 @@ export const api = {
 
 // 인증 및 사용자 관련
 export const login = (id: string, pw: string) => api.post("/auth/login", { id, password: pw });
+export const logout = () => api.post("/auth/logout", {});
 export const signup = (data: any) => api.post("/auth/register", data);
 export const checkIdDuplicate = (id: string) => api.post("/auth/check-id", { id });
 
@@ -77,7 +78,16 @@ export const updateStudySettings = (uid: string, settingsData: any) => api.put(`
 // 학습 관련
 export const getWords = (lv: string, uid: string) => api.get(`/study/words?level=${lv}&user_id=${uid}`);
 export const getReviewWords = (uid: string) => api.get(`/study/review-words?user_id=${uid}`);
+// 오늘의 복습 세트 (간격 반복 스케줄러, 응답의 items)
+export const getReviewSet = (uid: string) => api.get(`/study/review-set?user_id=${uid}`);
 export const getQuiz = (lv: string) => api.get(`/study/quiz?level=${lv}`);
+export const submitQuizAnswer = (uid: string, word: string, correct: boolean) => {
+  const fd = new FormData();
+  fd.append("user_id", uid);
+  fd.append("word", word);
+  fd.append("correct", String(correct));
+  return api.post("/study/quiz/answer", fd);
+};
 export const getUserProgress = (uid: string) => api.get(`/study/current-progress?user_id=${uid}`);
 export const uploadRecord = (fd: FormData) => api.post("/speech/evaluate", fd);
 
@@ -89,9 +99,23 @@ export const completeStudy = (lv: string, uid: string) => {
 };
 
 // 선생님 및 공지사항 관련
-export const getStudents = () => api.get("/api/teacher/students");
+// 학생 목록은 페이지 단위 (다음 페이지: 응답의 next_cursor 전달, q: 이름 검색)
+// 응답의 total / avg_progress 는 검색어와 무관한 담당 학생 전체 기준
+export const getStudents = (cursor?: string | null, q?: string) => {
+  const qs = new URLSearchParams();
+  if (cursor) qs.set("cursor", cursor);
+  if (q) qs.set("q", q);
+  const query = qs.toString();
+  return api.get(`/api/teacher/students${query ? `?${query}` : ""}`);
+};
 export const getNotices = () => api.get("/api/teacher/notices");
 export const getStudentNotices = () => api.get("/api/notice/list");
+// 새 공지 실시간 알림 (SSE). 폴링 대신 구독하고, 반환된 함수로 연결 종료
+export const subscribeNotices = (onNotice: (notice: any) => void) => {
+  const source = new EventSource("/api/notice/stream", { withCredentials: true });
+  source.addEventListener("notice", (e) => onNotice(JSON.parse((e as MessageEvent).data)));
+  return () => source.close();
+};
 
 export const sendNotice = (data: {
   title: string;
@@ -101,6 +125,20 @@ export const sendNotice = (data: {
 }) => api.post("/api/teacher/notice", data);
 
 export const getStudentDetail = (uid: string) => api.get(`/api/teacher/student/${uid}`);
+
+// 학습 로그 내보내기: 서버가 스트리밍하므로 fetch로 받지 않고 브라우저가 바로 내려받도록 URL만 만듦
+export const exportLogsUrl = (params: {
+  format?: "csv" | "parquet";
+  start?: string; // YYYY-MM-DD (포함)
+  end?: string;   // YYYY-MM-DD (포함)
+  level?: string;
+  student_id?: string;
+} = {}) => {
+  const qs = new URLSearchParams(
+    Object.entries(params).filter(([, v]) => v) as [string, string][]
+  ).toString();
+  return `/api/teacher/export/logs${qs ? `?${qs}` : ""}`;
+};
 export const getStudentStats = (uid: string) => api.get(`/study/stats?user_id=${uid}`);
 
 // [신규] 관리자(Admin) 관련 함수
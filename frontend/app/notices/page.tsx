@@ -4,7 +4,7 @@ import React, { useState, useEffect } from "react";
 import { useRouter } from "next/navigation";
 import { ChevronLeft, Bell, ChevronDown, ChevronUp, Loader2 } from "lucide-react";
 import AuthGuard from "../components/AuthGuard";
-import { getStudentNotices } from "../api";
+import { getStudentNotices, subscribeNotices } from "../api";
 
 interface Notice {
   id: number;
@@ -38,6 +38,11 @@ export default function NoticesPage() {
       }
     }
     fetchNotices();
+
+    // 새 공지는 서버가 바로 보내줌 (맨 위에 추가)
+    return subscribeNotices((notice: Notice) => {
+      setNotices((prev) => (prev.some((n) => n.id === notice.id) ? prev : [notice, ...prev]));
+    });
   }, []);
 
   const toggleExpand = (id: number) => {
@@ -14,7 +14,7 @@ import {
   Flame
 } from 'lucide-react';
 import AuthGuard from '../components/AuthGuard';
-import { getUserProfile } from '../api';
+import { getUserProfile, logout } from '../api';
 
 export default function SettingsPage() {
   const router = useRouter();
@@ -36,6 +36,8 @@ export default function SettingsPage() {
   // 로그아웃 함수만 유지
   const handleLogout = () => {
     if (confirm("로그아웃 하시겠습니까?")) {
+      // 서버 세션 토큰 폐기 (실패해도 로컬 로그아웃은 진행)
+      logout().catch(() => {});
       localStorage.removeItem('userId');
       localStorage.removeItem('userRole');
       router.replace('/login');
@@ -6,7 +6,7 @@ import Image from 'next/image';
 import { Play, MessageCircle, Loader2, ChevronRight, Bell } from 'lucide-react';
 import AuthGuard from '../components/AuthGuard';
 // [수정] getStudentStats 추가 임포트
-import { getUserProfile, getUserProgress, getStudentNotices, getStudentStats } from '../api';
+import { getUserProfile, getUserProgress, getStudentNotices, getStudentStats, subscribeNotices } from '../api';
 
 export default function StudentHomePage() {
   const router = useRouter();
@@ -54,6 +54,11 @@ export default function StudentHomePage() {
       }
     };
     fetchData();
+
+    // 새 공지 실시간 알림 (맨 위에 추가)
+    return subscribeNotices((notice) => {
+      setNotices((prev) => (prev.some((n) => n.id === notice.id) ? prev : [notice, ...prev]));
+    });
   }, []);
 
   const handleStartLearning = () => {
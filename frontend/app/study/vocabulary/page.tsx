@@ -20,8 +20,9 @@ import {
 import {
   uploadRecord,
   getWords,
-  getReviewWords,
+  getReviewSet,
   getQuiz,
+  submitQuizAnswer,
   completeStudy,
 } from "../../api";
 import AuthGuard from "../../components/AuthGuard";
@@ -101,9 +102,9 @@ const getImageUrl = (path: string) => {
         setLoading(true);
 
         if (mode === "review") {
-          // [전체 복습 모드] 통계 화면에서 온 경우
-          const reviews = await getReviewWords(userId);
-          const mapped = mapWordData(reviews);
+          // [전체 복습 모드] 통계 화면에서 온 경우: 오늘 복습 예정 단어
+          const reviewSet = await getReviewSet(userId);
+          const mapped = mapWordData(reviewSet.items ?? []);
           setReviewData(mapped);
           setPhase("review"); // 바로 복습 단계로 시작
           setCurrentIndex(0);
@@ -484,6 +485,12 @@ const playLocalAudio = (type: "voca" | "example", e: React.MouseEvent) => {
     setSelectedOption(option);
     const isCorrect = option === currentQuiz?.answer;
     setIsQuizCorrect(isCorrect);
+    // 문제마다 첫 선택만 복습 일정에 반영
+    if (selectedOption === null && currentQuiz?.answer) {
+      submitQuizAnswer(userId, currentQuiz.answer, isCorrect).catch((e) =>
+        console.error("퀴즈 결과 저장 실패", e)
+      );
+    }
   };
 
   // learning/review: 평가 결과 있어야 다음 가능(현재 로직 유지)
@@ -1,17 +1,21 @@
 "use client";
 
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { 
   Calendar, Send, ChevronLeft, Clock, Users, 
-  BarChart, CheckCircle, GraduationCap, Search, RotateCcw, List, Lock
+  BarChart, CheckCircle, GraduationCap, Search, RotateCcw, List, Lock, Download
 } from 'lucide-react'; 
 import Link from 'next/link';
 import AuthGuard from '../components/AuthGuard';
-import { getStudents, sendNotice, getNotices } from '../api'; 
+import { getStudents, sendNotice, getNotices, exportLogsUrl } from '../api'; 
 
 export default function TeacherDash() {
   // --- 상태 관리 ---
   const [students, setStudents] = useState<any[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [studentTotal, setStudentTotal] = useState(0);
+  const [averageProgress, setAverageProgress] = useState(0);
+  const studentsRequest = useRef(0); // 검색어를 빨리 바꿀 때 늦게 온 이전 응답 무시
   const [noticeLogs, setNoticeLogs] = useState<any[]>([]); 
   const [title, setTitle] = useState('');
   const [content, setContent] = useState('');
@@ -24,22 +28,31 @@ export default function TeacherDash() {
     fetchData();
   }, []);
 
+  // 이름 검색은 서버에서 (불러온 페이지만이 아니라 담당 학생 전체 대상), 입력이 멈추면 조회
+  useEffect(() => {
+    const timer = setTimeout(() => fetchStudents(searchTerm), 300);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
+  // --- 학생 목록 첫 페이지 + 상단 통계 (전체 학생 수 / 진도 평균은 서버 집계값) ---
+  const fetchStudents = async (q: string) => {
+    const requestId = ++studentsRequest.current;
+    try {
+      const response = await getStudents(null, q.trim());
+      if (requestId !== studentsRequest.current) return;
+      // 백엔드가 { ok: true, items: [...], next_cursor, total, avg_progress } 형태로 줌
+      setStudents(response?.items || []);
+      setNextCursor(response?.next_cursor || null);
+      setStudentTotal(response?.total || 0);
+      setAverageProgress(Math.round((response?.avg_progress || 0) * 100));
+    } catch (error) {
+      console.error("학생 목록 로드 실패:", error);
+    }
+  };
+
   const fetchData = async () => {
     try {
-      // 1. 학생 데이터 가져오기
-      const response = await getStudents();
-      
-      // [수정 핵심] 백엔드가 { ok: true, items: [...] } 형태로 주므로 items만 꺼내야 함
-      if (response && response.items) {
-        setStudents(response.items);
-      } else if (Array.isArray(response)) {
-        // 혹시 백엔드가 배열로 줄 경우를 대비한 방어 코드
-        setStudents(response);
-      } else {
-        setStudents([]);
-      }
-      
-      // 2. 공지 이력 가져오기
+      // 공지 이력 가져오기 (학생 목록은 검색어 effect에서)
       const logs = await getNotices();
       setNoticeLogs(logs || []);
       
@@ -48,6 +61,20 @@ export default function TeacherDash() {
     }
   };
 
+  // --- 학생 목록 다음 페이지 ---
+  const loadMoreStudents = async () => {
+    if (!nextCursor) return;
+    try {
+      const requestId = studentsRequest.current;
+      const response = await getStudents(nextCursor, searchTerm.trim());
+      if (requestId !== studentsRequest.current) return;
+      setStudents((prev) => [...prev, ...(response?.items || [])]);
+      setNextCursor(response?.next_cursor || null);
+    } catch (error) {
+      console.error("학생 목록 로드 실패:", error);
+    }
+  };
+
   // --- 공지 발송 ---
   const handleSend = async () => {
     if (!title || !content) {
@@ -69,13 +96,6 @@ export default function TeacherDash() {
     }
   };
 
-  // [추가] 진도 평균 계산 로직
-  const averageProgress = students.length > 0
-    ? Math.round(
-        students.reduce((acc, curr) => acc + (curr.progress_rate || 0), 0) / students.length * 100
-      )
-    : 0;
-
   // [추가] 준비중 배지 컴포넌트
   const ComingSoonBadge = () => (
     <span className="absolute top-4 right-4 bg-white/80 backdrop-blur-sm text-gray-400 text-[10px] font-bold px-2 py-1 rounded-full border border-gray-100 flex items-center gap-1">
@@ -96,14 +116,14 @@ export default function TeacherDash() {
             {/* [1] 전체 학생 (실제 데이터) */}
             <div className="bg-blue-50 p-5 rounded-3xl border border-blue-100">
               <Users className="text-blue-500 mb-2" size={20} />
-              <p className="text-2xl font-black text-blue-900">{students.length}</p>
+              <p className="text-2xl font-black text-blue-900">{studentTotal}</p>
               <p className="text-[10px] font-bold text-blue-400 uppercase">전체 학생</p>
             </div>
 
             {/* [2] 진도 평균 (실제 데이터 적용됨) */}
             <div className="bg-green-50 p-5 rounded-3xl border border-green-100">
               <CheckCircle className="text-green-500 mb-2" size={20} />
-              {/* 계산된 평균값 사용 */}
+              {/* 서버 집계값 (담당 학생 전체 평균) */}
               <p className="text-2xl font-black text-green-900">{averageProgress}%</p>
               <p className="text-[10px] font-bold text-green-400 uppercase">진도 평균</p>
             </div>
@@ -132,19 +152,27 @@ export default function TeacherDash() {
           <section>
             <div className="flex justify-between items-center mb-4">
               <h2 className="text-lg font-black text-gray-900">학생 관리</h2>
-              <div className="relative">
-                <Search className="absolute left-3 top-1/2 -translate-y-1/2 text-gray-400" size={16} />
-                <input 
-                  type="text" placeholder="이름/이메일 검색"
-                  className="pl-10 pr-4 py-2 bg-white border border-gray-200 rounded-xl text-sm outline-none focus:ring-2 focus:ring-blue-500"
-                  value={searchTerm}
-                  onChange={(e) => setSearchTerm(e.target.value)}
-                />
+              <div className="flex items-center gap-2">
+                <a
+                  href={exportLogsUrl()}
+                  className="flex items-center gap-1 px-3 py-2 bg-white border border-gray-200 rounded-xl text-sm font-bold text-gray-700"
+                >
+                  <Download size={16} /> 학습 기록 CSV
+                </a>
+                <div className="relative">
+                  <Search className="absolute left-3 top-1/2 -translate-y-1/2 text-gray-400" size={16} />
+                  <input 
+                    type="text" placeholder="이름 검색"
+                    className="pl-10 pr-4 py-2 bg-white border border-gray-200 rounded-xl text-sm outline-none focus:ring-2 focus:ring-blue-500"
+                    value={searchTerm}
+                    onChange={(e) => setSearchTerm(e.target.value)}
+                  />
+                </div>
               </div>
             </div>
             <div className="space-y-3">
-              {/* 이제 students가 확실히 배열이므로 .filter 사용 가능 */}
-              {Array.isArray(students) && students.filter(s => s.name && s.name.includes(searchTerm)).map((student) => (
+              {/* 검색 결과는 서버에서 걸러서 옴 */}
+              {students.map((student) => (
                 <Link key={student.uid} href={`/teacher_student/${student.uid}`}>
                   <div className="bg-white p-5 rounded-2xl border border-gray-100 shadow-sm flex justify-between items-center hover:shadow-md transition-all active:scale-[0.99] mb-3">
                     <div>
@@ -168,6 +196,15 @@ export default function TeacherDash() {
                 </Link>
               ))}
               
+              {nextCursor && (
+                <button
+                  onClick={loadMoreStudents}
+                  className="w-full py-3 text-sm font-bold text-gray-500 bg-white border border-gray-100 rounded-2xl hover:bg-gray-50"
+                >
+                  학생 더 보기
+                </button>
+              )}
+
               {/* 학생이 없을 경우 안내 메시지 */}
               {students.length === 0 && (
                  <div className="text-center py-10 text-gray-400 text-sm">